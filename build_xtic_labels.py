@@ -32,6 +32,7 @@ import re
 import hashlib
 import datetime
 from jdcal import gcal2jd, jd2gcal
+import numpy as np
 import pprint
 import argparse
 
@@ -44,16 +45,21 @@ parser = argparse.ArgumentParser (
   'of the license.' + '\n' +
   'This is free software: you are free to change and redistribute it. ' + '\n' +
   'There is NO WARRANTY, to the extent permitted by law. ' + '\n' + '\n'
-  'The output file defines xtic labels for GNUplot; ' + '\n')
-parser.add_argument ('output-file', metavar='output_file',
+  'The output file defines xtic labels for GNUplot; ' + '\n' +
+  'use --output to write files for several intervals at once. ' + '\n')
+parser.add_argument ('output-file', metavar='output_file', nargs='?',
                      help='output file')
 parser.add_argument ('--version', action='version', 
-                     version='build_xtic_labels 2.1 2020-04-17',
+                     version='build_xtic_labels 2.2 2026-10-19',
                      help='print the version number and exit')
 parser.add_argument ('--trace', metavar='trace_file',
                      help='write trace output to the specified file')
 parser.add_argument ('--interval',metavar='interval',
                      help='years between ticks, default is 1')
+parser.add_argument ('--output', action='append', nargs=2,
+                     metavar=('interval', 'output_file'),
+                     help='also write the labels for ticks interval ' +
+                     'years apart to output_file; may be repeated')
 parser.add_argument ('--start-year',metavar='start_year',
                      help='earliest year, default is -2000')
 parser.add_argument ('--end-year',metavar='end_year',
@@ -92,6 +98,13 @@ def yearno (jdn):
   ymdf = jd2gcal (float(jdn), 0.5)
   return (ymdf [0])
 
+# Subroutine to compute the Julian Day Numbers of January 1 of each
+# of an array of Gregorian years.  Numpy counts days from 1970-01-01,
+# which is JDN 2440587.
+def year_start_jdns (years):
+  the_dates = (years - 1970).astype ('datetime64[Y]').astype ('datetime64[D]')
+  return (the_dates.astype (np.int64) + 2440587)
+
 #
 # Parse the command line.
 #
@@ -99,9 +112,6 @@ def yearno (jdn):
 arguments = parser.parse_args ()
 arguments = vars(arguments)
 
-if (arguments ['output-file'] != None):
-  output_file_name = arguments ['output-file']
-  
 if (arguments ['trace'] != None):
   do_trace = 1
   trace_file_name = arguments ['trace']
@@ -115,6 +125,18 @@ if (arguments ['interval'] != None):
 else:
   interval = 1
 
+# Each output is an interval and the file to write its labels to.
+outputs = list()
+if (arguments ['output-file'] != None):
+  outputs.append ((interval, arguments ['output-file']))
+
+if (arguments ['output'] != None):
+  for (output_interval, output_file_name) in arguments ['output']:
+    outputs.append ((int(output_interval), output_file_name))
+
+if (len(outputs) == 0):
+  parser.error ("an output file or --output is required")
+
 if (arguments ['start_year'] != None):
   start_year = int (arguments['start_year'])
 else:
@@ -128,24 +150,32 @@ else:
 #
 # Write a file which can be loaded by GNUplot which labels the
 # x-axis, assumed to be Julian Day Numbers.
+# The first day of each year is computed once, for all of the files.
 #
-output_file = open (output_file_name, 'wt')
-output_file.write ("set xtics (\\\n")
-first_line = 1
-last_jdn = 0
-for the_year in range (start_year, end_year + 1):
-  the_day = jdn (the_year, 1, 1)
-  if ((yearno (the_day) - yearno (last_jdn)) >= interval):
+years = np.arange (start_year, end_year + 1)
+year_starts = year_start_jdns (years)
+
+# A tick is placed at the first year which is at least interval years
+# after the year of JDN 0, and then every interval years.
+earliest_year = yearno (0)
+
+for (interval, output_file_name) in outputs:
+  first_year = max (start_year, earliest_year + interval)
+  ticks = (years >= first_year) & (((years - first_year) % interval) == 0)
+  output_file = open (output_file_name, 'wt')
+  output_file.write ("set xtics (\\\n")
+  first_line = 1
+  for (the_year, the_day) in zip (years [ticks], year_starts [ticks]):
     output_file.write ("  ")
     if (first_line == 0):
       output_file.write (",")
     first_line = 0
-    output_file.write ("\"" + str(yearno(the_day)) +
-                               "\" " + str(the_day) + "\\\n")
-    last_jdn = the_day
-  
-output_file.write (")\n")
-output_file.close()
+    output_file.write ("\"" + str(the_year) +
+                       "\" " + str(the_day) + "\\\n")
+  output_file.write (")\n")
+  output_file.close()
+  if (verbosity_level > 1):
+    print ("Wrote " + output_file_name + ".")
 
 if (do_trace == 1):
   tracefile.close()
@@ -32,6 +32,7 @@ import re
 import hashlib
 import datetime
 from jdcal import gcal2jd, jd2gcal
+import numpy as np
 import pprint
 import argparse
 
@@ -44,16 +45,21 @@ parser = argparse.ArgumentParser (
   'of the license.' + '\n' +
   'This is free software: you are free to change and redistribute it. ' + '\n' +
   'There is NO WARRANTY, to the extent permitted by law. ' + '\n' + '\n'
-  'The output file defines xtic labels for GNUplot; ' + '\n')
-parser.add_argument ('output-file', metavar='output_file',
+  'The output file defines xtic labels for GNUplot; ' + '\n' +
+  'use --output to write files for several intervals at once. ' + '\n')
+parser.add_argument ('output-file', metavar='output_file', nargs='?',
                      help='output file')
 parser.add_argument ('--version', action='version', 
-                     version='build_xtic_monthly_labels 1.0 2020-04-17',
+                     version='build_xtic_monthly_labels 1.1 2026-10-19',
                      help='print the version number and exit')
 parser.add_argument ('--trace', metavar='trace_file',
                      help='write trace output to the specified file')
 parser.add_argument ('--interval',type=int,metavar='interval',
-                     help='years between ticks, default is 1')
+                     help='months between ticks, default is 1')
+parser.add_argument ('--output', action='append', nargs=2,
+                     metavar=('interval', 'output_file'),
+                     help='also write the labels for ticks interval ' +
+                     'months apart to output_file; may be repeated')
 parser.add_argument ('--start-year',type=int,metavar='start_year',
                      help='earliest year, default is -2000')
 parser.add_argument ('--end-year',type=int,metavar='end_year',
@@ -98,6 +104,14 @@ def monthno (jdn):
   ymdf = jd2gcal (float(jdn), 0.5)
   return (ymdf [1])
 
+# Subroutine to compute the Julian Day Numbers of the first day of
+# each of an array of months, each counted as year * 12 + month - 1.
+# Numpy counts days from 1970-01-01, which is JDN 2440587.
+def month_start_jdns (yearmonths):
+  the_dates = ((yearmonths - (1970 * 12)).astype ('datetime64[M]').
+               astype ('datetime64[D]'))
+  return (the_dates.astype (np.int64) + 2440587)
+
 #
 # Parse the command line.
 #
@@ -105,9 +119,6 @@ def monthno (jdn):
 arguments = parser.parse_args ()
 arguments = vars(arguments)
 
-if (arguments ['output-file'] != None):
-  output_file_name = arguments ['output-file']
-  
 if (arguments ['trace'] != None):
   do_trace = 1
   trace_file_name = arguments ['trace']
@@ -121,6 +132,18 @@ if (arguments ['interval'] != None):
 else:
   interval = 1
 
+# Each output is an interval and the file to write its labels to.
+outputs = list()
+if (arguments ['output-file'] != None):
+  outputs.append ((interval, arguments ['output-file']))
+
+if (arguments ['output'] != None):
+  for (output_interval, output_file_name) in arguments ['output']:
+    outputs.append ((int(output_interval), output_file_name))
+
+if (len(outputs) == 0):
+  parser.error ("an output file or --output is required")
+
 if (arguments ['start_year'] != None):
   start_year = int (arguments['start_year'])
 else:
@@ -135,26 +158,31 @@ else:
 # Write a file which can be loaded by GNUplot which labels the
 # x-axis, assumed to be Julian Day Numbers.
 #
-output_file = open (output_file_name, 'wt')
-output_file.write ("set xtics (\\\n")
-first_line = 1
-last_yearmonth = 0
-start_JDN = jdn(start_year, 1, 1)
-end_JDN = jdn(end_year,12,31)
-
-for the_JDN in range (start_JDN, end_JDN + 1):
-  yearmonth = (yearno(the_JDN) * 12) + (monthno(the_JDN) -1)
-  if ((yearmonth - last_yearmonth) >= interval):
+# The first day of each month is computed once, for all of the files.
+#
+yearmonths = np.arange (start_year * 12, (end_year * 12) + 12)
+month_starts = month_start_jdns (yearmonths)
+
+# A tick is placed at the first month which is at least interval months
+# after January of year 0, and then every interval months.
+for (interval, output_file_name) in outputs:
+  first_yearmonth = max (start_year * 12, interval)
+  ticks = ((yearmonths >= first_yearmonth) &
+           (((yearmonths - first_yearmonth) % interval) == 0))
+  output_file = open (output_file_name, 'wt')
+  output_file.write ("set xtics (\\\n")
+  first_line = 1
+  for (yearmonth, the_JDN) in zip (yearmonths [ticks], month_starts [ticks]):
     output_file.write ("  ")
     if (first_line == 0):
       output_file.write (",")
     first_line = 0
-    output_file.write ("\"" + greg(the_JDN, "-") +
-                               "\" " + str(the_JDN) + "\\\n")
-    last_yearmonth = yearmonth
-  
-output_file.write (")\n")
-output_file.close()
+    output_file.write ("\"1-" + month_names [yearmonth % 12] + "-" +
+                       str(yearmonth // 12) + "\" " + str(the_JDN) + "\\\n")
+  output_file.write (")\n")
+  output_file.close()
+  if (verbosity_level > 1):
+    print ("Wrote " + output_file_name + ".")
 
 if (do_trace == 1):
   tracefile.close()
@@ -0,0 +1,320 @@
+#!/usr/bin/python3
+# -*- coding: utf-8
+#
+# bulletin_parsers reads the text of IERS Bulletins A, C and D, and the
+# archives they may be kept in.  It is imported by parse_bulletin_A.py,
+# parse_bulletin_C.py, survey_UT2_slope/parse_bulletin_D.py and
+# index_bulletins.py, so that they all read the bulletins the same way.
+
+#   Copyright © 2026 by John Sauter <John_Sauter@systemeyescomputerstore.com>
+
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+#   The author's contact information is as follows:
+#     John Sauter
+#     System Eyes Computer Store
+#     20A Northwest Blvd.  Ste 345
+#     Nashua, NH  03063-4066
+#     telephone: (603) 424-1188
+#     e-mail: John_Sauter@systemeyescomputerstore.com
+
+#
+# Each parser takes the lines of one bulletin and returns a dictionary
+# of what it found.  If messages is a list, the parser appends to it
+# the lines the parsing program prints, and if trace_lines is a list,
+# the lines it writes to its trace file.  A parser raises ValueError or
+# IndexError if a line it recognizes is not in the expected form.
+#
+
+import os
+import io
+import datetime
+import pprint
+import tarfile
+import zipfile
+import gzip
+import bz2
+import lzma
+
+# The suffixes of the archives read_archive can read.
+archive_suffixes = ('.tar', '.tgz', '.gz', '.bz2', '.xz', '.zip')
+
+# The errors which reading a damaged archive can raise.
+archive_errors = (tarfile.TarError, zipfile.BadZipFile, lzma.LZMAError,
+                  EOFError, OSError)
+
+# A single compressed file is opened according to its suffix.
+compressed_openers = {'.gz': gzip.open, '.bz2': bz2.open, '.xz': lzma.open}
+
+# Subroutine to compute the key of a file in a cache: its size and
+# modification time.
+def file_key (file_name):
+  file_status = os.stat (file_name)
+  return ([file_status.st_size, file_status.st_mtime_ns])
+
+# Subroutine to read the .txt files in an archive, in the order they
+# are stored, without extracting them.  Tar files are read as a stream,
+# so a compressed tar file is read from start to end once.  Yields the
+# name of each file, under the name of the archive, its contents and
+# its key for a cache.  A single compressed file is named without its
+# suffix.
+def read_archive (archive_name):
+  if (archive_name.endswith (('.tar', '.tar.gz', '.tgz', '.tar.bz2',
+                              '.tar.xz'))):
+    with tarfile.open (archive_name, 'r|*') as archive:
+      for member in archive:
+        if (member.isfile() and member.name.endswith ('.txt')):
+          yield ((os.path.join (archive_name, member.name),
+                  archive.extractfile (member).read(),
+                  [member.size, int(member.mtime) * 1000000000]))
+  elif (archive_name.endswith ('.zip')):
+    with zipfile.ZipFile (archive_name) as archive:
+      for member in archive.infolist():
+        if ((not member.is_dir()) and member.filename.endswith ('.txt')):
+          yield ((os.path.join (archive_name, member.filename),
+                  archive.read (member),
+                  [member.file_size, member.CRC]))
+  else:
+    (base_name, suffix) = os.path.splitext (archive_name)
+    with compressed_openers [suffix] (archive_name, 'rb') as archive:
+      yield ((base_name, archive.read(), file_key (archive_name)))
+
+# Subroutine to open a bulletin as text.  If data is not None, it is
+# the contents of the bulletin, read from an archive.
+def open_bulletin (file_name, data):
+  if (data == None):
+    return (open (file_name, 'rt'))
+  return (io.TextIOWrapper (io.BytesIO (data)))
+
+# Subroutine to format a date as a day, month abbreviation and year.
+month_names = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul",
+               "Aug", "Sep", "Oct", "Nov", "Dec"]
+def day_month_year (the_date):
+  return (str(the_date.day) + " " + month_names [the_date.month - 1] + " " +
+          str(the_date.year))
+
+# The Modified Julian Day Number counts days from November 17, 1858.
+MJD_epoch = datetime.date (1858, 11, 17)
+
+# Subroutine to find the last day of a month.
+def last_day_of_month (the_date):
+  next_month = (the_date.replace (day=28) + datetime.timedelta (days=4))
+  return (next_month - datetime.timedelta (days=next_month.day))
+
+# Subroutine to parse Bulletin A.  Returns its date, the value of DUT1
+# and the date that value takes effect, and, in entries, the date and
+# the UT1-UTC formula for each formula found: UT1-UTC = UT1_UTC +
+# UT2_slope * (MJD - base_MJD) - (UT2-UT1), with the value of DUT1.
+def parse_bulletin_A (text_lines, messages=None, trace_lines=None):
+  found = {"bulletin_date": None, "DUT1": None, "effective_date": None,
+           "entries": list()}
+  next_line_is_DUT1 = 0
+  DUT1 = 0.0
+  for text_line in text_lines:
+    left_side = text_line [0:40].strip()
+    right_side = text_line [41:].lstrip() [0:5]
+    stripped_text_line = text_line.strip()
+    if ((trace_lines != None) and (found ["bulletin_date"] == None)):
+      trace_lines.append ('Looking for date: ' + right_side + '\n')
+    if ((found ["bulletin_date"] == None) and (right_side == 'Vol. ')):
+      date_object = datetime.datetime.strptime (left_side,
+                                                '%d %B %Y').date()
+      found ["bulletin_date"] = date_object
+      date_string = date_object.strftime ('%B %d, %Y')
+      if (messages != None):
+        messages.append ('Date of IERS Bulletin A is ' + date_string + '\n')
+      if (trace_lines != None):
+        trace_lines.append ('date = ' + date_string + '.\n')
+    if (next_line_is_DUT1 == 1):
+      find_DUT1 = stripped_text_line [1:8]
+      if (trace_lines != None):
+        trace_lines.append ("finding DUT1 in " + find_DUT1 + ".\n")
+      if (find_DUT1 [-1] != " "):
+        find_DUT1 = stripped_text_line [1:7]
+        if (trace_lines != None):
+          trace_lines.append ("finding DUT1 in " + find_DUT1 + ".\n")
+      if (find_DUT1 [-1] != " "):
+        find_DUT1 = stripped_text_line [1:6]
+        if (trace_lines != None):
+          trace_lines.append ("finding DUT1 in " + find_DUT1 + ".\n")
+      DUT1 = float(find_DUT1)
+      found ["DUT1"] = DUT1
+      # The line also gives the date the value takes effect.
+      beginning = stripped_text_line.split (" beginning ")
+      if (len(beginning) == 2):
+        try:
+          found ["effective_date"] = datetime.datetime.strptime (
+            " ".join (beginning [1].split () [0:3]), '%d %B %Y').date()
+        except ValueError:
+          pass
+      next_line_is_DUT1 = 0
+    if (stripped_text_line ==
+        'DUT1= (UT1-UTC) transmitted with time signals'):
+      next_line_is_DUT1 = 1
+    if (text_line [0:19] == '         UT1-UTC = '):
+      if (found ["bulletin_date"] == None):
+        raise ValueError ('the UT1-UTC formula comes before the date')
+      if (messages != None):
+        messages.append (text_line)
+      param_1 = text_line [19:26]
+      if (trace_lines != None):
+        trace_lines.append ('param_1 = "' + param_1 + '".\n')
+      param_1 = float(param_1)
+      param_2 = text_line [27] + text_line [29:36].lstrip()
+      if (trace_lines != None):
+        trace_lines.append ('param_2 = "' + param_2 + '".\n')
+      param_2 = float(param_2)
+      param_3 = int(text_line [44:49])
+      if (messages != None):
+        messages.append ('         UT1-UTC = ' + str(param_1) + ' + (' +
+                         format(param_2, ".5f") +
+                         ' ⨯ (MJD - ' + str(param_3) + ')) - (UT2-UT1)\n')
+        messages.append ('MJD ' + str(param_3) + ' is ' +
+                         day_month_year (MJD_epoch +
+                                         datetime.timedelta (days=param_3)) +
+                         '\n')
+      found ["entries"].append ((found ["bulletin_date"],
+                                 (param_1, param_2, param_3, DUT1)))
+  return (found)
+
+# Subroutine to parse Bulletin C.  Returns its date and name, and, from
+# the last announcement found, the leap second (+1, -1 or 0), the last
+# day of the month it is announced for, and the expiration date that
+# gives the table of leap seconds.
+def parse_bulletin_C (text_lines, messages=None):
+  found = {"bulletin_date": None, "name": None, "leap": None,
+           "leap_date": None, "expiration_date": None}
+  for text_line in text_lines:
+    right_side = text_line.lstrip()
+    if (right_side [0:7] == 'Paris, '):
+      right_side = right_side [7:].rstrip()
+      found ["bulletin_date"] = datetime.datetime.strptime (
+        right_side, '%d %B %Y').date()
+      if (messages != None):
+        messages.append ('Date of IERS Bulletin C is ' +
+                         found ["bulletin_date"].strftime ('%B %d, %Y') +
+                         '.\n')
+    if (right_side [0:11] == 'Bulletin C '):
+      found ["name"] = right_side.rstrip()
+      if (messages != None):
+        messages.append ('This is IERS ' + found ["name"] + '.\n')
+    announcement = None
+    if (text_line [0:49] ==
+        ' NO leap second will be introduced at the end of '):
+      announcement = (0, text_line [49:])
+    if (text_line [0:57] ==
+        ' A positive leap second will be introduced at the end of '):
+      announcement = (1, text_line [57:])
+    if (text_line [0:57] ==
+        ' A negative leap second will be introduced at the end of '):
+      announcement = (-1, text_line [57:])
+    if (announcement != None):
+      (leap, month_text) = announcement
+      if (messages != None):
+        messages.append (text_line)
+      month_date = datetime.datetime.strptime (
+        month_text.rstrip() [:-1], '%B %Y').date()
+      found ["leap"] = leap
+      found ["leap_date"] = last_day_of_month (month_date)
+      expiration_date = (month_date.replace (day=15) +
+                         datetime.timedelta (days=180))
+      found ["expiration_date"] = expiration_date.replace (day=28)
+      if (messages != None):
+        messages.append ('Expiration date is ' +
+                         found ["expiration_date"].strftime ('%B %d, %Y') +
+                         '.\n')
+  return (found)
+
+# Subroutine to parse Bulletin D.  Returns its date, the dates on which
+# a value of DUT1 takes effect, in the order found, the last of them,
+# and the value of DUT1.  Parsing stops at the value of DUT1.
+def parse_bulletin_D (text_lines, messages=None, trace_lines=None):
+  found = {"bulletin_date": None, "effective_dates": list(),
+           "effective_date": None, "DUT1": None}
+  line_number = 0
+  effective_date_line = 0
+  for text_line in text_lines:
+    line_number = line_number + 1
+    stripped_text_line = text_line.strip()
+    if ((found ["bulletin_date"] == None) and (messages != None)):
+      messages.append ("'" + stripped_text_line + "'\n")
+    stripped_text_line = stripped_text_line.replace ('Paris,', 'Paris, ')
+    stripped_text_line = stripped_text_line.replace ('  ', ' ')
+    # Sometimes the month name is written in French.
+    stripped_text_line = stripped_text_line.replace ('mars', 'March')
+    stripped_text_line = stripped_text_line.replace ('Mai', 'May')
+    stripped_text_line = stripped_text_line.replace ('Juin', 'June')
+    stripped_text_line = stripped_text_line.replace ('juin', 'June')
+    stripped_text_line = stripped_text_line.replace ('Octobre', 'October')
+    stripped_text_line = stripped_text_line.replace ('Decembre', 'December')
+    if ((trace_lines != None) and (found ["bulletin_date"] == None)):
+      trace_lines.append ('Looking for date: ' + stripped_text_line + '\n')
+    right_side = stripped_text_line.rsplit (" ", 5)
+    if (messages != None):
+      messages.append (str(len(right_side)) + '\n')
+      messages.append (pprint.pformat (right_side) + '\n')
+    effective_date_text = None
+    if ((found ["bulletin_date"] == None) and (len(right_side) >= 4) and
+        ((right_side [1][0:5] == 'Paris') or
+         (right_side [-4] in ('Paris,', '\tParis,', '\t\t\t\tParis,')))):
+      found ["bulletin_date"] = datetime.datetime.strptime (
+        " ".join (right_side [-3:]), '%d %B %Y').date()
+      date_string = found ["bulletin_date"].strftime ('%B %d, %Y')
+      if (messages != None):
+        messages.append ('Date of IERS Bulletin D is ' + date_string + '\n')
+      if (trace_lines != None):
+        trace_lines.append ('date = ' + date_string + '.\n')
+    if ((len(right_side) == 6) and (right_side [1] == '0h')):
+      right_side = right_side [0].rsplit (" ", 3)
+      effective_date_text = (right_side [1] + ' ' + right_side [2] + ' ' +
+                             right_side [3][0:4])
+    if ((len(right_side) == 6) and (right_side [0] == "From the")):
+      effective_date_text = (right_side [1] + ' ' + right_side [2] + ' ' +
+                             right_side [3][0:4])
+    if (effective_date_text != None):
+      note_effective_date (found, effective_date_text, messages)
+    if ((stripped_text_line == 'From the') or (stripped_text_line == "From")):
+      effective_date_line = line_number + 1
+    if ((messages != None) and (effective_date_line > 0)):
+      messages.append ("'" + stripped_text_line + "'\n")
+    if (line_number == effective_date_line):
+      if (stripped_text_line == ""):
+        effective_date_line = effective_date_line + 1
+      else:
+        effective_date_line = 0
+        note_effective_date (found, stripped_text_line.split (",")[0],
+                             messages)
+    if ((stripped_text_line [0:6] == 'DUT1 =') or
+        (stripped_text_line [0:5] == 'DUT1=')):
+      right_side = stripped_text_line.split ("=")[1].lstrip()
+      DUT1_text = right_side [1:].lstrip()
+      DUT1_text = DUT1_text.replace ("s.", " ")
+      DUT1_text = DUT1_text.replace ("s", " ")
+      found ["DUT1"] = float(right_side [0] + DUT1_text.rstrip())
+      if (messages != None):
+        messages.append ('DUT1 = ' + format(found ["DUT1"], ".1f") + '\n\n')
+      return (found)
+  return (found)
+
+# Subroutine to record a date on which a value of DUT1 takes effect.
+def note_effective_date (found, date_text, messages):
+  effective_date = datetime.datetime.strptime (date_text, '%d %B %Y').date()
+  found ["effective_dates"].append (effective_date)
+  found ["effective_date"] = effective_date
+  if (messages != None):
+    messages.append ('Effective date is ' +
+                     effective_date.strftime ('%B %d, %Y') + '\n')
+  return
+
+# End of file bulletin_parsers.py
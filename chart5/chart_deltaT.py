@@ -26,7 +26,11 @@
 #     telephone: (603) 424-1188
 #     e-mail: John_Sauter@systemeyescomputerstore.com
 
-
+import os
+import re
+import multiprocessing
+import pprint
+import numpy as np
 import pandas as pd
 from jdcal import gcal2jd, jd2gcal
 import matplotlib.colors as colors
@@ -43,6 +47,8 @@ sns.set_style('whitegrid')
 sns.set(rc={'figure.figsize':(12, 12)})
 
 import argparse
+import npz_columns
+import gnuplot_pyramid
 
 parser = argparse.ArgumentParser (
   formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -54,13 +60,18 @@ parser = argparse.ArgumentParser (
   'This is free software: you are free to change and redistribute it. ' + '\n' +
   'There is NO WARRANTY, to the extent permitted by law. ' + '\n' + '\n'
   'The input file has values for Delta T at various times; ' +
-  'the output is a LaTeX table. ' + '\n')
+  'the output is a LaTeX table. ' + '\n' +
+  'If there is a numpy .npz file of the same name as the input file ' +
+  'which is not older ' + '\n' + 'it is read instead.' + '\n' +
+  'Each line of the windows file is JDN or year, the start and end ' +
+  'of the range, ' + '\n' + 'and the name of the picture file, ' +
+  'for example "year 1900 2000 deltaT_1900.png".' + '\n')
 parser.add_argument ('input1_file',
                      help='The values of Delta T in CSV format')
 parser.add_argument ('--output-file', metavar='output_file',
                      help='A picture of Delta T over time')
 parser.add_argument ('--version', action='version', 
-                     version='chart_delta_T 2.1 2024-06-01',
+                     version='chart_delta_T 2.6 2026-10-19',
                      help='print the version number and exit')
 parser.add_argument ('--trace', metavar='trace_file',
                      help='write trace output to the specified file')
@@ -68,6 +79,15 @@ parser.add_argument ('--start-JDN', metavar='start_JDN',
                      help='earliest date to put in chart')
 parser.add_argument ('--end-JDN', metavar='end_JDN',
                      help='latest date to put in chart')
+parser.add_argument ('--pixels', type=int, metavar='pixels',
+                     help='reduce each line to the points needed to draw ' +
+                     'it this many pixels wide; 0 plots every point; ' +
+                     'the default is the width of the picture')
+parser.add_argument ('--windows', metavar='windows_file',
+                     help='make a chart for each date range in this file')
+parser.add_argument ('--jobs', type=int, metavar='jobs',
+                     help='number of charts to make at the same time, ' +
+                     'default is the number of processors')
 parser.add_argument ('--verbose', type=int, metavar='verbosity level',
                      help='control the amount of output from the program: ' +
                      '1 is normal, 0 suppresses summary messages')
@@ -82,6 +102,10 @@ have_end_JDN = 0
 end_JDN = 0
 verbosity_level = 1
 error_counter = 0
+do_windows = 0
+number_of_jobs = os.cpu_count()
+picture_dpi = 120
+pixels = int(plt.rcParams["figure.figsize"][0] * picture_dpi)
 
 # Parse the command line.
 arguments = parser.parse_args ()
@@ -104,6 +128,19 @@ if (arguments ['end_JDN'] != None):
   have_end_JDN = 1
   end_JDN = int(arguments ['end_JDN'])
 
+if (arguments ['windows'] != None):
+  do_windows = 1
+  windows_file_name = arguments ['windows']
+
+if (arguments ['jobs'] != None):
+  number_of_jobs = max (1, int(arguments ['jobs']))
+
+if (arguments ['pixels'] != None):
+  pixels = int(arguments ['pixels'])
+
+if (arguments ['verbose'] != None):
+  verbosity_level = int(arguments ['verbose'])
+
 # Subroutine to convert a Julian Day Number to its equivalent Gregorian date.
 month_names = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul",
                "Aug", "Sep", "Oct", "Nov", "Dec"] 
@@ -139,10 +176,29 @@ def day_month_and_year (JDN, separator):
   return (str(day_no) + separator + month_name + separator + str(year_no))
 
 input_file_name = arguments["input1_file"]
-data = pd.read_csv(input_file_name, sep=';',
-                   converters={"JDN": int, "Year": int, "Month": int,
-                               "Day": int})
-data.set_index(["JDN"], inplace=True)
+npz_file_name = re.sub ("\\.(csv|npz)$", "", input_file_name) + ".npz"
+columns = None
+if ((os.path.exists (npz_file_name)) and
+    ((not os.path.exists (input_file_name)) or
+     (os.path.getmtime (npz_file_name) >=
+      os.path.getmtime (input_file_name)))):
+  columns = npz_columns.load_npz_columns (npz_file_name)
+  if (columns == None):
+    print ("File " + npz_file_name + " is not recognized; using " +
+           input_file_name + ".")
+if (columns != None):
+  data = pd.DataFrame ({
+    "Year": columns ["Year"], "Month": columns ["Month"],
+    "Day": columns ["Day"], "delta_t": columns ["delta_t"],
+    "source": pd.Categorical.from_codes (columns ["source"],
+                                         columns ["source_names"])},
+                       index=pd.Index (columns ["JDN"], name="JDN"),
+                       copy=False)
+else:
+  data = pd.read_csv(input_file_name, sep=';',
+                     converters={"JDN": int, "Year": int, "Month": int,
+                                 "Day": int})
+  data.set_index(["JDN"], inplace=True)
 
 last_JDN = data.index[-1]
 first_JDN = data.index[0]
@@ -154,11 +210,10 @@ if (have_start_JDN == 0):
 if (have_end_JDN == 0):
   end_JDN = last_JDN
 
-print ("JDN range limited to " + str(start_JDN) + ".5 and "
-       + str(end_JDN) + ".5.")
 bottom_deltaT = 69
 top_deltaT = 70
-print ("Domain is " + str(bottom_deltaT) + " to " + str(top_deltaT) + ".")
+if (verbosity_level > 0):
+  print ("Domain is " + str(bottom_deltaT) + " to " + str(top_deltaT) + ".")
 
 # X-axis formatter to translate JDN into Gregorian dates.
 def format_func(value, tick_number):
@@ -171,32 +226,151 @@ data["Delta_T_source"] = data["source"].astype("category")
 colors_list = ["Black", "Green", "Yellow", "Orange", "Red",
                "Blue"] + colors_list
 
-# Plot all categories.
-fig, ax = plt.subplots(1, 1)
-ax.set_title("Delta T")
-lineno = 0
+# Subroutine to reduce a line to the points needed to draw it in
+# the chart.  The x-axis from left to right is divided into
+# bucket_count buckets, one per pixel, and from each bucket we keep
+# the first, last, lowest and highest points.  Drawing just those
+# points gives the same picture as drawing them all, with the extremes
+# still visible, and the number of points does not depend on the
+# length of the window.  The x values must be in ascending order.
+def decimate (x_values, y_values, left, right, bucket_count):
+  # Keep only the points in the window, plus one on each side
+  # so the line reaches the edges.
+  first = max (np.searchsorted (x_values, left, side='left') - 1, 0)
+  last = min (np.searchsorted (x_values, right, side='right') + 1,
+              len(x_values))
+  x_values = x_values [first:last]
+  y_values = y_values [first:last]
+  if ((bucket_count <= 0) or (right <= left) or
+      (len(x_values) <= 4 * bucket_count)):
+    return (x_values, y_values)
+  buckets = np.floor ((x_values - left) * (bucket_count / (right - left)))
+  buckets = np.clip (buckets, -1, bucket_count).astype (np.int64)
+  keep = gnuplot_pyramid.bucket_extremes (y_values, buckets)
+  return (x_values [keep], y_values [keep])
+
+# Extract the line for each source, in order by date.
+source_lines = list()
 for source_name, source_data in \
     data["delta_t"].groupby(data["Delta_T_source"], observed=True):
-  ax.plot(source_data,
-          color=colors_list[lineno], linewidth=1.0,
-          label=source_name)
-  lineno = lineno + 1
-
-ax.set_xlim(left=start_JDN,right=end_JDN)
-ax.set_xlabel("Date")
-ax.xaxis.set_major_formatter(plt.FuncFormatter(format_func))
-ax.set_ylim(bottom=bottom_deltaT,top=top_deltaT)
-ax.set_ylabel("Seconds")
-#ax.yaxis.set_ticks(np.arange(-1.0, 1.1, 0.1))
-ax.legend(loc="best", bbox_to_anchor=(0.5, 0.0, 0.5, 0.5), framealpha=0.5)
-
-if (do_output != 0):
-  plt.savefig(output_file_name, dpi=120, format="png", bbox_inches="tight")
-plt.show()
+  source_data = source_data.sort_index()
+  source_lines.append ((source_name, source_data.index.to_numpy(),
+                        source_data.to_numpy()))
+
+# When making many charts, reduce each line once to a series of
+# levels, each with buckets twice as wide as the one before, starting
+# at two days.  Since the buckets of each level are made from whole
+# buckets of the level before, each level has the same points as if it
+# had been made from the full line.  A chart is drawn from the
+# coarsest level which still has at least four buckets per pixel, so
+# charts of overlapping windows share the work of reducing the lines.
+source_levels = list()
+if (do_windows == 1):
+  for (source_name, x_values, y_values) in source_lines:
+    levels = [(1, x_values, y_values)]
+    bucket_width = 2
+    while ((len(levels [-1][1]) > 4 * max (pixels, 1)) and
+           (bucket_width < (x_values [-1] - x_values [0]))):
+      (previous_width, level_x, level_y) = levels [-1]
+      keep = gnuplot_pyramid.bucket_extremes (level_y,
+                                              level_x // bucket_width)
+      levels.append ((bucket_width, level_x [keep], level_y [keep]))
+      bucket_width = bucket_width * 2
+    source_levels.append (levels)
+
+# Subroutine to find the points of a line to draw in a chart.
+def chart_line (line_number, left, right):
+  (source_name, x_values, y_values) = source_lines [line_number]
+  if ((len(source_levels) > 0) and (pixels > 0)):
+    for (bucket_width, level_x, level_y) in source_levels [line_number]:
+      if (bucket_width * 4 * pixels > right - left):
+        break
+      x_values = level_x
+      y_values = level_y
+  return (decimate (x_values, y_values, left, right, pixels))
+
+# Subroutine to draw a chart of Delta T from left to right, and write
+# it to the specified file.
+def draw_chart (left, right, chart_file_name):
+  fig, ax = plt.subplots(1, 1)
+  ax.set_title("Delta T")
+  for line_number in range (len(source_lines)):
+    source_name = source_lines [line_number][0]
+    (x_values, y_values) = chart_line (line_number, left, right)
+    if ((do_trace == 1) and (do_windows == 0)):
+      tracefile.write ("Source " + str(source_name) + ": " +
+                       str(len(source_lines [line_number][1])) +
+                       " points, " + str(len(x_values)) + " plotted.\n")
+    ax.plot(x_values, y_values,
+            color=colors_list[line_number], linewidth=1.0,
+            label=source_name)
+
+  ax.set_xlim(left=left,right=right)
+  ax.set_xlabel("Date")
+  ax.xaxis.set_major_formatter(plt.FuncFormatter(format_func))
+  ax.set_ylim(bottom=bottom_deltaT,top=top_deltaT)
+  ax.set_ylabel("Seconds")
+  #ax.yaxis.set_ticks(np.arange(-1.0, 1.1, 0.1))
+  ax.legend(loc="best", bbox_to_anchor=(0.5, 0.0, 0.5, 0.5),
+            framealpha=0.5)
+
+  if (chart_file_name != ""):
+    plt.savefig(chart_file_name, dpi=picture_dpi, format="png",
+                bbox_inches="tight")
+  if (do_windows == 0):
+    plt.show()
+  plt.close(fig)
+  return (chart_file_name)
+
+# Subroutine to convert a Gregorian date to its Julian Day Number.
+def Julian (the_year, the_month, the_day):
+  float_1, float_2 = gcal2jd (the_year, the_month, the_day)
+  return (int(float_1 + float_2 - 0.5))
+
+if (do_windows == 0):
+  print ("JDN range limited to " + str(start_JDN) + ".5 and "
+         + str(end_JDN) + ".5.")
+  draw_chart (start_JDN, end_JDN, output_file_name)
+
+else:
+  # Read the list of windows.  Each line has the kind of range, the
+  # start and end of the range and the name of the picture file.
+  # Years include all of the end year.
+  windows = list()
+  with open (windows_file_name, 'rt') as windows_file:
+    line_number = 0
+    for line in windows_file:
+      line_number = line_number + 1
+      if (re.match ("^\\s*(#.*)?$", line)):
+        continue
+      matchw = re.match ("^\\s*(?P<kind>JDN|year)\\s+" +
+                         "(?P<start>-?\\d+)\\s+(?P<end>-?\\d+)\\s+" +
+                         "(?P<file>\\S+)\\s*(#.*)?$", line)
+      if (not matchw):
+        print ("Line " + str(line_number) + " of " + windows_file_name +
+               " is not recognized: " + line.rstrip())
+        error_counter = error_counter + 1
+        continue
+      window_start = int(matchw.group ('start'))
+      window_end = int(matchw.group ('end'))
+      if (matchw.group ('kind') == "year"):
+        window_start = Julian (window_start, 1, 1)
+        window_end = Julian (window_end, 12, 31)
+      windows.append ((window_start, window_end, matchw.group ('file')))
+  if (do_trace == 1):
+    tracefile.write ("Windows:\n")
+    pprint.pprint (windows, tracefile)
+
+  # The processes share the data and the reduced lines with this one.
+  with multiprocessing.get_context ("fork").Pool (number_of_jobs) as pool:
+    for chart_file_name in pool.starmap (draw_chart, windows):
+      if (verbosity_level > 1):
+        print ("Wrote " + chart_file_name + ".")
+  if (verbosity_level > 0):
+    print ("Wrote " + str(len(windows)) + " charts.")
 
 if (do_trace == 1):
   tracefile.close()
 
 if (error_counter > 0):
   print ("Encountered " + str(error_counter) + " errors.")
-
@@ -0,0 +1 @@
+../gnuplot_pyramid.py
\ No newline at end of file
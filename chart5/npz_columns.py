@@ -0,0 +1 @@
+../npz_columns.py
\ No newline at end of file
@@ -0,0 +1,157 @@
+#!/usr/bin/python3
+# -*- coding: utf-8
+#
+# check_convert_timestamps runs convert_timestamps.py on a few inputs,
+# good and bad, and checks its output and error messages.  It is run
+# by make check.
+
+#   Copyright © 2026 by John Sauter <John_Sauter@systemeyescomputerstore.com>
+
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+#   The author's contact information is as follows:
+#     John Sauter
+#     System Eyes Computer Store
+#     20A Northwest Blvd.  Ste 345
+#     Nashua, NH  03063-4066
+#     telephone: (603) 424-1188
+#     e-mail: John_Sauter@systemeyescomputerstore.com
+
+import sys
+import os
+import subprocess
+import argparse
+
+parser = argparse.ArgumentParser (
+  formatter_class=argparse.RawDescriptionHelpFormatter,
+  description='Check the conversions done by convert_timestamps.py.',
+  epilog='Copyright © 2026 by John Sauter' + '\n' +
+  'License GPL3+: GNU GPL version 3 or later; ' + '\n' +
+  'see <http://gnu.org/licenses/gpl.html> for the full text ' +
+  'of the license.' + '\n' +
+  'This is free software: you are free to change and redistribute it. ' +
+  '\n' +
+  'There is NO WARRANTY, to the extent permitted by law. ' + '\n' + '\n'
+  'The table file lists the extraordinary days. ' + '\n')
+parser.add_argument ('table_file', nargs='?',
+                     default='extraordinary_days.dat',
+                     help='the table of extraordinary days, default is ' +
+                     'extraordinary_days.dat')
+parser.add_argument ('--version', action='version',
+                     version='check_convert_timestamps 1.1 2026-10-19',
+                     help='print the version number and exit')
+parser.add_argument ('--verbose', type=int, metavar='verbosity level',
+                     help='control the amount of output from the program: ' +
+                     '1 is normal, 0 suppresses summary messages')
+
+verbosity_level = 1
+error_counter = 0
+
+# Parse the command line.
+arguments = parser.parse_args ()
+arguments = vars(arguments)
+
+if (arguments ['verbose'] != None):
+  verbosity_level = int(arguments ['verbose'])
+
+program = os.path.join (os.path.dirname (os.path.abspath (__file__)),
+                        "convert_timestamps.py")
+
+# Each case is the options, the input lines, the expected output lines,
+# and the expected error messages.  A line which cannot be converted
+# gives an empty output line.
+cases = (
+  (["--input-format", "unix"],
+   ["0", "1483228800", "-1.5", "  +2.25  ", "00000000001"],
+   ["8.000000000", "1483228837.000000000", "6.500000000", "10.250000000",
+    "9.000000000"],
+   []),
+  # Digits more than ten places above the decimal point, signs within
+  # the number and spaces within the number are not accepted.
+  (["--input-format", "unix"],
+   ["12345678901", "1-2", " 1 2 ", "1.", ".5", "--1", "1.2.3", "",
+    "9223372036.854775808"],
+   ["", "", "", "", "", "", "", "", ""],
+   ["Line 1 is not recognized: 12345678901",
+    "Line 2 is not recognized: 1-2",
+    "Line 3 is not recognized:  1 2",
+    "Line 4 is not recognized: 1.",
+    "Line 5 is not recognized: .5",
+    "Line 6 is not recognized: --1",
+    "Line 7 is not recognized: 1.2.3",
+    "Line 8 is not recognized: ",
+    "Line 9 is not recognized: 9223372036.854775808"]),
+  # A time within a leap second converts to 23:59:60, and 23:59:60 is
+  # accepted as a UTC time only on a day with a leap second.  A Z at
+  # the end is the same as no time zone.
+  (["--from", "TAI"],
+   ["2017-01-01T00:00:35.5", "2017-01-01T00:00:36.5",
+    "2017-01-01T00:00:37Z", "2016-12-31T23:59:60"],
+   ["2016-12-31T23:59:59.500000000", "2016-12-31T23:59:60.500000000",
+    "2017-01-01T00:00:00.000000000", ""],
+   ["Line 4 is not recognized: 2016-12-31T23:59:60"]),
+  ([],
+   ["2016-12-31T23:59:59.5", "2016-12-31T23:59:60.5Z",
+    "2016-12-30T23:59:60"],
+   ["2017-01-01T00:00:35.500000000", "2017-01-01T00:00:36.500000000", ""],
+   ["Line 3 is not during a leap second: 2016-12-30T23:59:60"]),
+  # Times outside the part of the table which int64 nanoseconds can
+  # hold are reported rather than clipped.
+  ([],
+   ["1677-09-22T00:00:00", "2000-01-01T00:00:00", "2262-04-11T00:00:00"],
+   ["", "2000-01-01T00:00:32.000000000", ""],
+   ["Line 1 is outside the table: 1677-09-22T00:00:00",
+    "Line 3 is outside the table: 2262-04-11T00:00:00"]),
+  (["--input-format", "jd", "--output-format", "iso"],
+   ["2451544.5", "2451544.5x"],
+   ["2000-01-01T00:00:32.000000000", ""],
+   ["Line 2 is not recognized: 2451544.5x"]),
+  # A line too long to hold a timestamp is reported, and does not
+  # stop the lines around it from being converted.
+  (["--input-format", "unix"],
+   ["1", "7" * 50000, "2"],
+   ["9.000000000", "", "10.000000000"],
+   ["Line 2 is longer than 64 characters: " + ("7" * 64) + "..."]))
+
+case_number = 0
+for (options, input_lines, output_lines, error_lines) in cases:
+  case_number = case_number + 1
+  result = subprocess.run (
+    [sys.executable, program, arguments ['table_file']] + options,
+    input=("\n".join (input_lines) + "\n").encode ('utf-8'),
+    capture_output=True)
+  if (result.stdout.decode ('utf-8').split ("\n") != output_lines + [""]):
+    print ("Case " + str(case_number) + ": expected output " +
+           str(output_lines) + " but got " +
+           str(result.stdout.decode ('utf-8').split ("\n")[:-1]) + ".")
+    error_counter = error_counter + 1
+  messages = [line for line in result.stderr.decode ('utf-8').split ("\n")
+              if ((line != "") and (not line.startswith ("Encountered ")))]
+  if (messages != error_lines):
+    print ("Case " + str(case_number) + ": expected messages " +
+           str(error_lines) + " but got " + str(messages) + ".")
+    error_counter = error_counter + 1
+  if ((result.returncode != 0) != (len(error_lines) > 0)):
+    print ("Case " + str(case_number) + ": unexpected exit status " +
+           str(result.returncode) + ".")
+    error_counter = error_counter + 1
+
+if (verbosity_level > 0):
+  print ("Checked " + str(case_number) + " cases.")
+
+if (error_counter > 0):
+  print ("Encountered " + str(error_counter) + " errors.")
+  sys.exit (1)
+
+# End of file check_convert_timestamps.py
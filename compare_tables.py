@@ -0,0 +1,324 @@
+#!/usr/bin/python3
+# -*- coding: utf-8
+#
+# compare_tables compares two versions of a table of extraordinary days,
+# or of UT1UTC.csv, and reports how the second differs from the first.
+#
+#   Copyright © 2026 by John Sauter <John_Sauter@systemeyescomputerstore.com>
+
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+#   The author's contact information is as follows:
+#     John Sauter
+#     System Eyes Computer Store
+#     20A Northwest Blvd.  Ste 345
+#     Nashua, NH  03063-4066
+#     telephone: (603) 424-1188
+#     e-mail: John_Sauter@systemeyescomputerstore.com
+
+#
+# Both tables are sorted by Julian Day Number, so they are compared by
+# reading them together, a line from one or the other at a time, like
+# the merge step of a merge sort.  Only a few lines are held at once,
+# whatever the size of the tables.
+#
+# For tables of extraordinary days, a leap second at the end of a day in
+# only the old table is reported as removed, and one in only the new
+# table as added.  A removal followed by an addition of the same sign,
+# or the other way around, is reported as the leap second having moved.
+# A day which has a leap second in both tables but of different signs is
+# reported as a change of sign.  The first day on which DTAI differs
+# between the tables is also reported.
+#
+# For UT1UTC.csv, the largest change in UT1-UTC is reported, along with
+# the first day on which the number of leap seconds differs.
+#
+# Like diff, the exit status is 0 if the tables are the same, 1 if they
+# differ and 2 if there was trouble.  Comments and spacing are not
+# compared.
+#
+
+import sys
+from jdcal import jd2gcal
+import argparse
+
+parser = argparse.ArgumentParser (
+  formatter_class=argparse.RawDescriptionHelpFormatter,
+  description='Compare two tables of extraordinary days or of UT1-UTC',
+  epilog='Copyright © 2026 by John Sauter' + '\n' +
+  'License GPL3+: GNU GPL version 3 or later; ' + '\n' +
+  'see <http://gnu.org/licenses/gpl.html> for the full text ' +
+  'of the license.' + '\n' +
+  'This is free software: you are free to change and redistribute it. ' +
+  '\n' +
+  'There is NO WARRANTY, to the extent permitted by law. ' + '\n' + '\n'
+  'A table whose first line starts with JDN; is taken to be UT1UTC.csv, ' +
+  'as written by read_delta_t.py; any other is taken to be a table ' +
+  'of extraordinary days.' + '\n')
+parser.add_argument ('old_file',
+                     help='the previous version of the table')
+parser.add_argument ('new_file',
+                     help='the new version of the table')
+parser.add_argument ('--tolerance', type=float, metavar='seconds',
+                     default=0.0,
+                     help='ignore changes in UT1-UTC no larger than this; ' +
+                     'default 0')
+parser.add_argument ('--version', action='version',
+                     version='compare_tables 1.1 2026-10-19',
+                     help='print the version number and exit')
+parser.add_argument ('--trace', metavar='trace_file',
+                     help='write trace output to the specified file')
+parser.add_argument ('--verbose', type=int, metavar='verbosity level',
+                     help='control the amount of output from the program: ' +
+                     '1 is normal, 0 suppresses all messages')
+
+do_trace = 0
+tracefile = ""
+verbosity_level = 1
+error_counter = 0
+
+# Parse the command line.
+arguments = parser.parse_args ()
+arguments = vars(arguments)
+
+if (arguments ['trace'] != None):
+  do_trace = 1
+  trace_file_name = arguments ['trace']
+  tracefile = open (trace_file_name, 'wt')
+
+if (arguments ['verbose'] != None):
+  verbosity_level = arguments ['verbose']
+
+# Subroutine to convert a Julian Day Number to its equivalent Gregorian date.
+month_names = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul",
+               "Aug", "Sep", "Oct", "Nov", "Dec"]
+def greg (jdn):
+  ymdf = jd2gcal (float(jdn), 0.5)
+  return (str(ymdf [2]) + " " + month_names [ymdf [1] - 1] + " " +
+          str(ymdf [0]))
+
+# Subroutine to print a message about a difference.
+def report (message):
+  if (verbosity_level > 0):
+    print (message)
+  if (do_trace == 1):
+    tracefile.write (message + "\n")
+  return
+
+# Subroutine to read the days of a table of extraordinary days, one at
+# a time.  Yields the Julian Day Number, the length of the day in
+# seconds, and DTAI.  Lines of keywords and comments are skipped.
+def read_extraordinary_days (file_name):
+  global error_counter
+  with open (file_name, 'rt') as table_file:
+    for line in table_file:
+      fields = line.split ('#', 1) [0].split()
+      if ((len(fields) == 0) or (not fields [0].isdigit())):
+        continue
+      try:
+        yield ((int(fields [0]), int(fields [1]), int(fields [2])))
+      except (IndexError, ValueError):
+        print ("Line not recognized in " + file_name + ": " + line.strip())
+        error_counter = error_counter + 1
+
+# Subroutine to read the days of UT1UTC.csv, one at a time.  Yields the
+# Julian Day Number, the number of leap seconds, and UT1-UTC.
+def read_UT1UTC (file_name):
+  global error_counter
+  with open (file_name, 'rt') as table_file:
+    for line in table_file:
+      fields = line.rstrip ('\n').split (';')
+      if (not fields [0].isdigit()):
+        continue
+      try:
+        yield ((int(fields [0]), int(fields [5]), float(fields [6])))
+      except (IndexError, ValueError):
+        print ("Line not recognized in " + file_name + ": " + line.strip())
+        error_counter = error_counter + 1
+
+# Subroutine to describe the leap second at the end of a day.
+def leap_name (day_length):
+  if (day_length > 86400):
+    return ("positive leap second")
+  if (day_length < 86400):
+    return ("negative leap second")
+  return ("day of " + str(day_length) + " seconds")
+
+# Compare two tables of extraordinary days.  Returns the number of
+# differences, counting a difference in DTAI as one.
+def compare_extraordinary_days (old_file_name, new_file_name):
+  old_days = read_extraordinary_days (old_file_name)
+  new_days = read_extraordinary_days (new_file_name)
+  old_day = next (old_days, None)
+  new_day = next (new_days, None)
+  old_DTAI = None
+  new_DTAI = None
+  divergence_jdn = None
+  counts = {'added': 0, 'removed': 0, 'moved': 0, 'changed sign': 0}
+
+  # A leap second in only one of the tables is held here until the
+  # next difference is seen, to see whether it has moved.
+  pending = None
+
+  def settle (pending):
+    if (pending != None):
+      (side, jdn, day_length) = pending
+      if (side == 'old'):
+        report ("Removed " + leap_name (day_length) + " at the end of " +
+                greg (jdn) + " (JDN " + str(jdn) + ").")
+        counts ['removed'] = counts ['removed'] + 1
+      else:
+        report ("Added " + leap_name (day_length) + " at the end of " +
+                greg (jdn) + " (JDN " + str(jdn) + ").")
+        counts ['added'] = counts ['added'] + 1
+    return (None)
+
+  def unmatched (pending, side, jdn, day_length):
+    if ((pending != None) and (pending [0] != side) and
+        (pending [2] == day_length)):
+      if (side == 'new'):
+        (old_jdn, new_jdn) = (pending [1], jdn)
+      else:
+        (old_jdn, new_jdn) = (jdn, pending [1])
+      report ("Moved " + leap_name (day_length) + " from the end of " +
+              greg (old_jdn) + " to the end of " + greg (new_jdn) + ", " +
+              str(new_jdn - old_jdn) + " days.")
+      counts ['moved'] = counts ['moved'] + 1
+      return (None)
+    settle (pending)
+    return ((side, jdn, day_length))
+
+  while ((old_day != None) or (new_day != None)):
+    if ((new_day == None) or
+        ((old_day != None) and (old_day [0] < new_day [0]))):
+      (jdn, day_length, old_DTAI) = old_day
+      pending = unmatched (pending, 'old', jdn, day_length)
+      old_day = next (old_days, None)
+    elif ((old_day == None) or (new_day [0] < old_day [0])):
+      (jdn, day_length, new_DTAI) = new_day
+      pending = unmatched (pending, 'new', jdn, day_length)
+      new_day = next (new_days, None)
+    else:
+      jdn = old_day [0]
+      pending = settle (pending)
+      if (old_day [1] != new_day [1]):
+        report ("Changed the " + leap_name (old_day [1]) +
+                " at the end of " + greg (jdn) + " (JDN " + str(jdn) +
+                ") to a " + leap_name (new_day [1]) + ".")
+        counts ['changed sign'] = counts ['changed sign'] + 1
+      old_DTAI = old_day [2]
+      new_DTAI = new_day [2]
+      old_day = next (old_days, None)
+      new_day = next (new_days, None)
+    if ((divergence_jdn == None) and (old_DTAI != None) and
+        (new_DTAI != None) and (old_DTAI != new_DTAI)):
+      divergence_jdn = jdn
+      divergence = (old_DTAI, new_DTAI)
+  settle (pending)
+
+  if (divergence_jdn != None):
+    report ("DTAI first differs after " + greg (divergence_jdn) +
+            " (JDN " + str(divergence_jdn) + "): it was " +
+            str(divergence [0]) + " and is now " + str(divergence [1]) + ".")
+  difference_count = sum (counts.values())
+  if (difference_count > 0):
+    report ("Leap seconds added " + str(counts ['added']) + ", removed " +
+            str(counts ['removed']) + ", moved " + str(counts ['moved']) +
+            ", changed sign " + str(counts ['changed sign']) + ".")
+  # The tables may have the same leap seconds but differ in DTAI.
+  if (divergence_jdn != None):
+    difference_count = difference_count + 1
+  return (difference_count)
+
+# Compare two versions of UT1UTC.csv.  Returns the number of days which
+# differ.
+def compare_UT1UTC (old_file_name, new_file_name):
+  old_days = read_UT1UTC (old_file_name)
+  new_days = read_UT1UTC (new_file_name)
+  old_day = next (old_days, None)
+  new_day = next (new_days, None)
+  tolerance = arguments ['tolerance']
+  only_old = 0
+  only_new = 0
+  changed_count = 0
+  largest_change = 0.0
+  largest_change_jdn = None
+  leap_jdn = None
+  while ((old_day != None) or (new_day != None)):
+    if ((new_day == None) or
+        ((old_day != None) and (old_day [0] < new_day [0]))):
+      only_old = only_old + 1
+      old_day = next (old_days, None)
+    elif ((old_day == None) or (new_day [0] < old_day [0])):
+      only_new = only_new + 1
+      new_day = next (new_days, None)
+    else:
+      jdn = old_day [0]
+      change = new_day [2] - old_day [2]
+      if ((abs(change) > tolerance) or (old_day [1] != new_day [1])):
+        changed_count = changed_count + 1
+      if (abs(change) > abs(largest_change)):
+        largest_change = change
+        largest_change_jdn = jdn
+      if ((leap_jdn == None) and (old_day [1] != new_day [1])):
+        leap_jdn = jdn
+        leap_change = (old_day [1], new_day [1])
+      old_day = next (old_days, None)
+      new_day = next (new_days, None)
+
+  if (only_old > 0):
+    report (str(only_old) + " days are only in " + old_file_name + ".")
+  if (only_new > 0):
+    report (str(only_new) + " days are only in " + new_file_name + ".")
+  if (abs(largest_change) > tolerance):
+    report ("The largest change in UT1-UTC is " +
+            format (largest_change, "+.7f") + " seconds, on " +
+            greg (largest_change_jdn) + " (JDN " + str(largest_change_jdn) +
+            ").")
+  if (leap_jdn != None):
+    report ("The number of leap seconds first differs on " +
+            greg (leap_jdn) + " (JDN " + str(leap_jdn) + "): it was " +
+            str(leap_change [0]) + " and is now " + str(leap_change [1]) +
+            ".")
+  if (changed_count > 0):
+    report (str(changed_count) + " days have changed.")
+  return (only_old + only_new + changed_count)
+
+# Decide the kind of table from its first line.
+old_file_name = arguments ['old_file']
+new_file_name = arguments ['new_file']
+try:
+  with open (new_file_name, 'rt') as table_file:
+    first_line = table_file.readline()
+  if (first_line.startswith ("JDN;")):
+    difference_count = compare_UT1UTC (old_file_name, new_file_name)
+  else:
+    difference_count = compare_extraordinary_days (old_file_name,
+                                                   new_file_name)
+except OSError as the_error:
+  print (str(the_error))
+  sys.exit (2)
+
+if (do_trace == 1):
+  tracefile.close()
+
+if (error_counter > 0):
+  print ("Encountered " + str(error_counter) + " errors.")
+  sys.exit (2)
+
+if (difference_count > 0):
+  sys.exit (1)
+sys.exit (0)
+
+# End of file compare_tables.py
@@ -0,0 +1,434 @@
+#!/usr/bin/python3
+# -*- coding: utf-8
+#
+# convert_timestamps reads UTC or TAI timestamps, one per line, and writes
+# them converted to the other time scale, using the table of extraordinary
+# days.  It is intended to be used as a filter in a shell pipeline.
+
+#   Copyright © 2026 by John Sauter <John_Sauter@systemeyescomputerstore.com>
+
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+#   The author's contact information is as follows:
+#     John Sauter
+#     System Eyes Computer Store
+#     20A Northwest Blvd.  Ste 345
+#     Nashua, NH  03063-4066
+#     telephone: (603) 424-1188
+#     e-mail: John_Sauter@systemeyescomputerstore.com
+
+import sys
+import re
+import warnings
+import numpy as np
+import dtai_lookup
+import utc_tai
+import argparse
+
+parser = argparse.ArgumentParser (
+  formatter_class=argparse.RawDescriptionHelpFormatter,
+  description='Convert timestamps between UTC and TAI.',
+  epilog='Copyright © 2026 by John Sauter' + '\n' +
+  'License GPL3+: GNU GPL version 3 or later; ' + '\n' +
+  'see <http://gnu.org/licenses/gpl.html> for the full text ' +
+  'of the license.' + '\n' +
+  'This is free software: you are free to change and redistribute it. ' +
+  '\n' +
+  'There is NO WARRANTY, to the extent permitted by law. ' + '\n' + '\n'
+  'The table file lists the extraordinary days.  ' +
+  'The input has one timestamp per line, ' + '\n' +
+  'as an ISO 8601 date and time, seconds since 1970 ' +
+  'or a Julian Date; ' + '\n' +
+  'the output has the converted timestamps, one per line. ' + '\n' +
+  'In ISO 8601 format a UTC time within a leap second is ' +
+  'written as 23:59:60. ' + '\n' +
+  'Lines longer than 64 characters are not converted. ' + '\n')
+parser.add_argument ('table_file',
+                     help='the table of extraordinary days')
+parser.add_argument ('input_file', nargs='?', default='-',
+                     help='the timestamps to convert, default is ' +
+                     'standard input')
+parser.add_argument ('--version', action='version',
+                     version='convert_timestamps 1.3 2026-10-19',
+                     help='print the version number and exit')
+parser.add_argument ('--from', dest='from_scale', choices=['UTC', 'TAI'],
+                     default='UTC',
+                     help='time scale of the input, default is UTC')
+parser.add_argument ('--input-format', choices=['iso', 'unix', 'jd'],
+                     default='iso',
+                     help='format of the input: iso for ISO 8601, ' +
+                     'unix for seconds since 1970, jd for Julian Date; ' +
+                     'default is iso')
+parser.add_argument ('--output-format', choices=['iso', 'unix', 'jd'],
+                     help='format of the output, default is the ' +
+                     'input format')
+parser.add_argument ('--output-file', metavar='output_file',
+                     help='write the output here instead of standard output')
+parser.add_argument ('--block-size', type=int, metavar='block_size',
+                     help='bytes of input converted at a time, ' +
+                     'default is 1048576')
+parser.add_argument ('--verbose', type=int, metavar='verbosity level',
+                     help='control the amount of output from the program: ' +
+                     '1 is normal, 0 suppresses summary messages')
+
+verbosity_level = 1
+error_counter = 0
+block_size = 1 << 20
+
+# Parse the command line.
+arguments = parser.parse_args ()
+arguments = vars(arguments)
+
+from_scale = arguments ['from_scale']
+input_format = arguments ['input_format']
+output_format = input_format
+if (arguments ['output_format'] != None):
+  output_format = arguments ['output_format']
+
+if (arguments ['block_size'] != None):
+  block_size = max (1, int(arguments ['block_size']))
+
+if (arguments ['verbose'] != None):
+  verbosity_level = int(arguments ['verbose'])
+
+nanoseconds_per_second = utc_tai.nanoseconds_per_second
+nanoseconds_per_day = utc_tai.nanoseconds_per_day
+
+# A Julian Date is kept as a count of billionths of a day.  This is
+# the Julian Date of 1970-01-01 00:00:00 on that scale.
+unix_epoch_JD_scaled = (dtai_lookup.unix_epoch_JDN * 1000000000) + 500000000
+
+# Powers of ten, for converting digits to numbers.
+powers_of_ten = np.array ([10 ** exponent for exponent in range (19)],
+                          dtype=np.int64)
+
+# A line longer than this cannot hold a timestamp.  Such lines are
+# reported rather than converted, so that one long line does not make
+# every line in its block take as much memory.
+maximum_line_length = 64
+
+# The largest number of seconds which fits in an int64 count of
+# nanoseconds.
+largest_whole = np.iinfo(np.int64).max // 1000000000
+largest_fraction = np.iinfo(np.int64).max % 1000000000
+
+# A UTC time within a leap second, such as 2016-12-31T23:59:60.5.
+leap_second_pattern = re.compile (
+  rb'(.*T[0-9][0-9]:[0-9][0-9]):60((?:\.[0-9]*)?)')
+
+# Subroutine to convert an array of byte strings, each of which is
+# all digits and exactly as long as the array's item size, into int64
+# numbers.  The strings are treated as a matrix of characters, one row
+# per string, and the digits are weighted by their powers of ten in a
+# single matrix product.  The products are exact in floating point,
+# since no number has more than fifteen digits.
+def digits_to_numbers (the_strings):
+  width = the_strings.dtype.itemsize
+  digits = the_strings.view (np.uint8).reshape (len(the_strings), width)
+  weights = powers_of_ten [width - 1::-1].astype (np.float64)
+  return (((digits - np.uint8(ord('0'))).astype (np.float64) @
+           weights).astype (np.int64))
+
+# Subroutine to convert an array of byte strings holding decimal numbers
+# into int64 values scaled by 10**9, so 1.5 becomes 1500000000.
+# A number is an optional sign, one or more digits, and optionally a
+# decimal point followed by one or more digits, with white space only
+# before and after it.  Digits after the ninth decimal place are
+# ignored.  Returns the values and a boolean array which is False where
+# the string is not such a number, or is too large for an int64.
+#
+# The strings are checked by numpy's string functions, which work on
+# all of the strings at once.  The whole part is then padded on the
+# left to ten digits and the fraction on the right to nine, so each
+# can be converted as a matrix of digits.
+def parse_decimal (the_strings):
+  the_strings = np.char.strip (the_strings)
+  parts = np.char.partition (the_strings, b'.')
+  whole_part = parts [:, 0]
+  fraction_part = parts [:, 2]
+  # At most one sign, at the start, followed by digits.
+  whole_digits = np.char.lstrip (whole_part, b'+-')
+  signs = np.char.str_len (whole_part) - np.char.str_len (whole_digits)
+  negative = (signs == 1) & np.char.startswith (whole_part, b'-')
+  valid = ((signs <= 1) & np.char.isdigit (whole_digits) &
+           ((parts [:, 1] == b'') | np.char.isdigit (fraction_part)))
+  # The whole part may have at most ten significant digits, and must
+  # leave room for the fraction in an int64.
+  significant = np.char.lstrip (whole_digits, b'0')
+  valid = valid & (np.char.str_len (significant) <= 10)
+  whole = digits_to_numbers (np.char.rjust (
+    np.where (valid, significant, b'').astype ('S10'), 10, b'0'))
+  fraction = digits_to_numbers (np.char.ljust (
+    np.where (valid, fraction_part, b'').astype ('S9'), 9, b'0'))
+  valid = valid & ((whole < largest_whole) |
+                   ((whole == largest_whole) &
+                    (fraction <= largest_fraction)))
+  values = (np.where (valid, whole, 0) * 1000000000) + fraction
+  values = np.where (negative, -values, values)
+  return (values, valid)
+
+# The two characters of each number from 00 to 99, for writing numbers
+# two digits at a time.
+digit_pairs = np.array ([format (number, "02d").encode ('ascii')
+                         for number in range (100)]).view (np.uint16)
+
+# Subroutine to write an array of int64 values scaled by 10**9 as
+# decimal numbers with nine decimal places, one per line.
+def format_decimal (the_values):
+  negative = the_values < 0
+  magnitude = np.abs (the_values)
+  whole = magnitude // 1000000000
+  fraction = magnitude % 1000000000
+  # Columns: a space, the sign, 10 integer digits, point, 9 fraction
+  # digits, newline and a space.  Pairs of digits start in even
+  # columns, so they can be stored as 16-bit values.
+  characters = np.empty ((len(the_values), 24), dtype=np.uint8)
+  pairs = characters.view (np.uint16)
+  characters [:, 0] = ord(' ')
+  characters [:, 1] = np.where (negative, ord('-'), ord(' '))
+  for place in range (5):
+    quotient = whole // 100
+    pairs [:, 5 - place] = np.take (digit_pairs, whole - (quotient * 100))
+    whole = quotient
+  characters [:, 12] = ord('.')
+  for place in range (4):
+    quotient = fraction // 100
+    pairs [:, 10 - place] = np.take (digit_pairs,
+                                     fraction - (quotient * 100))
+    fraction = quotient
+  characters [:, 13] = fraction + ord('0')
+  characters [:, 22] = ord('\n')
+  characters [:, 23] = ord(' ')
+  # Leading zeros of the integer part, except the last, become spaces.
+  digit_count = np.maximum (np.searchsorted (powers_of_ten [:11],
+                                             magnitude // 1000000000,
+                                             side='right'), 1)
+  characters [:, 2:12] = np.where (
+    np.arange (10) [np.newaxis, :] < (10 - digit_count) [:, np.newaxis],
+    ord(' '), characters [:, 2:12])
+  return (characters.tobytes ().replace (b' ', b''))
+
+# Subroutine to write an array of datetime64[ns] values in ISO 8601
+# format, one per line, with nine decimal places in the seconds.
+# Where leap is True the time is within a leap second, and is written
+# as 23:59:60 rather than 23:59:59.  The calendar date is computed from the count of days using the
+# algorithm of Howard Hinnant, "chrono-Compatible Low-Level Date
+# Algorithms".
+def format_iso (the_values, leap):
+  nanoseconds = the_values.view (np.int64)
+  days = nanoseconds // nanoseconds_per_day
+  nanoseconds_of_day = nanoseconds - (days * nanoseconds_per_day)
+  shifted_days = days + 719468
+  era = shifted_days // 146097
+  day_of_era = shifted_days - (era * 146097)
+  year_of_era = (day_of_era - (day_of_era // 1460) + (day_of_era // 36524) -
+                 (day_of_era // 146096)) // 365
+  day_of_year = day_of_era - ((365 * year_of_era) + (year_of_era // 4) -
+                              (year_of_era // 100))
+  shifted_month = ((5 * day_of_year) + 2) // 153
+  day_no = day_of_year - (((153 * shifted_month) + 2) // 5) + 1
+  month_no = np.where (shifted_month < 10, shifted_month + 3,
+                       shifted_month - 9)
+  year_no = year_of_era + (era * 400) + (month_no <= 2)
+  seconds_of_day = nanoseconds_of_day // nanoseconds_per_second
+  fields = ((year_no, 4), (ord('-'), 0), (month_no, 2), (ord('-'), 0),
+            (day_no, 2), (ord('T'), 0), (seconds_of_day // 3600, 2),
+            (ord(':'), 0), ((seconds_of_day // 60) % 60, 2), (ord(':'), 0),
+            ((seconds_of_day % 60) + leap, 2), (ord('.'), 0),
+            (nanoseconds_of_day % nanoseconds_per_second, 9),
+            (ord('\n'), 0))
+  characters = np.empty ((len(the_values), 30), dtype=np.uint8)
+  column = 0
+  for (field, width) in fields:
+    if (width == 0):
+      characters [:, column] = field
+      column = column + 1
+      continue
+    for place in range (width):
+      characters [:, column + width - 1 - place] = (
+        (field // powers_of_ten [place]) % 10 + ord('0'))
+    column = column + width
+  return (characters.tobytes ())
+
+# Subroutine to convert a block of input strings into int64 nanoseconds
+# since 1970 on the input time scale.  Returns the values, a boolean
+# array which is False where the string could not be converted, and a
+# boolean array which is True where a UTC time is within a leap
+# second, written as 23:59:60; for those the value is that of 23:59:59.
+def parse_block (the_strings):
+  leap = np.zeros (len(the_strings), dtype=bool)
+  if (input_format == "iso"):
+    the_strings = np.char.strip (the_strings)
+    # A Z at the end, for UTC, is the same as no time zone.
+    parts = np.char.rpartition (the_strings, b'Z')
+    the_strings = np.where ((parts [:, 1] == b'Z') & (parts [:, 2] == b''),
+                            parts [:, 0], the_strings)
+    if (from_scale == "UTC"):
+      for line_index in np.flatnonzero (
+          np.char.find (the_strings, b':60') >= 0):
+        match = leap_second_pattern.fullmatch (the_strings [line_index])
+        if (match != None):
+          the_strings [line_index] = (match.group (1) + b':59' +
+                                      match.group (2))
+          leap [line_index] = True
+    # numpy warns about, but accepts, a time zone offset.
+    with warnings.catch_warnings ():
+      warnings.simplefilter ('ignore')
+      try:
+        values = the_strings.astype ('datetime64[ns]').view (np.int64)
+        valid = np.ones (len(the_strings), dtype=bool)
+      except ValueError:
+        # Find the lines which are not valid one at a time.
+        values = np.zeros (len(the_strings), dtype=np.int64)
+        valid = np.ones (len(the_strings), dtype=bool)
+        for line_index in range (len(the_strings)):
+          try:
+            values [line_index] = np.datetime64 (
+              the_strings [line_index].decode ('utf-8'),
+              'ns').view (np.int64)
+          except ValueError:
+            valid [line_index] = False
+    valid = valid & (values != np.iinfo(np.int64).min)
+    return (values, valid, leap)
+  (values, valid) = parse_decimal (the_strings)
+  if (input_format == "unix"):
+    return (values, valid, leap)
+  # A Julian Date, in billionths of a day.  Dates too far from 1970
+  # for nanoseconds to fit in an int64 are not valid.
+  values = values - unix_epoch_JD_scaled
+  valid = valid & (np.abs (values) < (np.iinfo(np.int64).max // 86400))
+  return (np.where (valid, values, 0) * 86400, valid, leap)
+
+# Subroutine to write a block of int64 nanoseconds in the output format.
+# The leap argument is True for each UTC time within a leap second,
+# which is written as 23:59:60 in ISO 8601 format.
+def format_block (the_values, leap):
+  if (output_format == "iso"):
+    return (format_iso (the_values, leap))
+  if (output_format == "unix"):
+    return (format_decimal (the_values))
+  return (format_decimal ((the_values // 86400) + unix_epoch_JD_scaled))
+
+# Subroutine to read the input a block at a time, so the memory used
+# does not depend on the size of the input.  Yields lists of lines,
+# without their line ends.  Only the start of a line which is too long
+# is kept, which is enough to show that it is too long.
+def read_blocks (the_file):
+  partial_line = b''
+  while True:
+    data = the_file.read (block_size)
+    if (len(data) == 0):
+      break
+    the_lines = (partial_line + data).split (b'\n')
+    partial_line = the_lines.pop ()
+    partial_line = partial_line [:maximum_line_length + 1]
+    if (len(the_lines) > 0):
+      yield (the_lines)
+  if (len(partial_line) > 0):
+    yield ([partial_line])
+  return
+
+converter = utc_tai.TimestampConverter (arguments ['table_file'])
+
+if (arguments ['input_file'] == '-'):
+  infile = sys.stdin.buffer
+else:
+  infile = open (arguments ['input_file'], 'rb')
+if (arguments ['output_file'] != None):
+  outfile = open (arguments ['output_file'], 'wb')
+else:
+  outfile = sys.stdout.buffer
+
+# The reasons a line cannot be converted, in the order they are
+# checked.
+problem_messages = ("",
+                    " is longer than " + str(maximum_line_length) +
+                    " characters: ",
+                    " is not recognized: ",
+                    " is outside the table: ",
+                    " is not during a leap second: ")
+
+line_number = 0
+converted_count = 0
+for the_lines in read_blocks (infile):
+  if (max (map (len, the_lines)) <= maximum_line_length):
+    the_strings = np.array (the_lines, dtype=np.bytes_)
+    too_long = np.zeros (len(the_lines), dtype=bool)
+  else:
+    # Each string holds one more character than a line may have, so a
+    # line which is too long can be recognized.
+    the_strings = np.array (the_lines,
+                            dtype='S' + str(maximum_line_length + 1))
+    too_long = np.char.str_len (the_strings) > maximum_line_length
+    the_strings = np.where (too_long, b'', the_strings)
+  (values, recognized, leap) = parse_block (the_strings)
+  if (from_scale == "UTC"):
+    in_range = converter.utc_in_range (values.view ('datetime64[ns]'))
+  else:
+    in_range = converter.tai_in_range (values)
+  problem = np.zeros (len(the_lines), dtype=np.int8)
+  problem [~in_range] = 3
+  problem [~recognized] = 2
+  problem [too_long] = 1
+  valid = (problem == 0)
+  if (from_scale == "UTC"):
+    values = np.where (valid, values, converter.first_UTC)
+    converted = converter.utc_to_tai (values.view ('datetime64[ns]'))
+    # A time written as 23:59:60 was converted as 23:59:59, so it is
+    # one second later, and must be within a leap second.
+    if (np.any (leap)):
+      converted [leap] = converted [leap] + nanoseconds_per_second
+      problem [valid & leap & ~converter.leap_second_mask (converted)] = 4
+      valid = (problem == 0)
+    leap_output = np.zeros (len(the_lines), dtype=bool)
+  else:
+    values = np.where (valid, values, converter.first_TAI)
+    converted = converter.tai_to_utc (values).view (np.int64)
+    leap_output = converter.leap_second_mask (values)
+  if (not np.all (valid)):
+    # Report the lines which could not be converted.
+    for line_index in np.flatnonzero (~valid):
+      print ("Line " + str(line_number + line_index + 1) +
+             problem_messages [problem [line_index]] +
+             the_lines [line_index][:maximum_line_length].decode (
+               'utf-8', 'replace').rstrip () +
+             ("..." if (too_long [line_index]) else ""),
+             file=sys.stderr)
+      error_counter = error_counter + 1
+    # Write an empty line for each line which could not be converted,
+    # so the output stays aligned with the input.
+    output_lines = format_block (converted, leap_output).split (b'\n')
+    for line_index in np.flatnonzero (~valid):
+      output_lines [line_index] = b''
+    outfile.write (b'\n'.join (output_lines))
+  else:
+    outfile.write (format_block (converted, leap_output))
+  line_number = line_number + len(the_lines)
+  converted_count = converted_count + int(np.sum (valid))
+
+outfile.flush ()
+if (arguments ['output_file'] != None):
+  outfile.close ()
+if (arguments ['input_file'] != '-'):
+  infile.close ()
+
+if (verbosity_level > 1):
+  print ("Converted " + str(converted_count) + " timestamps.",
+         file=sys.stderr)
+
+if (error_counter > 0):
+  print ("Encountered " + str(error_counter) + " errors.", file=sys.stderr)
+  sys.exit (1)
+
+# End of file convert_timestamps.py
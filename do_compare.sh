@@ -25,12 +25,17 @@
 #     telephone: (603) 424-1188
 #     e-mail: John_Sauter@systemeyescomputerstore.com
 
-diff -q exdays_05_previous.dat exdays_05.dat
+# compare_tables.py reports the leap seconds added, removed or moved,
+# and how much UT1-UTC changed.  Its exit status is like that of diff.
+# The first parameter is the source directory, which holds
+# compare_tables.py; the tables are in the current directory.
+srcdir=${1:-.}
+python3 ${srcdir}/compare_tables.py exdays_05_previous.dat exdays_05.dat
 if [ $? -ne 0 ]; then
     cp -p exdays_05_previous.dat different/exdays_05.dat
 fi
 
-diff -q UT1UTC_previous.csv UT1UTC.csv
+python3 ${srcdir}/compare_tables.py UT1UTC_previous.csv UT1UTC.csv
 if [ $? -ne 0 ]; then
     cp -p UT1UTC_previous.csv different/UT1UTC.csv
 fi
@@ -0,0 +1,231 @@
+#!/usr/bin/python3
+# -*- coding: utf-8
+#
+# dtai_lookup loads the table of extraordinary days and answers questions
+# about the value of DTAI on any date, for one date or for many at once.
+# It can be imported by other Python programs or run from the command line.
+
+#   Copyright © 2026 by John Sauter <John_Sauter@systemeyescomputerstore.com>
+
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+#   The author's contact information is as follows:
+#     John Sauter
+#     System Eyes Computer Store
+#     20A Northwest Blvd.  Ste 345
+#     Nashua, NH  03063-4066
+#     telephone: (603) 424-1188
+#     e-mail: John_Sauter@systemeyescomputerstore.com
+
+import re
+import numpy as np
+
+# The Julian Day Number of January 1, 1970, the origin of numpy's
+# datetime64 values.
+unix_epoch_JDN = 2440587
+
+# The lines of the table are recognized using the same rules as
+# read_extraordinary_days_table.py.
+empty_line_pattern = re.compile ("^\\s*(#.*)?\n$")
+keyword_line_pattern = re.compile (
+  "^\\s*(?P<keyword>(\\w)+)\\s*=\\s*(?P<value>(\\w)+)\\s*(#.*)?\n$")
+data_line_pattern = re.compile (
+  "^\\s*(?P<jdn>(\\d)+)\\s+(?P<lod>(\\d)+)\\s+(?P<DTAI>-?(\\d)+)\\s*(#.*)?\n$")
+
+# Convert an array of numpy datetime64 values into Julian Day Numbers.
+# Each instant is assigned to the UTC day which contains it.
+def datetime64_to_JDN (the_datetimes):
+  the_days = np.asarray(the_datetimes).astype ('datetime64[D]')
+  return (the_days.astype (np.int64) + unix_epoch_JDN)
+
+# Convert an array of Julian Day Numbers into numpy datetime64 days.
+def JDN_to_datetime64 (the_JDNs):
+  the_days = np.asarray(the_JDNs, dtype=np.int64) - unix_epoch_JDN
+  return (the_days.astype ('datetime64[D]'))
+
+# The table of extraordinary days, held as sorted arrays.
+#
+# jdn, day_length and DTAI_at_end hold the data lines of the table: the
+# Julian Day Number of each extraordinary day, its length in seconds,
+# and the value of DTAI at the end of that day.  symbols holds the
+# symbol=value lines.
+#
+# For lookups the table is also held as a step function: change_JDN is
+# the first day of each period of constant DTAI, and change_DTAI is the
+# value of DTAI throughout that period.  Days before the first
+# extraordinary day are given the value of DTAI before it.
+class ExtraordinaryDays:
+
+  # Subroutine to read the table from an extraordinary days file.
+  def __init__ (self, file_name):
+    self.symbols = dict()
+    jdn_list = list()
+    lod_list = list()
+    DTAI_list = list()
+    line_number = 0
+    with open (file_name, 'rb') as infile:
+      for byte_string in infile:
+        line = byte_string.decode ('utf-8')
+        line_number = line_number + 1
+        if (empty_line_pattern.match (line)):
+          continue
+        matchc = keyword_line_pattern.match (line)
+        if (matchc):
+          self.symbols[matchc.group ('keyword')] = matchc.group ('value')
+          continue
+        matchd = data_line_pattern.match (line)
+        if (matchd):
+          jdn_list.append (int(matchd.group ('jdn')))
+          lod_list.append (int(matchd.group ('lod')))
+          DTAI_list.append (int(matchd.group ('DTAI')))
+          continue
+        raise ValueError (str(file_name) + ": line " + str(line_number) +
+                          " is not recognized.")
+    if (len(jdn_list) == 0):
+      raise ValueError (str(file_name) + ": there are no data lines.")
+
+    self.jdn = np.array (jdn_list, dtype=np.int64)
+    self.day_length = np.array (lod_list, dtype=np.int64)
+    self.DTAI_at_end = np.array (DTAI_list, dtype=np.int64)
+    if (np.any (np.diff (self.jdn) <= 0)):
+      raise ValueError (str(file_name) +
+                        ": Julian Day Numbers are not ascending.")
+
+    self.start_date = int(self.symbols.get ("START_DATE", self.jdn[0]))
+    self.end_date = int(self.symbols.get ("END_DATE", self.jdn[-1]))
+    if ("EXPIRATION_DATE" in self.symbols):
+      self.expiration_date = int(self.symbols ["EXPIRATION_DATE"])
+    else:
+      self.expiration_date = None
+
+    first_DTAI = (self.DTAI_at_end[0] - (self.day_length[0] - 86400))
+    self.change_JDN = np.concatenate ((
+      [min (self.start_date, int(self.jdn[0]))], self.jdn + 1))
+    self.change_DTAI = np.concatenate (([first_DTAI], self.DTAI_at_end))
+
+  # Subroutine to convert the argument of a query into an array of
+  # Julian Day Numbers.  numpy datetime64 values are converted to the
+  # UTC day containing them.
+  @staticmethod
+  def as_JDN (the_dates):
+    the_array = np.asarray (the_dates)
+    if (the_array.dtype.kind == 'M'):
+      return (datetime64_to_JDN (the_array))
+    return (the_array.astype (np.int64))
+
+  # Subroutine to return DTAI in effect during each of the specified
+  # days.  The argument may be a Julian Day Number, a numpy datetime64,
+  # or an array of either; the result has the same shape.
+  def dtai_at (self, the_dates):
+    the_JDNs = self.as_JDN (the_dates)
+    positions = np.searchsorted (self.change_JDN, the_JDNs,
+                                 side='right') - 1
+    positions = np.maximum (positions, 0)
+    result = self.change_DTAI [positions]
+    if (result.ndim == 0):
+      return (int(result))
+    return (result)
+
+  # Subroutine to return the length in seconds of each of the specified
+  # days.
+  def length_of_day (self, the_dates):
+    the_JDNs = self.as_JDN (the_dates)
+    positions = np.searchsorted (self.jdn, the_JDNs)
+    positions = np.minimum (positions, len(self.jdn) - 1)
+    result = np.where (self.jdn [positions] == the_JDNs,
+                       self.day_length [positions], 86400)
+    if (result.ndim == 0):
+      return (int(result))
+    return (result)
+
+  # Subroutine to return the extraordinary days from start_date through
+  # end_date.  The result is three arrays: the Julian Day Numbers, the
+  # lengths of the days and the values of DTAI at the end of each day.
+  def extraordinary_days_between (self, start_date, end_date):
+    first = np.searchsorted (self.jdn, self.as_JDN (start_date),
+                             side='left')
+    last = np.searchsorted (self.jdn, self.as_JDN (end_date), side='right')
+    return (self.jdn [first:last], self.day_length [first:last],
+            self.DTAI_at_end [first:last])
+
+  # Subroutine to return DTAI for every day from start_date through
+  # end_date.  The result is two arrays: the Julian Day Numbers and the
+  # values of DTAI during those days.
+  def dtai_between (self, start_date, end_date):
+    the_JDNs = np.arange (self.as_JDN (start_date),
+                          self.as_JDN (end_date) + 1, dtype=np.int64)
+    return (the_JDNs, self.dtai_at (the_JDNs))
+
+#
+# When run as a program, report the value of DTAI on the specified days.
+#
+if (__name__ == "__main__"):
+  import sys
+  import argparse
+
+  parser = argparse.ArgumentParser (
+    formatter_class=argparse.RawDescriptionHelpFormatter,
+    description='Look up DTAI in the table of extraordinary days.',
+    epilog='Copyright © 2026 by John Sauter' + '\n' +
+    'License GPL3+: GNU GPL version 3 or later; ' + '\n' +
+    'see <http://gnu.org/licenses/gpl.html> for the full text ' +
+    'of the license.' + '\n' +
+    'This is free software: you are free to change and redistribute it. ' +
+    '\n' +
+    'There is NO WARRANTY, to the extent permitted by law. ' + '\n' + '\n'
+    'The input file lists the extraordinary days; ' +
+    'the dates are Julian Day Numbers or ISO 8601 dates. ' + '\n')
+  parser.add_argument ('input_file',
+                       help='the table of extraordinary days')
+  parser.add_argument ('dates', nargs='*',
+                       help='the dates to look up')
+  parser.add_argument ('--version', action='version',
+                       version='dtai_lookup 1.1 2026-10-19',
+                       help='print the version number and exit')
+  parser.add_argument ('--verbose', type=int, metavar='verbosity level',
+                       help='control the amount of output from the ' +
+                       'program: 1 is normal, 0 suppresses summary messages')
+
+  verbosity_level = 1
+  error_counter = 0
+
+  arguments = parser.parse_args ()
+  arguments = vars(arguments)
+
+  if (arguments ['verbose'] != None):
+    verbosity_level = int(arguments ['verbose'])
+
+  table = ExtraordinaryDays (arguments ['input_file'])
+  if (verbosity_level > 0):
+    print ("Table has " + str(len(table.jdn)) + " extraordinary days " +
+           "from " + str(table.start_date) + ".5 to " +
+           str(table.end_date) + ".5.")
+
+  for date_text in arguments ['dates']:
+    if (re.match ("^-?\\d+$", date_text)):
+      the_date = int(date_text)
+    else:
+      try:
+        the_date = np.datetime64 (date_text)
+      except ValueError:
+        print ("Date " + date_text + " is not recognized.")
+        error_counter = error_counter + 1
+        continue
+    print (date_text + " " + str(table.dtai_at (the_date)))
+
+  if (error_counter > 0):
+    print ("Encountered " + str(error_counter) + " errors.")
+    sys.exit (1)
+
+# End of file dtai_lookup.py
@@ -26,14 +26,19 @@
 #     telephone: (603) 424-1188
 #     e-mail: John_Sauter@systemeyescomputerstore.com
 
+import sys
+import os
 import datetime
 import calendar
+import re
+import numpy as np
 import pandas as pd
 
 from jdcal import gcal2jd, jd2gcal
 import pprint
 
 import argparse
+import npz_columns
 
 parser = argparse.ArgumentParser (
   formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -44,22 +49,45 @@ parser = argparse.ArgumentParser (
   'of the license.' + '\n' +
   'This is free software: you are free to change and redistribute it. ' + '\n' +
   'There is NO WARRANTY, to the extent permitted by law. ' + '\n' + '\n' +
-  'The input file is the CSV file with UT1-UTC.' + '\n')
+  'The input file is the CSV file with UT1-UTC.  ' +
+  'If there is a numpy .npz file of the same name ' + '\n' +
+  'which is not older it is read instead.' + '\n' +
+  'Reference dates are Julian Day Numbers or ISO 8601 dates.  ' +
+  'With reference dates the output ' + '\n' +
+  'has a line for each of the next leap seconds after each date, ' +
+  'in CSV format.' + '\n')
 parser.add_argument ('input1_file',
                      help='The values of UT1-UTC in CSV format')
 parser.add_argument ('--version', action='version', 
-                     version='find_next_leap_second 1.0 2021-09-12',
+                     version='find_next_leap_second 1.5 2026-10-19',
                      help='print the version number and exit')
 parser.add_argument ('--trace', metavar='trace_file',
                      help='write trace output to the specified file')
 parser.add_argument ('--verbose', type=int, metavar='verbosity_level',
                      help='control the amount of output from the program: ' +
                      '1 is normal, 0 suppresses summary messages')
+parser.add_argument ('--dates', nargs='+', metavar='date',
+                     help='find the leap seconds after these dates ' +
+                     'instead of after today')
+parser.add_argument ('--date-range', nargs=2, metavar=('start', 'end'),
+                     help='find the leap seconds after each date ' +
+                     'from start through end')
+parser.add_argument ('--step', type=int, metavar='days',
+                     help='days between dates in the date range, ' +
+                     'default is 1')
+parser.add_argument ('--count', type=int, metavar='count',
+                     help='number of leap seconds to find after each ' +
+                     'reference date, default is 1')
+parser.add_argument ('--output', metavar='output_file',
+                     help='write the leap seconds after the reference ' +
+                     'dates to the specified file instead of standard output')
 
 do_trace = 0
 tracefile = ""
 verbosity_level = 1
 error_counter = 0
+step_days = 1
+leap_count = 1
 
 # Parse the command line.
 arguments = parser.parse_args ()
@@ -70,6 +98,15 @@ if (arguments ['trace'] != None):
   trace_file_name = arguments ['trace']
   tracefile = open (trace_file_name, 'wt')
 
+if (arguments ['verbose'] != None):
+  verbosity_level = int(arguments ['verbose'])
+
+if (arguments ['step'] != None):
+  step_days = max (1, int(arguments ['step']))
+
+if (arguments ['count'] != None):
+  leap_count = max (1, int(arguments ['count']))
+
 # Subroutine to convert a Julian Day Number to its equivalent Gregorian date.
 month_names = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul",
                "Aug", "Sep", "Oct", "Nov", "Dec"] 
@@ -100,17 +137,45 @@ def JDN_to_Timestamp (the_JDN):
   mday_no = ymdf [2]
   return (dateparse(year_no, month_no, mday_no))
 
+# Convert a reference date, either a Julian Day Number or an ISO 8601
+# date, into a Julian Day Number.  Return None if it is not recognized.
+def reference_JDN (the_text):
+  if (re.match ("^-?\\d+$", the_text)):
+    return (int(the_text))
+  try:
+    the_date = np.datetime64 (the_text, 'D')
+  except ValueError:
+    return (None)
+  return (int(the_date.astype (np.int64)) + Julian (1970, 1, 1))
+
 # Read the CSV file into a Pandas dataframe.
 input1_file_name = arguments["input1_file"]
-data = pd.read_csv (input1_file_name, sep=';')
+npz_file_name = re.sub ("\\.(csv|npz)$", "", input1_file_name) + ".npz"
+columns = None
+if ((os.path.exists (npz_file_name)) and
+    ((not os.path.exists (input1_file_name)) or
+     (os.path.getmtime (npz_file_name) >=
+      os.path.getmtime (input1_file_name)))):
+  columns = npz_columns.load_npz_columns (npz_file_name)
+  if ((columns == None) and (verbosity_level > 0)):
+    print ("File " + npz_file_name + " is not recognized; using " +
+           input1_file_name + ".")
+if (columns != None):
+  data = pd.DataFrame ({
+    "JDN": columns ["JDN"], "Year": columns ["Year"],
+    "Month": columns ["Month"], "Day": columns ["Day"],
+    "source": pd.Categorical.from_codes (columns ["source"],
+                                         columns ["source_names"]),
+    "leap": columns ["leap"], "UT1-UTC": columns ["UT1-UTC"]}, copy=False)
+else:
+  data = pd.read_csv (input1_file_name, sep=';')
 if (do_trace > 0):
   tracefile.write ("CSV file:\n")
   pprint.pprint (data, tracefile)
 
 # index the dataframe by date.
-data['Date'] = data.apply(lambda x:
-                          dateparse (x['Year'], x['Month'], x['Day']),
-                          axis='columns')
+data['Date'] = pd.to_datetime(data[['Year', 'Month', 'Day']].rename(
+  columns={'Year': 'year', 'Month': 'month', 'Day': 'day'}))
 data = data.set_index('Date')
 if (do_trace > 0):
   tracefile.write ("after indexing by date:\n")
@@ -147,50 +212,140 @@ if (do_trace > 0):
   pprint.pprint (data_to_chart, tracefile)
   tracefile.flush()
 
-# Compute today's date.
-today = pd.Timestamp.now(None)
-today = today.replace(hour = 0, minute=0, second=0, microsecond=0)
+# The leap column changes after the last day before each leap second.
+# Find those days all at once; each query is then a search of this array.
+JDN_values = data["JDN"].to_numpy()
+leap_values = data["leap"].to_numpy()
+leap_indices = np.flatnonzero(np.diff(leap_values) != 0)
 
-# Find the row corresponding to today's date in the dataframe.
-today_row = data.loc[today]
-if (do_trace > 0):
-  tracefile.write ("Today:\n")
-  pprint.pprint (today_row, tracefile)
-
-# We will sequence through the dataframe one day at a time.
-one_day = datetime.timedelta(days=1)
-
-# Find the next leap second.
-today_leap = today_row.leap
-this_date = today
-while (today_leap == data.loc[this_date].leap):
-  this_date = this_date + one_day
-this_date = this_date - one_day
-
-next_leap_year = int(data.loc[this_date].Year)
-next_leap_month = int(data.loc[this_date].Month)
-next_leap_mday = int(data.loc[this_date].Day)
-next_leap_date = pd.Timestamp(year = next_leap_year,
-                               month = next_leap_month,
-                               day = next_leap_mday)
-next_leap_UT1UTC = data.loc[this_date]["UT1-UTC"]
-if (verbosity_level > 1):
-  print ("UT1-UTC at next leap is " + format (next_leap_UT1UTC, ".3f") + ".")
-next_leap_value = data.loc[this_date + one_day].leap
-if (do_trace > 0):
-  tracefile.write ("next leap value: " + str(next_leap_value) + ".\n")
-  tracefile.write ("today leap: " + str(today_leap) + ".\n")
-if (next_leap_value > today_leap):
-  next_leap_direction = "positive"
-if (next_leap_value < today_leap):
-  next_leap_direction = "negative"
+# Collect the reference dates, if any were specified.
+reference_JDNs = list()
+if (arguments ['dates'] != None):
+  for date_text in arguments ['dates']:
+    the_JDN = reference_JDN (date_text)
+    if (the_JDN == None):
+      print ("Date " + date_text + " is not recognized.")
+      error_counter = error_counter + 1
+      continue
+    # A date before the first row would be taken as that row, skipping
+    # any leap seconds between the date and the start of the data.
+    if (the_JDN < first_JDN):
+      print ("Date " + date_text + " is before the start of the CSV " +
+             "file, " + greg (first_JDN, "-") + ".")
+      error_counter = error_counter + 1
+      continue
+    reference_JDNs.append (the_JDN)
+if (arguments ['date_range'] != None):
+  range_start = reference_JDN (arguments ['date_range'][0])
+  range_end = reference_JDN (arguments ['date_range'][1])
+  if ((range_start == None) or (range_end == None)):
+    print ("Date range " + " ".join (arguments ['date_range']) +
+           " is not recognized.")
+    error_counter = error_counter + 1
+  else:
+    range_JDNs = list(range (range_start, range_end + 1, step_days))
+    early_JDNs = [the_JDN for the_JDN in range_JDNs if (the_JDN < first_JDN)]
+    if (len(early_JDNs) > 0):
+      print (str(len(early_JDNs)) + " dates of the range are before the " +
+             "start of the CSV file, " + greg (first_JDN, "-") + ".")
+      error_counter = error_counter + 1
+    reference_JDNs.extend ([the_JDN for the_JDN in range_JDNs
+                            if (the_JDN >= first_JDN)])
+
+if ((arguments ['dates'] != None) or (arguments ['date_range'] != None)):
+
+  # For each reference date, find the row for that date, or the first
+  # date after it, then the next leap_count leap seconds starting there.
+  reference_JDNs = np.array (reference_JDNs, dtype=np.int64)
+  reference_indices = np.searchsorted (JDN_values, reference_JDNs)
+  first_leaps = np.searchsorted (leap_indices, reference_indices)
+  leap_numbers = np.arange (leap_count)
+  leap_positions = first_leaps [:, np.newaxis] + leap_numbers [np.newaxis, :]
+  found = (leap_positions < len(leap_indices)).reshape (-1)
+  leap_positions = leap_positions.reshape (-1) [found]
+  row_indices = leap_indices [leap_positions]
+
+  leap_steps = leap_values [row_indices + 1] - leap_values [row_indices]
+  reference_dates = (np.repeat (reference_JDNs, leap_count) [found] -
+                     Julian (1970, 1, 1)).astype ('datetime64[D]')
+  leap_dates = (JDN_values [row_indices] -
+                Julian (1970, 1, 1)).astype ('datetime64[D]')
+  results = pd.DataFrame ({
+    "reference_date": np.datetime_as_string (reference_dates),
+    "number": np.tile (leap_numbers + 1, len(reference_JDNs)) [found],
+    "leap_date": np.datetime_as_string (leap_dates),
+    "JDN": JDN_values [row_indices],
+    "direction": np.where (leap_steps > 0, "positive", "negative"),
+    "UT1-UTC": data["UT1-UTC"].to_numpy() [row_indices]})
+  if (do_trace > 0):
+    tracefile.write ("Leap seconds after the reference dates:\n")
+    pprint.pprint (results, tracefile)
+
+  if (arguments ['output'] != None):
+    results.to_csv (arguments ['output'], sep=';', index=False)
+  else:
+    results.to_csv (sys.stdout, sep=';', index=False)
+
+  missing_count = (len(reference_JDNs) * leap_count) - int(np.sum (found))
+  if ((verbosity_level > 0) and (missing_count > 0)):
+    print ("The CSV file ends before " + str(missing_count) +
+           " of the leap seconds.", file=sys.stderr)
+
+else:
+
+  # Compute today's date.
+  today = pd.Timestamp.now(None)
+  today = today.replace(hour = 0, minute=0, second=0, microsecond=0)
+  today_JDN = Julian (today.year, today.month, today.day)
+
+  # Find the row corresponding to today's date in the dataframe,
+  # and the first leap second not before today.
+  today_index = int(np.searchsorted (JDN_values, today_JDN))
+  next_leap = np.searchsorted(leap_indices, today_index)
+  if ((today_JDN < first_JDN) or (today_JDN > last_JDN)):
+    print ("Today, " + greg (today_JDN, "-") +
+           ", is not in the CSV file.")
+    error_counter = error_counter + 1
+  elif (next_leap >= len(leap_indices)):
+    if (verbosity_level > 0):
+      print ("There are no leap seconds after today in the CSV file.")
+  else:
+    today_row = data.iloc[today_index]
+    if (do_trace > 0):
+      tracefile.write ("Today:\n")
+      pprint.pprint (today_row, tracefile)
+
+    # Find the next leap second.
+    next_leap_index = leap_indices[next_leap]
+    today_leap = today_row.leap
+    this_row = data.iloc[next_leap_index]
+    next_leap_year = int(this_row.Year)
+    next_leap_month = int(this_row.Month)
+    next_leap_mday = int(this_row.Day)
+    next_leap_date = pd.Timestamp(year = next_leap_year,
+                                   month = next_leap_month,
+                                   day = next_leap_mday)
+    next_leap_UT1UTC = this_row["UT1-UTC"]
+    if (verbosity_level > 1):
+      print ("UT1-UTC at next leap is " + format (next_leap_UT1UTC, ".3f") +
+             ".")
+    next_leap_value = leap_values[next_leap_index + 1]
+    if (do_trace > 0):
+      tracefile.write ("next leap value: " + str(next_leap_value) + ".\n")
+      tracefile.write ("today leap: " + str(today_leap) + ".\n")
+    if (next_leap_value > today_leap):
+      next_leap_direction = "positive"
+    if (next_leap_value < today_leap):
+      next_leap_direction = "negative"
 
-if (verbosity_level > 0):
-  print ("The next leap second will be a " + next_leap_direction +
-         " leap second on " + next_leap_date.strftime ("%B %d, %Y") + ".")
+    if (verbosity_level > 0):
+      print ("The next leap second will be a " + next_leap_direction +
+             " leap second on " + next_leap_date.strftime ("%B %d, %Y") +
+             ".")
 
 if (do_trace == 1):
   tracefile.close()
 
 if (error_counter > 0):
   print ("Encountered " + str(error_counter) + " errors.")
+  sys.exit (1)
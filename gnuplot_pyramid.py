@@ -0,0 +1,130 @@
+#!/usr/bin/python3
+# -*- coding: utf-8
+#
+# gnuplot_pyramid writes data for gnuplot at several resolutions, so
+# that a plot of a long span of time need not read every point.  It is
+# imported by read_extraordinary_days_table.py and read_delta_t.py, and
+# chart5/chart_deltaT.py uses its bucket_extremes to thin its lines.
+
+#   Copyright © 2026 by John Sauter <John_Sauter@systemeyescomputerstore.com>
+
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+#   The author's contact information is as follows:
+#     John Sauter
+#     System Eyes Computer Store
+#     20A Northwest Blvd.  Ste 345
+#     Nashua, NH  03063-4066
+#     telephone: (603) 424-1188
+#     e-mail: John_Sauter@systemeyescomputerstore.com
+
+#
+# Level 0 of the pyramid has every point.  Each level after that
+# divides the days into buckets twice as wide as the level before,
+# starting at two days, and keeps from each bucket the first, last,
+# lowest and highest points.  Drawing those points gives the same
+# picture as drawing all of them, provided each bucket is no wider
+# than a pixel.  Because each bucket is made of two buckets of the
+# level before, each level is computed from the level before it.
+#
+# The index is a gnuplot script.  It defines pyramid_file(xmin, xmax),
+# which names the coarsest level whose buckets are no wider than a
+# pixel when the x-axis runs from xmin to xmax.  The number of pixels
+# across the plot is pyramid_pixels, which the plot may set before
+# loading the index.
+#
+
+import os
+import numpy as np
+
+default_pixels = 1500
+
+# Subroutine to choose, from each bucket, the first, last, lowest and
+# highest points.  The bucket numbers must be in ascending order.
+# Returns the indexes of the points chosen, in ascending order.
+def bucket_extremes (y_values, buckets):
+  bucket_starts = np.flatnonzero (np.diff (buckets, prepend=buckets [0] - 1))
+  bucket_ends = np.append (bucket_starts [1:], len(buckets)) - 1
+  # Sorting by value within each bucket puts the lowest point of
+  # each bucket at its start and the highest at its end.
+  by_value = np.lexsort ((y_values, buckets))
+  return (np.unique (np.concatenate ((bucket_starts, bucket_ends,
+                                      by_value [bucket_starts],
+                                      by_value [bucket_ends]))))
+
+# Subroutine to write one level of the pyramid, one point per line.
+def write_level (file_name, x_values, y_values):
+  with open (file_name, 'wt') as level_file:
+    level_file.write ("".join ([str(x_value) + " " + str(y_value) + "\n"
+                                for (x_value, y_value) in
+                                zip (x_values, y_values)]))
+  return
+
+# Write the pyramid for the points in x_values and y_values, which must
+# be lists or arrays in ascending order of x.  The levels are written
+# to file_prefix_level_0.dat, file_prefix_level_1.dat and so on, and
+# the index to file_prefix.gnuplot.  Returns the number of levels.
+def write_pyramid (file_prefix, x_values, y_values,
+                   pixels=default_pixels):
+  x_array = np.asarray (x_values)
+  y_array = np.asarray (y_values)
+  levels = [(1, np.arange (len(x_array)))]
+  bucket_width = 2
+  if (len(x_array) > 0):
+    x_span = x_array [-1] - x_array [0]
+  else:
+    x_span = 0
+  # Stop when a level is small enough to plot at any width.
+  while ((len(levels [-1][1]) > 4 * pixels) and (bucket_width < x_span)):
+    level_index = levels [-1][1]
+    buckets = np.floor_divide (x_array [level_index],
+                               bucket_width).astype (np.int64)
+    keep = bucket_extremes (y_array [level_index], buckets)
+    # A level with no fewer points than the one before is not needed.
+    if (len(keep) < len(level_index)):
+      levels.append ((bucket_width, level_index [keep]))
+    bucket_width = bucket_width * 2
+
+  # Values are written as they were given, so an integer stays an integer.
+  x_list = list(x_values)
+  y_list = list(y_values)
+  level_names = list()
+  for level_number in range (len(levels)):
+    (bucket_width, level_index) = levels [level_number]
+    level_name = file_prefix + "_level_" + str(level_number) + ".dat"
+    write_level (level_name, [x_list [i] for i in level_index],
+                 [y_list [i] for i in level_index])
+    level_names.append (os.path.basename (level_name))
+
+  with open (file_prefix + ".gnuplot", 'wt') as index_file:
+    index_file.write ("# Index of the levels of " +
+                      os.path.basename (file_prefix) + ".\n")
+    index_file.write ("# level, days per bucket, points, file\n")
+    for level_number in range (len(levels)):
+      (bucket_width, level_index) = levels [level_number]
+      index_file.write ("# " + str(level_number) + " " +
+                        str(bucket_width) + " " + str(len(level_index)) +
+                        " " + level_names [level_number] + "\n")
+    index_file.write ("if (!exists(\"pyramid_pixels\")) pyramid_pixels = " +
+                      str(pixels) + "\n")
+    index_file.write ("pyramid_file(xmin, xmax) = \\\n")
+    for level_number in range (len(levels) - 1, 0, -1):
+      (bucket_width, level_index) = levels [level_number]
+      index_file.write ("  ((xmax - xmin) >= " + str(bucket_width) +
+                        " * pyramid_pixels) ? \"" +
+                        level_names [level_number] + "\" : \\\n")
+    index_file.write ("  \"" + level_names [0] + "\"\n")
+  return (len(levels))
+
+# End of file gnuplot_pyramid.py
@@ -0,0 +1,462 @@
+#!/usr/bin/python3
+# -*- coding: utf-8
+#
+# index_bulletins finds the issues of IERS Bulletins A, C and D in
+# directories, extracts what parse_bulletin_A.py, parse_bulletin_C.py
+# and parse_bulletin_D.py extract from them, and keeps the results in
+# an archive which can be queried by date.
+
+#   Copyright © 2026 by John Sauter <John_Sauter@systemeyescomputerstore.com>
+
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+#   The author's contact information is as follows:
+#     John Sauter
+#     System Eyes Computer Store
+#     20A Northwest Blvd.  Ste 345
+#     Nashua, NH  03063-4066
+#     telephone: (603) 424-1188
+#     e-mail: John_Sauter@systemeyescomputerstore.com
+
+#
+# Each file is classified as Bulletin A, C or D from the lines at its
+# start, then parsed by bulletin_parsers.py, as the program for that
+# bulletin parses it.  The .txt files in a .tar, .zip, .gz, .bz2 or .xz
+# archive are read without extracting them.  The archive has one row
+# for each file, in columns:
+#
+#   file_name        the name of the file, under the name of the
+#                    archive it is in
+#   kind             A, C or D, or empty if the file is not a bulletin
+#   size, mtime_ns   the size and modification time of the file, or
+#                    of the archive it is in
+#   bulletin_date    the date of issue
+#   effective_date   the date the value of DUT1 takes effect (A and D)
+#   DUT1             the value of DUT1 (A and D)
+#   UT1_UTC          the UT1-UTC formula: UT1_UTC + UT2_slope *
+#   UT2_slope          (MJD - base_MJD) - (UT2-UT1) (A)
+#   base_MJD
+#   leap             +1, -1 or 0 for a positive, negative or no leap
+#                    second (C)
+#   leap_date        the last day of the month the leap second, or the
+#                    lack of one, is announced for (C)
+#   expiration_date  the expiration date computed from it (C)
+#
+# A date which does not apply is NaT, and a number is NaN, or 0 for
+# base_MJD and leap.  The archive is a numpy .npz file written by
+# npz_columns.py, as are the .npz files written by read_delta_t.py,
+# so string columns are stored as codes into a list of names.  The
+# rows are sorted by bulletin date so a range of dates is found by
+# binary search.
+#
+# When the archive already exists, a file or archive whose name, size
+# and modification time are unchanged is not read again.
+#
+
+import sys
+import os
+import datetime
+import argparse
+import zipfile
+import numpy as np
+import bulletin_parsers
+import npz_columns
+
+# The columns of the archive, with the numpy type of each.
+columns = [("file_name", "str"), ("kind", "str"),
+           ("size", "int64"), ("mtime_ns", "int64"),
+           ("bulletin_date", "datetime64[D]"),
+           ("effective_date", "datetime64[D]"),
+           ("DUT1", "float64"), ("UT1_UTC", "float64"),
+           ("UT2_slope", "float64"), ("base_MJD", "int32"),
+           ("leap", "int8"), ("leap_date", "datetime64[D]"),
+           ("expiration_date", "datetime64[D]")]
+
+# Subroutine to create an empty row.
+def empty_row ():
+  return ({"file_name": "", "kind": "", "size": 0, "mtime_ns": 0,
+           "bulletin_date": None, "effective_date": None,
+           "DUT1": float("nan"), "UT1_UTC": float("nan"),
+           "UT2_slope": float("nan"), "base_MJD": 0,
+           "leap": 0, "leap_date": None, "expiration_date": None})
+
+# Subroutine to decide which bulletin a file is, from its first lines.
+def classify (text_lines):
+  for text_line in text_lines [0:40]:
+    if (('B U L L E T I N - A' in text_line) or
+        ('BULLETIN A' in text_line)):
+      return ("A")
+  for text_line in text_lines [0:40]:
+    stripped_text_line = text_line.strip ()
+    if ((stripped_text_line [0:11] == 'Bulletin C ') or
+        (stripped_text_line [0:11] == 'BULLETIN C ')):
+      return ("C")
+    if ((stripped_text_line [0:10] == 'Bulletin D') or
+        (stripped_text_line [0:10] == 'BULLETIN D')):
+      return ("D")
+  return ("")
+
+# Subroutine to fill in a row from Bulletin A.
+def parse_A (text_lines, row):
+  found = bulletin_parsers.parse_bulletin_A (text_lines)
+  row ["bulletin_date"] = found ["bulletin_date"]
+  row ["effective_date"] = found ["effective_date"]
+  if (found ["DUT1"] != None):
+    row ["DUT1"] = found ["DUT1"]
+  if (len(found ["entries"]) > 0):
+    (row ["UT1_UTC"], row ["UT2_slope"], row ["base_MJD"], DUT1) = (
+      found ["entries"][-1][1])
+  return
+
+# Subroutine to fill in a row from Bulletin C.
+def parse_C (text_lines, row):
+  found = bulletin_parsers.parse_bulletin_C (text_lines)
+  row ["bulletin_date"] = found ["bulletin_date"]
+  if (found ["leap"] != None):
+    row ["leap"] = found ["leap"]
+    row ["leap_date"] = found ["leap_date"]
+    row ["expiration_date"] = found ["expiration_date"]
+  return
+
+# Subroutine to fill in a row from Bulletin D.  A bulletin without a
+# date of issue is dated by the day its value of DUT1 takes effect.
+def parse_D (text_lines, row):
+  found = bulletin_parsers.parse_bulletin_D (text_lines)
+  row ["bulletin_date"] = found ["bulletin_date"]
+  row ["effective_date"] = found ["effective_date"]
+  if (found ["DUT1"] != None):
+    row ["DUT1"] = found ["DUT1"]
+    if (row ["bulletin_date"] == None):
+      row ["bulletin_date"] = row ["effective_date"]
+  return
+
+parsers = {"A": parse_A, "C": parse_C, "D": parse_D}
+
+# Subroutine to classify and parse the text of a file.  The size and
+# modification time are those of the file, or of the archive it is in.
+# Returns the row and, if the file could not be parsed, an error
+# message.
+def index_text (file_name, text_lines, size, mtime_ns):
+  row = empty_row ()
+  row ["file_name"] = file_name
+  row ["size"] = size
+  row ["mtime_ns"] = mtime_ns
+  row ["kind"] = classify (text_lines)
+  if (row ["kind"] == ""):
+    return (row, None)
+  try:
+    parsers [row ["kind"]] (text_lines, row)
+  except (ValueError, IndexError) as the_error:
+    return (row, 'Error parsing ' + file_name + ' as Bulletin ' +
+            row ["kind"] + ': ' + str(the_error))
+  return (row, None)
+
+# Subroutine to read, classify and parse a file.
+def index_file (file_name, file_status):
+  with open (file_name, 'rt', errors='replace') as infile:
+    text_lines = infile.readlines ()
+  return (index_text (file_name, text_lines, file_status.st_size,
+                      file_status.st_mtime_ns))
+
+# Subroutine to read, classify and parse the bulletins in an archive.
+# Each is named as read_archive names it, except that a single
+# compressed file keeps the name of the archive, and each has the size
+# and modification time of the archive.  Returns the rows and the
+# error messages.
+def index_archive (archive_name, file_status):
+  rows = list()
+  error_messages = list()
+  for (file_name, data, key) in bulletin_parsers.read_archive (archive_name):
+    if (not file_name.startswith (archive_name + os.sep)):
+      file_name = archive_name
+    text_lines = data.decode ('utf-8', errors='replace').splitlines (
+      keepends=True)
+    (row, error_message) = index_text (file_name, text_lines,
+                                       file_status.st_size,
+                                       file_status.st_mtime_ns)
+    if (error_message != None):
+      error_messages.append (error_message)
+    else:
+      rows.append (row)
+  return (rows, error_messages)
+
+# Subroutine to convert a date to numpy, with None as NaT.
+def numpy_date (the_date):
+  if (the_date == None):
+    return (np.datetime64 ('NaT', 'D'))
+  return (np.datetime64 (the_date, 'D'))
+
+# Subroutine to write the rows to an archive, sorted by bulletin date.
+def write_archive (archive_file_name, rows):
+  rows = sorted (rows, key=lambda row: (row ["bulletin_date"] == None,
+                                        row ["bulletin_date"] or
+                                        datetime.date.min,
+                                        row ["file_name"]))
+  arrays = dict()
+  for (column_name, column_type) in columns:
+    values = [row [column_name] for row in rows]
+    if (column_type == "datetime64[D]"):
+      arrays [column_name] = np.array ([numpy_date (value)
+                                        for value in values],
+                                       dtype=column_type)
+    else:
+      arrays [column_name] = np.array (values, dtype=column_type)
+  temporary_name = archive_file_name + ".tmp.npz"
+  npz_columns.write_npz_columns (temporary_name, arrays)
+  os.replace (temporary_name, archive_file_name)
+  return
+
+# Subroutine to read an archive into a dictionary of columns, with the
+# string columns decoded.  Returns None if the file is not an archive
+# in the expected format.
+def read_archive (archive_file_name):
+  try:
+    archive = npz_columns.load_npz_columns (archive_file_name)
+  except (OSError, ValueError, zipfile.BadZipFile):
+    return (None)
+  if ((archive == None) or
+      any ([(column_name not in archive) for (column_name, column_type)
+            in columns])):
+    return (None)
+  archive_columns = dict()
+  for (column_name, column_type) in columns:
+    if (column_type == "str"):
+      archive_columns [column_name] = (
+        archive [column_name + "_names"][archive [column_name]])
+    else:
+      archive_columns [column_name] = archive [column_name]
+  return (archive_columns)
+
+# Subroutine to convert a column value from numpy back to Python.
+def python_value (value, column_type):
+  if (column_type == "datetime64[D]"):
+    if (np.isnat (value)):
+      return (None)
+    return (value.astype (datetime.date))
+  if (column_type == "str"):
+    return (str(value))
+  if (column_type == "float64"):
+    return (float(value))
+  return (int(value))
+
+# Subroutine to format a column value for a CSV file.
+def csv_value (value, column_type):
+  if (column_type == "datetime64[D]"):
+    if (np.isnat (value)):
+      return ("")
+    return (str(value))
+  if (column_type == "float64"):
+    if (np.isnan (value)):
+      return ("")
+    return (format(value, ".5f"))
+  return (str(value))
+
+#
+# When run as a program, update the archive and answer a query.
+#
+if (__name__ == "__main__"):
+  parser = argparse.ArgumentParser (
+    formatter_class=argparse.RawDescriptionHelpFormatter,
+    description='Index IERS Bulletins A, C and D.',
+    epilog='Copyright © 2026 by John Sauter' + '\n' +
+    'License GPL3+: GNU GPL version 3 or later; ' + '\n' +
+    'see <http://gnu.org/licenses/gpl.html> for the full text ' +
+    'of the license.' + '\n' +
+    'This is free software: you are free to change and redistribute it. ' +
+    '\n' +
+    'There is NO WARRANTY, to the extent permitted by law. ' + '\n' + '\n'
+    'The directories are searched for bulletins, which are added to ' +
+    'the archive. ' + '\n')
+  parser.add_argument ('directories', nargs='*', metavar='directory',
+                       help='a directory or file to search for bulletins')
+  parser.add_argument ('--archive', metavar='archive_file', required=True,
+                       help='the .npz file holding the index')
+  parser.add_argument ('--version', action='version',
+                       version='index_bulletins 1.2 2026-10-19',
+                       help='print the version number and exit')
+  parser.add_argument ('--from', dest='from_date', metavar='from_date',
+                       help='list bulletins issued on or after this date, ' +
+                       'YYYY-MM-DD')
+  parser.add_argument ('--to', dest='to_date', metavar='to_date',
+                       help='list bulletins issued on or before this date, ' +
+                       'YYYY-MM-DD')
+  parser.add_argument ('--kind', choices=['A', 'C', 'D'],
+                       help='list only bulletins of this kind')
+  parser.add_argument ('--csv-output', metavar='csv_output_file',
+                       help='write the bulletins listed to a CSV file ' +
+                       'rather than printing them')
+  parser.add_argument ('--verbose', type=int, metavar='verbosity level',
+                       help='control the amount of output from the ' +
+                       'program: 1 is normal, 0 suppresses summary messages')
+
+  arguments = parser.parse_args ()
+  arguments = vars(arguments)
+
+  verbosity_level = 1
+  error_counter = 0
+  if (arguments ['verbose'] != None):
+    verbosity_level = int(arguments ['verbose'])
+  archive_file_name = arguments ['archive']
+
+  # Check the dates of the query before doing anything else.
+  query_dates = dict()
+  for date_name in ('from_date', 'to_date'):
+    if (arguments [date_name] != None):
+      try:
+        query_dates [date_name] = np.datetime64 (
+          datetime.date.fromisoformat (arguments [date_name]), 'D')
+      except ValueError:
+        parser.error ("--" + date_name.replace ("_date", "") + " " +
+                      arguments [date_name] + " is not a date of the " +
+                      "form YYYY-MM-DD")
+
+  # Start with the rows already in the archive.
+  rows = dict()
+  if (os.path.exists (archive_file_name)):
+    archive_columns = read_archive (archive_file_name)
+    if (archive_columns != None):
+      for row_number in range (len(archive_columns ["file_name"])):
+        row = dict()
+        for (column_name, column_type) in columns:
+          row [column_name] = python_value (
+            archive_columns [column_name][row_number], column_type)
+        rows [row ["file_name"]] = row
+
+  # Walk the directories once, reading only new or changed files.
+  if (len(arguments ['directories']) > 0):
+    found = set()
+    changed = 0
+    for directory_name in arguments ['directories']:
+      if (os.path.isdir (directory_name)):
+        file_names = list()
+        for (directory_path, subdirectory_names, names) in (
+            os.walk (directory_name)):
+          subdirectory_names.sort ()
+          file_names.extend ([os.path.join (directory_path, name)
+                              for name in sorted (names)])
+      else:
+        file_names = [directory_name]
+      for file_name in file_names:
+        file_status = os.stat (file_name)
+        if (file_name.endswith (bulletin_parsers.archive_suffixes)):
+          # The bulletins in an archive are read again only if the
+          # archive has changed.
+          archive_names = [row_name for row_name in rows
+                           if ((row_name == file_name) or
+                               row_name.startswith (file_name + os.sep))]
+          if ((len(archive_names) > 0) and
+              all ([((rows [row_name]["size"] == file_status.st_size) and
+                     (rows [row_name]["mtime_ns"] ==
+                      file_status.st_mtime_ns))
+                    for row_name in archive_names])):
+            found.update (archive_names)
+            continue
+          try:
+            (archive_rows, error_messages) = index_archive (file_name,
+                                                            file_status)
+          except bulletin_parsers.archive_errors as the_error:
+            (archive_rows, error_messages) = (
+              list(), ['Error reading ' + file_name + ': ' + str(the_error)])
+          for error_message in error_messages:
+            print (error_message)
+            error_counter = error_counter + 1
+          for row in archive_rows:
+            found.add (row ["file_name"])
+            rows [row ["file_name"]] = row
+            changed = changed + 1
+          continue
+        found.add (file_name)
+        if ((file_name in rows) and
+            (rows [file_name]["size"] == file_status.st_size) and
+            (rows [file_name]["mtime_ns"] == file_status.st_mtime_ns)):
+          continue
+        (row, error_message) = index_file (file_name, file_status)
+        if (error_message != None):
+          print (error_message)
+          error_counter = error_counter + 1
+          continue
+        rows [file_name] = row
+        changed = changed + 1
+    # Forget files under the directories, or in the archives, which
+    # are no longer there.
+    roots = [os.path.join (directory_name, "")
+             for directory_name in arguments ['directories']
+             if (os.path.isdir (directory_name) or
+                 directory_name.endswith (bulletin_parsers.archive_suffixes))]
+    removed = [file_name for file_name in rows
+               if ((file_name not in found) and
+                   any ([file_name.startswith (root) for root in roots]))]
+    for file_name in removed:
+      del rows [file_name]
+    if (verbosity_level > 0):
+      print ("Read " + str(changed) + " files; " + str(len(rows)) +
+             " files are indexed.")
+    if ((changed > 0) or (len(removed) > 0) or
+        (not os.path.exists (archive_file_name))):
+      write_archive (archive_file_name, list(rows.values ()))
+
+  # Answer the query, if there is one.
+  archive_columns = None
+  if ((arguments ['from_date'] != None) or (arguments ['to_date'] != None) or
+      (arguments ['kind'] != None) or (arguments ['csv_output'] != None)):
+    if (not os.path.exists (archive_file_name)):
+      print ("Archive " + archive_file_name + " does not exist.")
+      error_counter = error_counter + 1
+    else:
+      archive_columns = read_archive (archive_file_name)
+      if (archive_columns == None):
+        print ("Archive " + archive_file_name + " is not an index of " +
+               "bulletins.")
+        error_counter = error_counter + 1
+
+  if (archive_columns != None):
+    bulletin_dates = archive_columns ["bulletin_date"]
+    # The rows are sorted by date, with those lacking a date at the end.
+    dated = np.count_nonzero (~np.isnat (bulletin_dates))
+    first_row = 0
+    last_row = dated
+    if (arguments ['from_date'] != None):
+      first_row = np.searchsorted (bulletin_dates [:dated],
+                                   query_dates ['from_date'],
+                                   side='left')
+    if (arguments ['to_date'] != None):
+      last_row = np.searchsorted (bulletin_dates [:dated],
+                                  query_dates ['to_date'],
+                                  side='right')
+    selected = np.arange (first_row, last_row)
+    kinds = archive_columns ["kind"][selected]
+    if (arguments ['kind'] != None):
+      selected = selected [kinds == arguments ['kind']]
+    else:
+      selected = selected [kinds != ""]
+    column_names = [column_name for (column_name, column_type) in columns
+                    if (column_name not in ("size", "mtime_ns"))]
+    column_types = dict(columns)
+    lines = [",".join (column_names) + "\n"]
+    for row_number in selected:
+      lines.append (",".join ([csv_value (
+        archive_columns [column_name][row_number],
+        column_types [column_name]) for column_name in column_names]) +
+                    "\n")
+    if (arguments ['csv_output'] != None):
+      with open (arguments ['csv_output'], 'wt') as csv_file:
+        csv_file.write ("".join (lines))
+    else:
+      print ("".join (lines), end="")
+
+  if (error_counter > 0):
+    print ("Encountered " + str(error_counter) + " errors.")
+    sys.exit (1)
+
+# End of file index_bulletins.py
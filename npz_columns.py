@@ -0,0 +1,95 @@
+#!/usr/bin/python3
+# -*- coding: utf-8
+#
+# npz_columns writes the columns of a table in numpy .npz format, and
+# reads them back.  It is imported by read_delta_t.py, which writes the
+# tables, and by find_next_leap_second.py and chart5/chart_deltaT.py,
+# which read them.
+
+#   Copyright © 2026 by John Sauter <John_Sauter@systemeyescomputerstore.com>
+
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+#   The author's contact information is as follows:
+#     John Sauter
+#     System Eyes Computer Store
+#     20A Northwest Blvd.  Ste 345
+#     Nashua, NH  03063-4066
+#     telephone: (603) 424-1188
+#     e-mail: John_Sauter@systemeyescomputerstore.com
+
+import re
+import zipfile
+import numpy as np
+
+# Subroutine to write the columns of a table in numpy .npz format,
+# as a faster alternative to a CSV file.  The columns are stored
+# uncompressed so a reader can map them into memory.  A column of
+# strings is stored as small integer codes in that column and the
+# strings themselves in a column with "_names" added to its name.
+npz_format_version = 1
+def write_npz_columns (file_name, the_columns):
+  npz_columns = dict()
+  npz_columns ["format_version"] = np.array (npz_format_version)
+  for column_name in the_columns:
+    column = the_columns [column_name]
+    if (column.dtype.kind in ('U', 'S', 'O')):
+      (names, codes) = np.unique (column.astype (str), return_inverse=True)
+      npz_columns [column_name] = codes.astype (
+        np.min_scalar_type (max (len(names) - 1, 0)))
+      npz_columns [column_name + "_names"] = names
+    else:
+      npz_columns [column_name] = column
+  np.savez (file_name, **npz_columns)
+  return
+
+# Subroutine to load the columns of a table written by
+# write_npz_columns.  The columns are stored uncompressed, so each
+# is mapped into memory rather than read.  Returns None if the file
+# is not in the expected format.
+def load_npz_columns (file_name):
+  columns = dict()
+  with zipfile.ZipFile (file_name) as archive, \
+       open (file_name, 'rb') as rawfile:
+    for member in archive.infolist():
+      column_name = re.sub ("\\.npy$", "", member.filename)
+      if (member.compress_type != zipfile.ZIP_STORED):
+        with archive.open (member) as memberfile:
+          columns [column_name] = np.lib.format.read_array (memberfile)
+        continue
+      # The column's data follows its local header in the file.
+      rawfile.seek (member.header_offset)
+      local_header = rawfile.read (30)
+      name_length = int.from_bytes (local_header [26:28], 'little')
+      extra_length = int.from_bytes (local_header [28:30], 'little')
+      rawfile.seek (member.header_offset + 30 + name_length + extra_length)
+      version = np.lib.format.read_magic (rawfile)
+      if (version == (1, 0)):
+        (shape, fortran_order, dtype) = \
+          np.lib.format.read_array_header_1_0 (rawfile)
+      else:
+        (shape, fortran_order, dtype) = \
+          np.lib.format.read_array_header_2_0 (rawfile)
+      if ((dtype.hasobject) or (np.prod (shape) == 0)):
+        with archive.open (member) as memberfile:
+          columns [column_name] = np.lib.format.read_array (memberfile)
+        continue
+      columns [column_name] = np.memmap (
+        file_name, dtype=dtype, mode='r', offset=rawfile.tell(),
+        shape=shape, order=('F' if fortran_order else 'C'))
+  if (int(columns.get ("format_version", 0)) != npz_format_version):
+    return (None)
+  return (columns)
+
+# End of file npz_columns.py
@@ -33,7 +33,11 @@ import datetime
 from jdcal import gcal2jd, jd2gcal, is_leap
 import pprint
 from pathlib import Path
+import os
+import json
+import multiprocessing
 import argparse
+import bulletin_parsers
 
 parser = argparse.ArgumentParser (
   formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -48,14 +52,23 @@ parser = argparse.ArgumentParser (
   'The input file is the IERS Bulletin A text file; ' +
   'the output is an extraction of the information. ' + '\n')
 parser.add_argument ('input_file',
-                     help='IERS Bulletin A as a text file')
+                     help='IERS Bulletin A as a text file, a directory ' +
+                     'of them, or a .tar, .tar.gz, .zip, .gz, .bz2 or .xz ' +
+                     'archive')
 parser.add_argument ('--csv-output_file', metavar='csv_output_file',
                      help='write CSV output to the specified file')
 parser.add_argument ('--latest-date-output_file',
                      metavar='latest_date_output_file',
                      help='write the latest Bulletin A date to the specified file')
+parser.add_argument ('--cache-file', metavar='cache_file',
+                     help='remember what was found in each file, ' +
+                     'so files which have not changed are not parsed again')
+parser.add_argument ('--jobs', type=int, nargs='?', const=0,
+                     metavar='jobs',
+                     help='parse this many files at the same time; ' +
+                     'with no value, use all of the processors')
 parser.add_argument ('--version', action='version', 
-                     version='parse_bulletin_A 3.7 2024-12-26',
+                     version='parse_bulletin_A 3.12 2026-10-19',
                      help='print the version number and exit')
 parser.add_argument ('--trace', metavar='trace_file',
                      help='write trace output to the specified file')
@@ -93,86 +106,143 @@ if (arguments ['trace'] != None):
 if (arguments ['verbose'] != None):
   verbosity_level = arguments ['verbose']
 
+jobs = 1
+if (arguments ['jobs'] != None):
+  jobs = arguments ['jobs']
+  if (jobs <= 0):
+    jobs = os.cpu_count ()
+
 bull_info = dict()
 
-def process_file (file_name):
-  global bull_info
-  line_number = 0
-  date_found = 0
-  next_line_is_DUT1 = 0
-  DUT1 = 0.0
-  with open (file_name, 'rt') as infile:
-    text_line = infile.readline()
-    while (text_line != ''):
-      line_number = line_number + 1
-      left_side = text_line[0:40]
-      left_side = left_side.rstrip()
-      left_side = left_side.lstrip()
-      right_side = text_line[41:]
-      right_side = right_side.lstrip()
-      right_side = right_side[0:5]
-      stripped_text_line = text_line.lstrip()
-      stripped_text_line = stripped_text_line.rstrip()
-      if (do_trace == 1):
-        if (date_found == 0):
-          tracefile.write ('Looking for date: ' + right_side + '\n')
-      if ((date_found == 0) and (right_side == 'Vol. ')):
-        date_found = 1
-        datetime_object = datetime.datetime.strptime (left_side, '%d %B %Y')
-        date_object = datetime_object.date()
-        date_string = date_object.strftime ('%B %d, %Y')
-        if (verbosity_level > 0):
-          print ('Date of IERS Bulletin A is ' + date_string)
-        if (do_trace == 1):
-          tracefile.write ('date = ' + date_string + '.\n')
-      if (next_line_is_DUT1 == 1):
-        find_DUT1 = stripped_text_line[1:8];
-        if (do_trace == 1):
-          tracefile.write ("finding DUT1 in " + find_DUT1 + ".\n");
-        if (find_DUT1[-1] != " "):
-          find_DUT1 = stripped_text_line[1:7]
-          if (do_trace == 1):
-            tracefile.write ("finding DUT1 in " + find_DUT1 + ".\n");
-        if (find_DUT1[-1] != " "):
-          find_DUT1 = stripped_text_line[1:6]
-          if (do_trace == 1):
-            tracefile.write ("finding DUT1 in " + find_DUT1 + ".\n");
-        DUT1 = float(find_DUT1)
-        next_line_is_DUT1 = 0
-      if (stripped_text_line=='DUT1= (UT1-UTC) transmitted with time signals'):
-        next_line_is_DUT1 = 1
-      if (text_line[0:19] == '         UT1-UTC = '):
-        if (verbosity_level > 0):
-          print (text_line, end='')
-        param_1 = text_line[19:26]
-        if (do_trace == 1):
-          tracefile.write ('param_1 = "' + param_1 + '".\n')
-        param_1 = float(param_1)
-        param_2 = text_line[27] + text_line[29:36].lstrip()
-        if (do_trace == 1):
-          tracefile.write ('param_2 = "' + param_2 + '".\n')
-        param_2 = float(param_2)
-        param_3 = text_line[44:49]
-        param_3 = int(param_3)
-        if (verbosity_level > 0):
-          print ('         UT1-UTC = ' + str(param_1) + ' + (' +
-                 format(param_2, ".5f") +
-                 ' ⨯ (MJD - ' + str(param_3) + ')) - (UT2-UT1)')
-          print ('MJD ' + str(param_3) + ' is ' + greg(param_3 + 2400000.5))
-        bull_info [date_object] = (param_1, param_2, param_3, DUT1)
-      text_line = infile.readline()
+# Subroutine to parse one file.  Since files may be parsed in other
+# processes, the messages and trace lines are returned rather than
+# written, along with the entries for bull_info.
+def process_file (file_name, data=None):
+  messages = list()
+  trace_lines = list()
+  with bulletin_parsers.open_bulletin (file_name, data) as infile:
+    found = bulletin_parsers.parse_bulletin_A (
+      infile, messages, trace_lines if (do_trace == 1) else None)
+  return (messages, trace_lines, found ["entries"])
 
 # Process the input file.  If it is a directory, process all .txt files
-# within it.
+# within it.  If it is an archive, process the .txt files within it
+# without extracting them.
 input_file_name = arguments ['input_file']
 if (do_trace == 1):
   tracefile.write ('input file name = ' + input_file_name + '.\n')
 input_file_path = Path(input_file_name)
+file_names = list()
+file_data = dict()
+file_keys = dict()
 if (input_file_path.is_dir()):
-  for file_name in list(input_file_path.glob('*.txt')):
-    process_file (file_name)
+  file_names = [str(file_name) for file_name in input_file_path.glob('*.txt')]
+elif (input_file_name.endswith (bulletin_parsers.archive_suffixes)):
+  try:
+    for (file_name, data, key) in (
+        bulletin_parsers.read_archive (input_file_name)):
+      file_names.append (file_name)
+      file_data [file_name] = data
+      file_keys [file_name] = key
+  except bulletin_parsers.archive_errors as the_error:
+    print ('Error reading ' + input_file_name + ': ' + str(the_error))
+    error_counter = error_counter + 1
 else:
-  process_file (input_file_name)
+  file_names = [input_file_name]
+
+# The cache holds, for each file, its size and modification time and
+# what was found in it.  A file whose size and modification time have
+# not changed is not parsed again.  The trace shows the parsing, so
+# when tracing every file is parsed.
+cache = dict()
+if (arguments ['cache_file'] != None):
+  cache_file_name = arguments ['cache_file']
+  if (os.path.exists (cache_file_name)):
+    with open (cache_file_name, 'rt') as cache_file:
+      cache_contents = json.load (cache_file)
+    if (cache_contents.get ('format_version') == 1):
+      cache = cache_contents ['files']
+
+# Subroutine to parse a file, catching any error so that a bad file
+# does not stop the parsing of the others.
+def parse_file (source):
+  (file_name, data) = source
+  try:
+    return (process_file (file_name, data) + (None,))
+  except Exception as the_error:
+    return (list(), list(), list(),
+            'Error parsing ' + str(file_name) + ': ' + str(the_error))
+
+results = dict()
+to_parse = list()
+for file_name in file_names:
+  cache_name = os.path.abspath (file_name)
+  if (file_name not in file_keys):
+    file_keys [file_name] = bulletin_parsers.file_key (file_name)
+  if ((do_trace == 0) and (cache_name in cache) and
+      (cache [cache_name]['key'] == file_keys [file_name])):
+    cached_entry = cache [cache_name]
+    results [file_name] = (cached_entry ['messages'], list(),
+                           [(datetime.date.fromisoformat (entry [0]),
+                             tuple(entry [1:]))
+                            for entry in cached_entry ['entries']], None)
+  else:
+    to_parse.append (file_name)
+
+if ((jobs > 1) and (len(to_parse) > 1)):
+  # The worker processes inherit the file data by forking, so the
+  # script is not re-executed in them.
+  with multiprocessing.get_context ("fork").Pool (jobs) as pool:
+    parsed = pool.map (parse_file,
+                       [(file_name, file_data.get (file_name))
+                        for file_name in to_parse], chunksize=16)
+else:
+  parsed = [parse_file ((file_name, file_data.get (file_name)))
+            for file_name in to_parse]
+for (file_name, result) in zip (to_parse, parsed):
+  results [file_name] = result
+  if (result [3] == None):
+    cache [os.path.abspath (file_name)] = {
+      'key': file_keys [file_name],
+      'messages': result [0],
+      'entries': [[entry [0].isoformat ()] + list(entry [1])
+                  for entry in result [2]]}
+
+if (verbosity_level > 1):
+  print ('Parsed ' + str(len(to_parse)) + ' of ' + str(len(file_names)) +
+         ' files.')
+
+# Report what was found, in the order the files were listed.
+for file_name in file_names:
+  (messages, trace_lines, entries, error_message) = results [file_name]
+  if (verbosity_level > 0):
+    print ("".join (messages), end='')
+  if (do_trace == 1):
+    tracefile.write ("".join (trace_lines))
+  if (error_message != None):
+    print (error_message)
+    error_counter = error_counter + 1
+  for (date_object, info) in entries:
+    bull_info [date_object] = info
+
+# Forget files which are no longer present, and save the cache.
+if (arguments ['cache_file'] != None):
+  # The members of an archive may be in directories within it.
+  directory_name = os.path.abspath (input_file_name)
+  present_names = set([os.path.abspath (file_name)
+                       for file_name in file_names])
+  if (input_file_path.is_dir()):
+    cache = {cache_name: cache [cache_name] for cache_name in cache
+             if ((os.path.dirname (cache_name) != directory_name) or
+                 (cache_name in present_names))}
+  elif (file_data != dict()):
+    cache = {cache_name: cache [cache_name] for cache_name in cache
+             if ((not cache_name.startswith (directory_name + os.sep)) or
+                 (cache_name in present_names))}
+  temporary_name = cache_file_name + '.tmp'
+  with open (temporary_name, 'wt') as cache_file:
+    json.dump ({'format_version': 1, 'files': cache}, cache_file)
+  os.replace (temporary_name, cache_file_name)
   
 if (arguments ['csv_output_file'] != None):
   do_csv_output = 1
@@ -33,6 +33,7 @@ import datetime
 from jdcal import gcal2jd, jd2gcal, is_leap
 import pprint
 import argparse
+import bulletin_parsers
 
 parser = argparse.ArgumentParser (
   formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -48,7 +49,7 @@ parser = argparse.ArgumentParser (
 parser.add_argument ('input_file',
                      help='IERS Bulletin C as a text file')
 parser.add_argument ('--version', action='version', 
-                     version='parse_bulletin_C 2.0 2020-01-11',
+                     version='parse_bulletin_C 2.1 2026-10-19',
                      help='print the version number and exit')
 parser.add_argument ('--trace', metavar='trace_file',
                      help='write trace output to the specified file')
@@ -97,56 +98,12 @@ expiration_date = datetime.date.today()
 
 # Process the input file.
 input_file_name = arguments ['input_file']
-line_number = 0
+messages = list()
 with open (input_file_name, 'rt') as infile:
-  text_line = infile.readline()
-  while (text_line != ''):
-    line_number = line_number + 1
-    right_side = text_line
-    right_side = right_side.lstrip()
-    if (right_side[0:7] == 'Paris, '):
-      Paris_line_number = line_number
-      right_side = right_side[7:]
-      right_side = right_side.rstrip()
-      datetime_object = datetime.datetime.strptime (right_side, '%d %B %Y')
-      date_object = datetime_object.date()
-      date_string = date_object.strftime ('%B %d, %Y')
-      print ('Date of IERS Bulletin C is ' + date_string + '.')
-    if (right_side[0:11] == 'Bulletin C '):
-      right_side = right_side.rstrip()
-      print ('This is IERS ' + right_side + '.')
-    if (text_line[0:49] == ' NO leap second will be introduced at the end of '):
-      print (text_line, end='')
-      right_side = text_line[49:]
-      right_side = right_side.rstrip()
-      right_side = right_side[:-1]
-      datetime_object = datetime.datetime.strptime (right_side, '%B %Y')
-      date_object = datetime_object.date()
-      date_object = date_object.replace(day=15)
-      about_six_months = datetime.timedelta(days=180)
-      date_object = date_object + about_six_months
-      date_object = date_object.replace(day=28)
-      date_string = date_object.strftime ('%B %d, %Y')
-      print ('Expiration date is ' + date_string + '.')
-      expiration_date = date_object
-    if ((text_line[0:57] ==
-         ' A positive leap second will be introduced at the end of ') or
-        (text_line[0:57] ==
-         ' A negative leap second will be introduced at the end of ')):
-      print (text_line, end='')
-      right_side = text_line[57:]
-      right_side = right_side.rstrip()
-      right_side = right_side[:-1]
-      datetime_object = datetime.datetime.strptime (right_side, '%B %Y')
-      date_object = datetime_object.date()
-      date_object = date_object.replace(day=15)
-      about_six_months = datetime.timedelta(days=180)
-      date_object = date_object + about_six_months
-      date_object = date_object.replace(day=28)
-      date_string = date_object.strftime ('%B %d, %Y')
-      print ('Expiration date is ' + date_string + '.')
-      expiration_date = date_object
-    text_line = infile.readline()
+  found = bulletin_parsers.parse_bulletin_C (infile, messages)
+print ("".join (messages), end='')
+if (found ["expiration_date"] != None):
+  expiration_date = found ["expiration_date"]
 
 if (arguments['expiration_date_file'] != None):
   expiration_date_file_name = arguments ['expiration_date_file']
@@ -33,13 +33,16 @@ import re
 import hashlib
 import datetime
 import csv
-from jdcal import gcal2jd, jd2gcal, is_leap
+import collections.abc
+from jdcal import gcal2jd, jd2gcal
 import numpy as np
 from numpy.polynomial import Polynomial
 import pandas as pd
 from scipy import interpolate
 import pprint
 import argparse
+import gnuplot_pyramid
+import npz_columns
 
 parser = argparse.ArgumentParser (
   formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -58,7 +61,7 @@ parser.add_argument ('input1_file',
 parser.add_argument ('output_file',
                      help='the resulting list of extraordinary days')
 parser.add_argument ('--version', action='version', 
-                     version='read_Delta_T 9.0 2026-05-17',
+                     version='read_Delta_T 9.12 2026-10-19',
                      help='print the version number and exit')
 parser.add_argument ('--trace', metavar='trace_file',
                      help='write trace output to the specified file')
@@ -70,6 +73,10 @@ parser.add_argument ('--IERS-Bulletin-A',
 parser.add_argument ('--IERS-projection-days', type=int, default=0,
                      metavar='IERS_projection_days',
                      help='Number of days to project delta T using the IERS formula in Bulletin A')
+parser.add_argument ('--intersection-candidates', type=int, default=0,
+                     metavar='N',
+                     help='report the N days on which the astronomical ' +
+                     'and IERS projections come nearest to meeting')
 parser.add_argument ('--IERS-final', metavar='IERS_final_input_file',
                      help='Read Delta T information from the IERS')
 parser.add_argument ('--IERS-leaps', action='store_true',
@@ -84,12 +91,21 @@ parser.add_argument ('--latex-end-jdn', metavar='latex_end_jdn',
                      help='latest date to put in table')
 parser.add_argument ('--csv-output', metavar='csv_output_file',
                      help='write delta T data as a CSV file')
+parser.add_argument ('--csv-npz-output', metavar='csv_npz_output_file',
+                     help='also write the delta T data in numpy .npz format')
 parser.add_argument ('--csv-start-jdn', metavar='csv_start_jdn',
                      help='earliest date to put in CSV file')
 parser.add_argument ('--csv-end-jdn', metavar='csv_end_jdn',
                      help='latest date to put in CSV file')
 parser.add_argument ('--gnuplot-output', metavar='gnuplot_output_file',
                      help='write data for plotting by gnuplot')
+parser.add_argument ('--gnuplot-pyramid', metavar='gnuplot_pyramid_prefix',
+                     help='write data for plotting by gnuplot at several ' +
+                     'resolutions, with an index for choosing among them')
+parser.add_argument ('--gnuplot-pyramid-pixels', type=int,
+                     metavar='pixels',
+                     help='width of the plots in pixels, used to decide ' +
+                     'how many resolutions to write')
 parser.add_argument ('--gnuplot-start-jdn', metavar='gnuplot_start_jdn',
                      help='earliest date to put in the plot')
 parser.add_argument ('--gnuplot-end-jdn', metavar='gnuplot_end_jdn',
@@ -102,6 +118,8 @@ parser.add_argument ('--c-end-jdn', metavar='c_end_jdn',
                      help='latest date to put in the C file')
 parser.add_argument ('--UT1UTC-output', metavar='UT1UTC_output_file',
                      help='write UT1-UTC values')
+parser.add_argument ('--UT1UTC-npz-output', metavar='UT1UTC_npz_output_file',
+                     help='also write the UT1-UTC values in numpy .npz format')
 parser.add_argument ('--UT1UTC-start-jdn', metavar='UT1UTC_start_jdn',
                      help='earliest date to put in the UT1-UTC file')
 parser.add_argument ('--UT1UTC-end-jdn', metavar='UT1UTC_end_jdn',
@@ -129,11 +147,14 @@ have_latex_start_jdn = 0
 have_latex_end_jdn = 0
 do_csv_output = 0
 csv_output_file = ""
+do_csv_npz_output = 0
 csv_start_jdn = 0
 csv_end_jdn = 0
 have_csv_start_jdn = 0
 have_csv_end_jdn = 0
 do_gnuplot_output = 0
+do_gnuplot_pyramid = 0
+gnuplot_pyramid_pixels = gnuplot_pyramid.default_pixels
 gnuplot_start_jdn = 0
 gnuplot_end_jdn = 0
 have_gnuplot_start_jdn = 0
@@ -144,6 +165,7 @@ c_end_jdn = 0
 have_c_start_jdn = 0
 have_c_end_jdn = 0
 do_UT1UTC_output = 0
+do_UT1UTC_npz_output = 0
 UT1UTC_start_jdn = 0
 UT1UTC_end_jdn = 0
 have_UT1UTC_start_jdn = 0
@@ -234,6 +256,10 @@ if (arguments ['csv_output'] != None):
   do_csv_output = 1
   csv_output_file_name = arguments ['csv_output']
 
+if (arguments ['csv_npz_output'] != None):
+  do_csv_npz_output = 1
+  csv_npz_output_file_name = arguments ['csv_npz_output']
+
 if (arguments ['csv_start_jdn'] != None):
   have_csv_start_jdn = 1
   csv_start_jdn = int(arguments ['csv_start_jdn'])
@@ -246,13 +272,20 @@ if (arguments ['gnuplot_output'] != None):
   do_gnuplot_output = 1
   gnuplot_output_file_name = arguments ['gnuplot_output']
 
+if (arguments ['gnuplot_pyramid'] != None):
+  do_gnuplot_pyramid = 1
+  gnuplot_pyramid_prefix = arguments ['gnuplot_pyramid']
+
+if (arguments ['gnuplot_pyramid_pixels'] != None):
+  gnuplot_pyramid_pixels = int(arguments ['gnuplot_pyramid_pixels'])
+
 if (arguments ['gnuplot_start_jdn'] != None):
   have_gnuplot_start_jdn = 1
   gnuplot_start_jdn = int(arguments ['gnuplot_start_jdn'])
 
 if (arguments ['gnuplot_end_jdn'] != None):
   have_gnuplot_end_jdn = 1
-  gnuplot_end_date = int(arguments ['gnuplot_end_jdn'])
+  gnuplot_end_jdn = int(arguments ['gnuplot_end_jdn'])
     
 if (arguments ['c_output'] != None):
   do_c_output = 1
@@ -270,6 +303,10 @@ if (arguments ['UT1UTC_output'] != None):
   do_UT1UTC_output = 1
   UT1UTC_output_file_name = arguments ['UT1UTC_output']
 
+if (arguments ['UT1UTC_npz_output'] != None):
+  do_UT1UTC_npz_output = 1
+  UT1UTC_npz_output_file_name = arguments ['UT1UTC_npz_output']
+
 if (arguments ['UT1UTC_start_jdn'] != None):
   have_UT1UTC_start_jdn = 1
   UT1UTC_start_jdn = int(arguments ['UT1UTC_start_jdn'])
@@ -302,6 +339,46 @@ delta_t_source = dict()
 delta_t_all = dict()
 source_list = list()
 
+# A source of delta T with a value for every day of a range.  The
+# values are held in a numpy array, values [0] being the value on day
+# first_JDN, rather than in a dictionary, but the source can be used as
+# a dictionary indexed by Julian Day Number.
+class DailySource (collections.abc.Mapping):
+
+  def __init__ (self, first_JDN, values):
+    self.first_JDN = first_JDN
+    self.values = values
+
+  # Subroutine to return the value of delta T on a day.
+  def __getitem__ (self, the_JDN):
+    offset = the_JDN - self.first_JDN
+    if ((offset < 0) or (offset >= len(self.values))):
+      raise KeyError (the_JDN)
+    return (self.values [offset])
+
+  # Subroutine to list the days which have values, in order.
+  def __iter__ (self):
+    return (iter (range (self.first_JDN,
+                         self.first_JDN + len(self.values))))
+
+  def __len__ (self):
+    return (len(self.values))
+
+# Subroutine to record the values of delta T from a source for
+# consecutive days, values [0] being the value on day first_JDN.
+def record_daily_source (source, first_JDN, values):
+  global source_list
+  if (source not in delta_t_all):
+    delta_t_all[source] = DailySource (first_JDN, values)
+    source_list = source_list + [source]
+  else:
+    this_delta_t_source = dict(delta_t_all[source])
+    this_delta_t_source.update (zip (range (first_JDN,
+                                            first_JDN + len(values)),
+                                     values))
+    delta_t_all[source] = this_delta_t_source
+  return
+
 # Read the delta T data file into a dictionary.
 # This first file is the delta T values for the past and future,
 # based on old records of eclipses and lunar occulations.
@@ -490,10 +567,12 @@ record_leap(2016,12,31)
 # the latest IERS Bulletin A.
 #
 
+# target_JDN may be a number or a numpy array of them.
 def UT2_seasonal (target_JDN):
   target_MJD = target_JDN - 2400000
   # Target_T is the Besselian year.
-  target_T = 2000.000 + ((float(target_MJD) - 51544.03) / 365.2422)
+  target_T = 2000.000 + ((np.asarray (target_MJD, dtype=np.float64) -
+                          51544.03) / 365.2422)
   return (0.022 * np.sin(2.0*np.pi*target_T)
           - 0.012 * np.cos(2.0*np.pi*target_T)
           - 0.006 * np.sin(4.0*np.pi*target_T)
@@ -954,135 +1033,185 @@ if (last_delta_T_from_IERS_date > 0):
 
   # Subroutine to do a linear interpolation between two points
   # in the astronomical projection or the projection based on
-  # eclipses and lunar occulations.  Add in the seasonal UT2 correction.
-  def astro_interpolate (the_JDN):
-    global delta_t_all
+  # eclipses and lunar occulations, for an array of days in ascending
+  # order.  Add in the seasonal UT2 correction to the days which are
+  # interpolated.  Returns an array.
+  def astro_interpolate_array (the_JDNs):
     astro_and_eclipses_delta_t_dict = dict()
     astro_delta_t_dict = delta_t_all["Astronomical Projection"]
     eclipses_delta_t_dict = delta_t_all["Eclipses and Lunar Occulations"]
     astro_and_eclipses_delta_t_dict.update(eclipses_delta_t_dict)
     astro_and_eclipses_delta_t_dict.update(astro_delta_t_dict)
-    if (the_JDN in astro_and_eclipses_delta_t_dict):
-      return astro_and_eclipses_delta_t_dict[the_JDN]
-    # Fill in missing values using linear interpolation.
-    if (do_trace > 0):
-      tracefile.write ("Interpolating: ")
-      tracefile.write ("the_JDN " + str(the_JDN) + ".5.\n")
-    for probe_JDN in astro_and_eclipses_delta_t_dict:
-      if (probe_JDN < the_JDN):
-        prev_JDN = probe_JDN
-      if (probe_JDN > the_JDN):
-        next_JDN = probe_JDN
-        break
-    prev_delta_t = astro_and_eclipses_delta_t_dict [prev_JDN]
-    next_delta_t = astro_and_eclipses_delta_t_dict [next_JDN]
-    JDN_range = next_JDN - prev_JDN
-    if (do_trace > 0):
-      tracefile.write ("prev JDN: " + str(prev_JDN) + ".5 -> " +
-                       str(prev_delta_t) + ".\n" +
-                       "next JDN: " + str(next_JDN) + ".5 -> " +
-                       str(next_delta_t) + ".\n")
-    this_delta_t = prev_delta_t + (((the_JDN - prev_JDN) / JDN_range) *
-                                        (next_delta_t - prev_delta_t))
-    this_delta_t = this_delta_t + UT2_seasonal(the_JDN)
-    
+    known_JDNs = np.array (sorted (astro_and_eclipses_delta_t_dict.keys()),
+                           dtype=np.int64)
+    known_delta_t = np.array ([astro_and_eclipses_delta_t_dict [known_JDN]
+                               for known_JDN in known_JDNs.tolist()],
+                              dtype=np.float64)
+    # A day outside the known days cannot be interpolated.
+    outside = (the_JDNs < known_JDNs [0]) | (the_JDNs > known_JDNs [-1])
+    if (np.any (outside)):
+      raise ValueError ("Day " + str(the_JDNs [np.argmax (outside)]) +
+                        ".5 is outside the astronomical projection, " +
+                        str(known_JDNs [0]) + ".5 to " +
+                        str(known_JDNs [-1]) + ".5.")
+    # next_index is the first known day after each day, and the one
+    # before it is the day itself, if it is known, or the last known
+    # day before it.  Only the last known day has no known day after
+    # it, and it takes its known value below.
+    next_index = np.searchsorted (known_JDNs, the_JDNs, side='right')
+    prev_index = next_index - 1
+    next_index = np.minimum (next_index, len(known_JDNs) - 1)
+    known = (known_JDNs [prev_index] == the_JDNs)
+    prev_JDNs = known_JDNs [prev_index]
+    next_JDNs = known_JDNs [next_index]
+    prev_delta_t = known_delta_t [prev_index]
+    next_delta_t = known_delta_t [next_index]
+    # Known days divide by zero here, but take the known value below.
+    with np.errstate (divide='ignore', invalid='ignore'):
+      these_delta_t = prev_delta_t + (((the_JDNs - prev_JDNs) /
+                                       (next_JDNs - prev_JDNs)) *
+                                      (next_delta_t - prev_delta_t))
+    these_delta_t = these_delta_t + UT2_seasonal (the_JDNs)
+    these_delta_t = np.where (known, prev_delta_t, these_delta_t)
+
     if (do_trace > 0):
-      tracefile.write ("the_JDN " + str(the_JDN) + ".5 -> " +
-                       str(this_delta_t) + ".\n")
-    return (this_delta_t)
+      interpolated = np.flatnonzero (~known)
+      tracefile.write ("".join (
+        ["Interpolating: the_JDN " + str(the_JDN) + ".5.\n" +
+         "prev JDN: " + str(prev_JDN) + ".5 -> " + str(prev_value) + ".\n" +
+         "next JDN: " + str(next_JDN) + ".5 -> " + str(next_value) + ".\n" +
+         "the_JDN " + str(the_JDN) + ".5 -> " + str(this_value) + ".\n"
+         for (the_JDN, prev_JDN, prev_value, next_JDN, next_value,
+              this_value) in
+         zip (the_JDNs [interpolated].tolist(),
+              prev_JDNs [interpolated].tolist(),
+              prev_delta_t [interpolated].tolist(),
+              next_JDNs [interpolated].tolist(),
+              next_delta_t [interpolated].tolist(),
+              these_delta_t [interpolated].tolist())]))
+    return (these_delta_t)
       
-  # Calculate the points of the parabola and place them in a dictionary.
-  y_pos=dict()
-  for this_JDN in range (start_date, end_date+1):
-    y_pos[this_JDN] = ((a*(this_JDN**2))+(b*this_JDN)+c)
-
-  # Add the UT2 correction to the parabola.
-  for this_JDN in range (start_date, end_date+1):
-      y_pos[this_JDN] = y_pos[this_JDN] + UT2_seasonal(this_JDN)
+  # Calculate the points of the parabola, one for each day from
+  # start_date to end_date, and add the UT2 correction.  y_pos [0] is
+  # the point for start_date.
+  parabola_JDNs = np.arange (start_date, end_date+1, dtype=np.int64)
+  y_pos = (((a*(parabola_JDNs**2))+(b*parabola_JDNs)+c) +
+           UT2_seasonal (parabola_JDNs))
 
   # Find the date at which the astronomical projection intersets with
-  # the projection from the IERS.
+  # the projection from the IERS: the day on which they are nearest,
+  # the earliest if there is more than one.
   intersection_delta = -1
   intersection_JDN = projection_end_JDN + 1
   source = "IERS UT1-UTC projection"
   this_delta_t_source = delta_t_all[source]
   
-  for this_JDN in range (projection_start_JDN, projection_end_JDN):
-    astro_delta_t = astro_interpolate(this_JDN)
-    projection_delta_t = this_delta_t_source[this_JDN]
-    if (intersection_delta < 0):
-      intersection_JDN = this_JDN
-      intersection_delta = abs(astro_delta_t - projection_delta_t)
-    if (intersection_delta > abs(astro_delta_t - projection_delta_t)):
-      intersection_JDN = this_JDN
-      intersection_delta = abs(astro_delta_t - projection_delta_t)
+  projection_JDNs = np.arange (projection_start_JDN, projection_end_JDN,
+                               dtype=np.int64)
+  astro_delta_t = astro_interpolate_array (projection_JDNs)
+  projection_delta_t = np.array ([this_delta_t_source[this_JDN]
+                                  for this_JDN in projection_JDNs.tolist()],
+                                 dtype=np.float64)
+  projection_differences = astro_delta_t - projection_delta_t
+  projection_distances = np.abs (projection_differences)
+  if (len(projection_JDNs) > 0):
+    intersection_index = int(np.argmin (projection_distances))
+    intersection_JDN = int(projection_JDNs [intersection_index])
+    intersection_delta = projection_distances [intersection_index]
   if (verbosity_level > 0):
     print ("Astro and IERS projection intersection at " +
            str(intersection_JDN) + " = " + greg(intersection_JDN, "-", 0) + ".")
     print ("intersection delta: " + str(intersection_delta) + ".")
+
+  # Check that the projections really cross, rather than just come
+  # near each other: the day before each crossing is one on which the
+  # sign of the difference changes by the next day.
+  crossing_index = np.flatnonzero ((projection_differences [:-1] < 0) !=
+                                   (projection_differences [1:] < 0))
+  if (len(projection_JDNs) > 0):
+    if (len(crossing_index) == 0):
+      if (verbosity_level > 0):
+        print ("The astro and IERS projections do not cross; " +
+               "the parabola is anchored where they are nearest.")
+    elif (((verbosity_level > 0) and
+           (arguments ['intersection_candidates'] > 0)) or
+          (verbosity_level > 1)):
+      crossing_count = len(crossing_index)
+      print ("Astro and IERS projections cross " + str(crossing_count) +
+             (" time" if (crossing_count == 1) else " times") +
+             ", first between " +
+             greg (int(projection_JDNs [crossing_index [0]]), "-", 0) +
+             " and the next day.")
+
+  # Each day on which the projections are nearer than on the days
+  # either side is a candidate for the intersection.  Report the
+  # nearest of them.
+  if ((arguments ['intersection_candidates'] > 0) and
+      (len(projection_JDNs) > 0) and (verbosity_level > 0)):
+    padded_distances = np.concatenate (([np.inf], projection_distances,
+                                        [np.inf]))
+    candidate_index = np.flatnonzero (
+      (padded_distances [1:-1] < padded_distances [:-2]) &
+      (padded_distances [1:-1] <= padded_distances [2:]))
+    candidate_index = candidate_index [
+      np.argsort (projection_distances [candidate_index], kind='stable')]
+    crossing_days = set ((crossing_index).tolist() +
+                         (crossing_index + 1).tolist())
+    for this_index in candidate_index [:arguments ['intersection_candidates']]:
+      this_JDN = int(projection_JDNs [this_index])
+      print ("  near intersection at " + str(this_JDN) + " = " +
+             greg (this_JDN, "-", 0) + ", delta " +
+             str(projection_distances [this_index]) +
+             (", where they cross" if (int(this_index) in crossing_days)
+              else "") + ".")
   
   # The intersection between the astronomical projection and the IERS projection
   # is used as an anchor for stretching the parabola.
   parabola_anchor_X = intersection_JDN
   parabola_anchor_Y = deltaT(parabola_anchor_X)
     
-  parabola_offset = (parabola_anchor_Y - y_pos[parabola_anchor_X])
+  parabola_offset = (parabola_anchor_Y -
+                     y_pos[parabola_anchor_X - start_date])
   if (verbosity_level > 0):
     print ("Parabola anchor X = " + str(parabola_anchor_X) +
            ", Y = " + str(parabola_anchor_Y) + ".")
     print ("Parabola offset: " + str(parabola_offset) + ".")
 
   # Calculate how to stretch the parabola so it touches the anchor point.
-  parabola_max_found = 0
-  parabola_min_found = 0
-  parabola_anchor_found = 0
-  for this_JDN in range (start_date, end_date+1):
-    if (parabola_max_found == 0):
-      parabola_max = y_pos[this_JDN]
-      parabola_max_found = 1
-    if (y_pos[this_JDN] > parabola_max):
-      parabola_max = y_pos[this_JDN]
-    if (parabola_min_found == 0):
-      parabola_min = y_pos[this_JDN]
-      parabola_X_at_Y_min = this_JDN
-      parabola_min_found = 1
-    if (y_pos[this_JDN] < parabola_min):
-      parabola_min = y_pos[this_JDN]
-      parabola_X_at_Y_min = this_JDN
-    if (parabola_anchor_found == 0):
-      parabola_X_anchor = this_JDN
-      parabola_delta = abs(parabola_anchor_Y - y_pos[this_JDN])
-      parabola_anchor_found = 1
-    if ((abs(parabola_anchor_Y - y_pos[this_JDN])) < parabola_delta):
-      parabola_X_anchor = this_JDN
-      parabola_delta = abs(parabola_anchor_Y - y_pos[this_JDN])
+  # Where the lowest point, or the point nearest the anchor, is reached
+  # more than once, the earliest is used.
+  parabola_max = np.max (y_pos)
+  parabola_X_at_Y_min = start_date + int(np.argmin (y_pos))
+  parabola_min = y_pos[parabola_X_at_Y_min - start_date]
+  anchor_distances = np.abs (parabola_anchor_Y - y_pos)
+  parabola_X_anchor = start_date + int(np.argmin (anchor_distances))
+  parabola_delta = anchor_distances[parabola_X_anchor - start_date]
   parabola_height = parabola_max - parabola_min
   parabola_width = end_date - start_date
   parabola_height_stretch = ((parabola_anchor_Y - parabola_height) /
-                      (y_pos[parabola_anchor_X] - parabola_height))
+                      (y_pos[parabola_anchor_X - start_date] -
+                       parabola_height))
   parabola_width_stretch = ((parabola_anchor_X - parabola_width) /
                       (parabola_anchor_X - parabola_width))
   if (verbosity_level > 0):
     print ("Parabola Y max: " + str(parabola_max) + ".")
     print ("Parabola at Y min: " + str(parabola_X_at_Y_min) + ": " +
-           str(y_pos[parabola_X_at_Y_min]) + ".")
+           str(y_pos[parabola_X_at_Y_min - start_date]) + ".")
     print ("Parabola X min: " + str(start_date) + ".")
     print ("Parabola X max: " + str(end_date) + ".")
     print ("Parabola height: " + str(parabola_height) + ".")
     print ("Parabola width: " + str(parabola_width) + ".")
     print ("Parabola at X anchor: " + str(parabola_anchor_X) + ": " +
-           str(y_pos[parabola_anchor_X]) + ".")
+           str(y_pos[parabola_anchor_X - start_date]) + ".")
     print ("Parabola at Y anchor: " + str(parabola_X_anchor) + ": " +
-           str(y_pos[parabola_X_anchor]) + ".")
+           str(y_pos[parabola_X_anchor - start_date]) + ".")
     print ("Parabola delta: " + str(parabola_delta) + ".")
     print ("Parabola height stretch: " + str(parabola_height_stretch) + ".")
     print ("Parabola width stretch: " + str(parabola_width_stretch) + ".")
 
   # Perform the stretch
-  for this_JDN in range (start_date, end_date+1):
-    y_pos[this_JDN] = ((parabola_height_stretch *
-                        (y_pos[this_JDN] - parabola_height))
-                        + parabola_height)
+  y_pos = ((parabola_height_stretch * (y_pos - parabola_height))
+           + parabola_height)
 
   if (do_trace > 0):
     tracefile.write ("Parabola results:\n")
@@ -1097,16 +1226,11 @@ if (last_delta_T_from_IERS_date > 0):
     tracefile.write (" Anchor_X: " + str(parabola_anchor_X) + ".\n")
     tracefile.write (" delta: " + str(parabola_delta) + ".\n")
     tracefile.write (" Values:\n")
-    pprint.pprint (y_pos, tracefile)
+    pprint.pprint (dict(zip (range (start_date, end_date+1), y_pos)),
+                   tracefile)
     
-  # Place the computed values in the delta T dictionary.
-  source = "Parabola"
-  for this_JDN in y_pos:
-    if (source not in delta_t_all):
-      delta_t_all[source] = dict()
-      source_list = source_list + [source]
-    this_delta_t_source = delta_t_all[source]
-    this_delta_t_source[this_JDN] = y_pos[this_JDN]
+  # Place the computed values in the delta T dictionary, as an array.
+  record_daily_source ("Parabola", start_date, y_pos)
 
   # If requested, fade from the IERS projection to the astronomical projection
   # and then to the parabola.
@@ -1132,49 +1256,59 @@ if (last_delta_T_from_IERS_date > 0):
              greg(date_B, "-", 0) + " to " + greg(date_C, "-", 0) + " : " +
              str(fade_time_1) + " and " + str(fade_time_2) + " days.")
 
-    for this_JDN in range (date_A, date_B):
-      the_fraction = (this_JDN - date_A) / fade_time_1
-      if (the_fraction > 1.0):
-        the_fraction = 1.0
-      if ((the_fraction < 1.0) and (this_JDN in source_1_delta_t_dict)):
-        delta_t_1 = source_1_delta_t_dict [this_JDN]
-        delta_t_2 = astro_interpolate(this_JDN)
-        new_delta_t = ((the_fraction * delta_t_2) +
-                       ((1.0 - the_fraction) * delta_t_1))
-      else:
-        new_delta_t = astro_interpolate(this_JDN)
-      if (the_fraction > 1.0):
-        source = source_2
-      else:
-        source = source_1 + " + " + source_2
-      delta_t [this_JDN] = new_delta_t
-      delta_t_source[this_JDN] = source
-      if (source not in delta_t_all):
-        delta_t_all[source] = dict()
-        source_list = source_list + [source]
-      this_delta_t_source = delta_t_all[source]
-      this_delta_t_source[this_JDN] = new_delta_t
-    
-    for this_JDN in range (date_B, end_date):
-      the_fraction = (this_JDN - date_B) / fade_time_2
-      if (the_fraction > 1.0):
-        source = source_3
-      else:
-        source = source_2 + " + " + source_3
-      if (the_fraction < 1.0):
-        delta_t_2 = astro_interpolate(this_JDN)
-        delta_t_3 = source_3_delta_t_dict [this_JDN]
-        new_delta_t = ((the_fraction * delta_t_3) +
-                         ((1.0 - the_fraction) * delta_t_2))
-      else:
-        new_delta_t = source_3_delta_t_dict [this_JDN]
-      delta_t [this_JDN] = new_delta_t
-      delta_t_source[this_JDN] = source
-      if (source not in delta_t_all):
-        delta_t_all[source] = dict()
-        source_list = source_list + [source]
-      this_delta_t_source = delta_t_all[source]
-      this_delta_t_source[this_JDN] = new_delta_t
+    # Each day's value is a blend of two sources, weighted by how far
+    # the day is through its fade.  The weights are computed for all of
+    # the days at once.
+    fade_JDNs_1 = np.arange (date_A, date_B, dtype=np.int64)
+    fade_JDNs_2 = np.arange (date_B, end_date, dtype=np.int64)
+    astro_delta_t = astro_interpolate_array (np.concatenate ((fade_JDNs_1,
+                                                             fade_JDNs_2)))
+    delta_t_2_fade_1 = astro_delta_t [:len(fade_JDNs_1)]
+    delta_t_2_fade_2 = astro_delta_t [len(fade_JDNs_1):]
+
+    # From the IERS projection to the astronomical projection.  Days
+    # not in the IERS projection take the astronomical projection.
+    fraction_1 = np.minimum ((fade_JDNs_1 - date_A) / fade_time_1, 1.0)
+    delta_t_1 = np.array ([source_1_delta_t_dict.get (this_JDN, np.nan)
+                           for this_JDN in fade_JDNs_1.tolist()],
+                          dtype=np.float64)
+    in_source_1 = ~np.isnan (delta_t_1)
+    fade_delta_t_1 = np.where ((fraction_1 < 1.0) & in_source_1,
+                               ((fraction_1 * delta_t_2_fade_1) +
+                                ((1.0 - fraction_1) * delta_t_1)),
+                               delta_t_2_fade_1)
+
+    # From the astronomical projection to the parabola.  Past the end
+    # of the fade, which is never reached before date_C, the parabola
+    # is used alone.
+    fraction_2 = (fade_JDNs_2 - date_B) / fade_time_2
+    delta_t_3 = source_3_delta_t_dict.values [
+      date_B - source_3_delta_t_dict.first_JDN:
+      end_date - source_3_delta_t_dict.first_JDN]
+    fade_delta_t_2 = np.where (fraction_2 < 1.0,
+                               ((fraction_2 * delta_t_3) +
+                                ((1.0 - fraction_2) * delta_t_2_fade_2)),
+                               delta_t_3)
+
+    # The fractions increase from day to day, so each source label
+    # covers a run of consecutive days.  The fraction of the first fade
+    # is never more than 1, so the first fade has a single label.
+    fade_JDNs = np.concatenate ((fade_JDNs_1, fade_JDNs_2))
+    fade_delta_t = np.concatenate ((fade_delta_t_1, fade_delta_t_2))
+    fade_2_end = len(fade_JDNs_1) + int(np.searchsorted (fraction_2, 1.0,
+                                                         side='right'))
+    fade_labels = [(0, len(fade_JDNs_1), source_1 + " + " + source_2),
+                   (len(fade_JDNs_1), fade_2_end, source_2 + " + " + source_3),
+                   (fade_2_end, len(fade_JDNs), source_3)]
+
+    # Commit the faded values to the store of delta T.
+    delta_t.update (zip (fade_JDNs.tolist(), fade_delta_t))
+    for (label_start, label_end, source) in fade_labels:
+      if (label_end > label_start):
+        delta_t_source.update (dict.fromkeys (
+          range (date_A + label_start, date_A + label_end), source))
+        record_daily_source (source, date_A + label_start,
+                             fade_delta_t [label_start:label_end])
     
   rebuild_interpolations()
   #
@@ -1271,6 +1405,7 @@ if ((do_csv_output == 1) & (error_counter == 0)):
         delta_t_all_data[this_JDN] = list()
       old_list = delta_t_all_data[this_JDN]
       delta_t_all_data[this_JDN] = old_list + [(source, delta_t_val)]
+  csv_rows = list()
   for this_JDN in range (start_date, end_date+1):
     if (this_JDN in delta_t_all_data):
       data_list = delta_t_all_data[this_JDN]
@@ -1282,60 +1417,89 @@ if ((do_csv_output == 1) & (error_counter == 0)):
                                  str(month_no) + ";" + str(mday_no) + ";" +
                                  greg (this_JDN, " ", 2) + ";" +
                                  str(delta_t_val) + ";" + source + "\n")
+          if (do_csv_npz_output == 1):
+            csv_rows.append ((this_JDN, year_no, month_no, mday_no,
+                              delta_t_val, source))
   csv_output_file.close()
 
+  # Optionally, write the same data in binary form, without the
+  # spreadsheet date column.
+  if (do_csv_npz_output == 1):
+    csv_columns = list(zip (*csv_rows))
+    if (len(csv_columns) == 0):
+      csv_columns = [list()] * 6
+    npz_columns.write_npz_columns (csv_npz_output_file_name, {
+      "JDN": np.array (csv_columns [0], dtype=np.int64),
+      "Year": np.array (csv_columns [1], dtype=np.int64),
+      "Month": np.array (csv_columns [2], dtype=np.int8),
+      "Day": np.array (csv_columns [3], dtype=np.int8),
+      "delta_t": np.array (csv_columns [4], dtype=np.float64),
+      "source": np.array (csv_columns [5], dtype=object)})
+
 #
 # Optionally, write a file that can be parsed and plotted
 # using gnuplot.  The plot will show the change in delta T over time.
 #
-if ((do_gnuplot_output == 1) & (error_counter == 0)):
-  gnuplot_output_file = open (gnuplot_output_file_name, 'wt')
-  first_point_plotted = 0
+if (((do_gnuplot_output == 1) or (do_gnuplot_pyramid == 1)) &
+    (error_counter == 0)):
+  gnuplot_x = list()
+  gnuplot_y = list()
   for day_no in sorted(delta_t.keys()):
     if ((day_no >= gnuplot_start_jdn) & (day_no <= gnuplot_end_jdn)):
       delta_t_val = delta_t [day_no]
-      if (first_point_plotted == 0):
-        if (day_no > gnuplot_start_jdn):
-          gnuplot_output_file.write (str (gnuplot_start_jdn) + " " +
-                                     str (delta_t_val) + "\n")
-          first_point_plotted = 1
-      gnuplot_output_file.write (str (day_no) + " " +
-                                 str (delta_t_val) + "\n")
-
-    gnuplot_output_file.write (str (gnuplot_end_jdn) + " " +
-                               str (delta_t_val) + "\n")
+      if ((len(gnuplot_x) == 0) and (day_no > gnuplot_start_jdn)):
+        gnuplot_x.append (gnuplot_start_jdn)
+        gnuplot_y.append (delta_t_val)
+      gnuplot_x.append (day_no)
+      gnuplot_y.append (delta_t_val)
+  if ((len(gnuplot_x) > 0) and (gnuplot_x [-1] < gnuplot_end_jdn)):
+    gnuplot_x.append (gnuplot_end_jdn)
+    gnuplot_y.append (gnuplot_y [-1])
+
+  if (do_gnuplot_output == 1):
+    gnuplot_output_file = open (gnuplot_output_file_name, 'wt')
+    for (x_value, y_value) in zip (gnuplot_x, gnuplot_y):
+      gnuplot_output_file.write (str (x_value) + " " + str (y_value) + "\n")
     gnuplot_output_file.close()
 
+  # The same data, at several resolutions, so a plot of a long span
+  # of time can use fewer points.
+  if (do_gnuplot_pyramid == 1):
+    level_count = gnuplot_pyramid.write_pyramid (gnuplot_pyramid_prefix,
+                                                 gnuplot_x, gnuplot_y,
+                                                 gnuplot_pyramid_pixels)
+    if (verbosity_level > 1):
+      print ("Wrote " + str(level_count) + " levels of gnuplot data.")
+
 #
 # Convert the values of Delta T into a a series of one-second steps,
 # to keep UTC within 0.9 seconds of the rotation of the Earth.
 # The result is a dictionary of days with 86,399 or 86,401 seconds.
 #
-jdn_priority = dict()
-last_day = [31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
 
-# Subroutine to mark a high-priority date for an extraordinary day.
-# A date's priority will not be lowered.
-def mke (yearno, monthno, dayno, priority):
-  # dayno == -1 means the last day of the month
+# Subroutine to convert numpy datetime64 days into Julian Day Numbers.
+calendar_epoch_tuple = gcal2jd (1970, 1, 1)
+calendar_epoch_JDN = int(calendar_epoch_tuple [0] + calendar_epoch_tuple [1] -
+                         0.5)
+def datetime64_to_JDN (the_dates):
+  return (the_dates.astype ('datetime64[D]').astype (np.int64) +
+          calendar_epoch_JDN)
+
+# Subroutine to find the Julian Day Numbers of a day of the month in
+# each month from first_year through last_year.  The months are a list
+# of month numbers, and dayno == -1 means the last day of the month.
+def monthly_JDNs (first_year, last_year, months, dayno):
+  year_offsets = np.arange (first_year - 1970, last_year - 1970 + 1,
+                            dtype=np.int64)
+  month_offsets = np.array (months, dtype=np.int64) - 1
+  the_months = (year_offsets [:, np.newaxis] * 12 +
+                month_offsets [np.newaxis, :]).ravel().astype (
+                  'datetime64[M]')
   if (dayno == -1):
-    if (monthno == 2):
-      # worry about leap year
-      if (is_leap (yearno)):
-        dayno = 29          
-      else:
-        dayno = 28
-    else:
-      dayno = last_day [monthno-1]
-  this_JDN = jdn (yearno, monthno, dayno)
-  if (this_JDN not in jdn_priority):
-    jdn_priority [this_JDN] = priority
-    if (do_trace > 1):
-      tracefile.write ("mke: JDN " + str(this_JDN) + " = " +
-                       greg (this_JDN, "-", 0) + " = " +
-                       str(yearno) + "-" + str(monthno) + "-" +
-                       str(dayno) + " has priority " + str(priority) + ".\n")
-  return
+    the_days = (the_months + 1).astype ('datetime64[D]') - 1
+  else:
+    the_days = the_months.astype ('datetime64[D]') + (dayno - 1)
+  return (datetime64_to_JDN (the_days))
 
 # Open the output file.
 file_name = arguments ['output_file']
@@ -1419,87 +1583,118 @@ if (do_trace == 1):
 # priority 7 days are all days without a higher priority.
 #
 
-# We record the priority 1-6 days in a dictionary; any day not in
-# the dictionary is a priority 7.
-
-#
-# Priority 1 from the IERS,
-# last updated July 7, 2016, to include December 31, 2016.
+# The priority of each day is kept in an array of small integers,
+# priority_calendar, indexed by the Julian Day Number less
+# calendar_first_JDN.  Days outside the array are priority 7.
 #
-mke(1972,6,30,1)
-mke(1972,12,31,1)
-mke(1973,12,31,1)
-mke(1974,12,31,1)
-mke(1975,12,31,1)
-mke(1976,12,31,1)
-mke(1977,12,31,1)
-mke(1978,12,31,1)
-mke(1979,12,31,1)
-mke(1981,6,30,1)
-mke(1982,6,30,1)
-mke(1983,6,30,1)
-mke(1985,6,30,1)
-mke(1987,12,31,1)
-mke(1989,12,31,1)
-mke(1990,12,31,1)
-mke(1992,6,30,1)
-mke(1993,6,30,1)
-mke(1994,6,30,1)
-mke(1995,12,31,1)
-mke(1997,6,30,1)
-mke(1998,12,31,1)
-mke(2005,12,31,1)
-mke(2008,12,31,1)
-mke(2012,6,30,1)
-mke(2015,6,30,1)
-mke(2016,12,31,1)
-
-#
-# Priority 2 from Tony Finch
-# DTAI was 0 on January 1, 1958, by definition,
-# and 10 on January 1, 1972, so there were 10
-# leap seconds between those dates.
+# Priority 1 and 2 days are listed in fixed_priority_days as year,
+# month, day and priority.  The others are given by the rules in
+# priority_rules.  Each rule gives a priority, the months to which it
+# applies, and the day of the month, -1 meaning the last day; it applies
+# to every year from min_year_int through max_year_int.  A day marked
+# by more than one rule or fixed day gets the highest priority, which
+# is the lowest number.
 #
-mke(1959,6,30,2)
-
-mke(1961,6,30,2)
-mke(1963,6,30,2)
-mke(1964,12,31,2)
-mke(1966,6,30,2)
-mke(1967,6,30,2)
-mke(1968,6,30,2)
-mke(1969,6,30,2)
 
-mke(1970,6,30,2)
-mke(1971,6,30,2)
-
-#
-# Priority 3: the last day of June and December in any year:
-#
-for yearno in range (min_year_int, max_year_int+1):
-  mke (yearno, 6, -1, 3)
-  mke (yearno, 12, -1, 3)
-
-#
-# Priority 4: the last day of March and September in any year:
-#
-for yearno in range (min_year_int, max_year_int+1):
-  mke (yearno, 3, -1, 4)
-  mke (yearno, 9, -1, 4)
-
-#
-# Priority 5: the last day of all other months:
-#
-for yearno in range (min_year_int, max_year_int+1):
-  for monthno in range (1, 13):
-    mke (yearno, monthno, -1, 5)
+fixed_priority_days = [
+  #
+  # Priority 1 from the IERS,
+  # last updated July 7, 2016, to include December 31, 2016.
+  #
+  (1972, 6, 30, 1),
+  (1972, 12, 31, 1),
+  (1973, 12, 31, 1),
+  (1974, 12, 31, 1),
+  (1975, 12, 31, 1),
+  (1976, 12, 31, 1),
+  (1977, 12, 31, 1),
+  (1978, 12, 31, 1),
+  (1979, 12, 31, 1),
+  (1981, 6, 30, 1),
+  (1982, 6, 30, 1),
+  (1983, 6, 30, 1),
+  (1985, 6, 30, 1),
+  (1987, 12, 31, 1),
+  (1989, 12, 31, 1),
+  (1990, 12, 31, 1),
+  (1992, 6, 30, 1),
+  (1993, 6, 30, 1),
+  (1994, 6, 30, 1),
+  (1995, 12, 31, 1),
+  (1997, 6, 30, 1),
+  (1998, 12, 31, 1),
+  (2005, 12, 31, 1),
+  (2008, 12, 31, 1),
+  (2012, 6, 30, 1),
+  (2015, 6, 30, 1),
+  (2016, 12, 31, 1),
+  #
+  # Priority 2 from Tony Finch
+  # DTAI was 0 on January 1, 1958, by definition,
+  # and 10 on January 1, 1972, so there were 10
+  # leap seconds between those dates.
+  #
+  (1959, 6, 30, 2),
+  (1961, 6, 30, 2),
+  (1963, 6, 30, 2),
+  (1964, 12, 31, 2),
+  (1966, 6, 30, 2),
+  (1967, 6, 30, 2),
+  (1968, 6, 30, 2),
+  (1969, 6, 30, 2),
+  (1970, 6, 30, 2),
+  (1971, 6, 30, 2)
+]
+
+priority_rules = [
+  # Priority 3: the last day of June and December in any year:
+  (3, (6, 12), -1),
+  # Priority 4: the last day of March and September in any year:
+  (4, (3, 9), -1),
+  # Priority 5: the last day of all other months:
+  (5, range (1, 13), -1),
+  # Priority 6: the 15th of any month:
+  (6, range (1, 13), 15)
+]
+lowest_priority = 7
+
+fixed_priority_JDNs = np.array ([jdn (yearno, monthno, dayno)
+                                 for (yearno, monthno, dayno, priority) in
+                                 fixed_priority_days], dtype=np.int64)
+calendar_first_JDN = min ([jdn (min_year_int, 1, 1)] +
+                          fixed_priority_JDNs.tolist())
+calendar_last_JDN = max ([jdn (max_year_int, 12, 31)] +
+                         fixed_priority_JDNs.tolist())
+priority_calendar = np.full (calendar_last_JDN - calendar_first_JDN + 1,
+                             lowest_priority, dtype=np.int8)
+np.minimum.at (priority_calendar, fixed_priority_JDNs - calendar_first_JDN,
+               np.array ([priority for (yearno, monthno, dayno, priority) in
+                          fixed_priority_days], dtype=np.int8))
+for (priority, months, dayno) in priority_rules:
+  rule_JDNs = monthly_JDNs (min_year_int, max_year_int, months, dayno)
+  np.minimum.at (priority_calendar, rule_JDNs - calendar_first_JDN,
+                 np.int8 (priority))
 
-#
-# Priority 6: the 15th of any month:
-#
-for yearno in range (min_year_int, max_year_int+1):
-  for monthno in range (1, 13):
-    mke (yearno, monthno, 15, 6)
+if (do_trace > 1):
+  for calendar_index in np.flatnonzero (
+      priority_calendar < lowest_priority).tolist():
+    this_JDN = calendar_first_JDN + calendar_index
+    tracefile.write ("JDN " + str(this_JDN) + " = " +
+                     greg (this_JDN, "-", 0) + " has priority " +
+                     str(priority_calendar [calendar_index]) + ".\n")
+
+# Subroutine to return the priorities of the days from first_JDN up to
+# but not including limit_JDN, as an array.
+def priorities_of (first_JDN, limit_JDN):
+  the_priorities = np.full (max(limit_JDN - first_JDN, 0), lowest_priority,
+                            dtype=np.int8)
+  overlap_first = max(first_JDN, calendar_first_JDN)
+  overlap_limit = min(limit_JDN, calendar_last_JDN + 1)
+  if (overlap_limit > overlap_first):
+    the_priorities [overlap_first - first_JDN:overlap_limit - first_JDN] = (
+      priority_calendar [overlap_first - calendar_first_JDN:
+                         overlap_limit - calendar_first_JDN])
+  return (the_priorities)
 
 if (do_trace == 1):
   tracefile.flush()
@@ -1572,7 +1767,16 @@ def choose_jdn (date1_jdn, date2_jdn, base_jdn, sign):
 #
 leap = deltaTAI (start_date)
 print ("Initial value of leap is " + str(leap) + ".")
-jdn_edays = dict ()
+
+#
+# The extraordinary days are kept in two arrays sorted by Julian Day
+# Number: eday_JDNs, the days, and eday_lods, the length of each in
+# seconds.  While the timeline is scanned the days are collected in
+# lists, in ascending order since each scan starts after the last day
+# found.
+#
+eday_JDN_list = list()
+eday_lod_list = list()
 
 #
 # Subroutine to scan an interval of time, inserting a leap second
@@ -1630,18 +1834,21 @@ def scan_interval (base_jdn, limit_jdn):
   # UTC and UT1 has reached 0.9 seconds, and has not decreased below
   # 0.1 seconds since anchor_jdn.  We must issue a leap second.
   # Find the best time to do that.
+  # Of the days with the highest priority, choose_jdn picks the best.
   future_jdn = current_jdn
   best_jdn = anchor_jdn
-  best_priority = jdn_priority.get(best_jdn, 7)
-  for current_jdn in range (anchor_jdn, future_jdn):
-    current_priority = jdn_priority.get(current_jdn, 7)
-    if (current_priority == best_priority):
+  best_priority = int(priorities_of (anchor_jdn, anchor_jdn + 1) [0])
+  interval_priorities = priorities_of (anchor_jdn, future_jdn)
+  if (len(interval_priorities) > 0):
+    best_priority = int(np.min (interval_priorities))
+    candidate_jdns = (anchor_jdn + np.flatnonzero (
+      interval_priorities == best_priority)).tolist()
+    best_jdn = candidate_jdns [0]
+    for current_jdn in candidate_jdns [1:]:
       best_jdn = choose_jdn (best_jdn, current_jdn, anchor_jdn, sign)
-    if (current_priority < best_priority):
-      best_jdn = current_jdn
-      best_priority = current_priority
   # The best date in the interval becomes an extraordinary day
-  jdn_edays[best_jdn] = 86400 + sign
+  eday_JDN_list.append (best_jdn)
+  eday_lod_list.append (86400 + sign)
   if (do_trace > 1):
     tracefile.write (" leap " + str(sign) + " (" +
                      str(leap+sign) + ") at " +
@@ -1664,6 +1871,56 @@ scan_jdn = start_date
 while (scan_jdn < end_date):
   scan_jdn = scan_interval (scan_jdn, end_date)
 
+eday_order = np.argsort (np.array (eday_JDN_list, dtype=np.int64),
+                         kind='stable')
+eday_JDNs = np.array (eday_JDN_list, dtype=np.int64) [eday_order]
+eday_lods = np.array (eday_lod_list, dtype=np.int64) [eday_order]
+
+# Subroutine to delete the extraordinary days from first_JDN up to but
+# not including limit_JDN.  Returns the days deleted.
+def delete_edays (first_JDN, limit_JDN):
+  global eday_JDNs
+  global eday_lods
+  first_index = int(np.searchsorted (eday_JDNs, first_JDN, side='left'))
+  limit_index = int(np.searchsorted (eday_JDNs, limit_JDN, side='left'))
+  deleted_JDNs = eday_JDNs [first_index:limit_index]
+  eday_JDNs = np.concatenate ((eday_JDNs [:first_index],
+                               eday_JDNs [limit_index:]))
+  eday_lods = np.concatenate ((eday_lods [:first_index],
+                               eday_lods [limit_index:]))
+  return (deleted_JDNs)
+
+# Subroutine to insert extraordinary days, replacing any already on
+# those days.
+def insert_edays (new_JDNs, new_lods):
+  global eday_JDNs
+  global eday_lods
+  kept = ~np.isin (eday_JDNs, new_JDNs)
+  all_JDNs = np.concatenate ((eday_JDNs [kept], new_JDNs))
+  all_lods = np.concatenate ((eday_lods [kept], new_lods))
+  all_order = np.argsort (all_JDNs, kind='stable')
+  eday_JDNs = all_JDNs [all_order]
+  eday_lods = all_lods [all_order]
+  return
+
+# Subroutine to replace the extraordinary days from first_JDN up to but
+# not including limit_JDN with the priority 1 and 2 days in that range,
+# which all have 86,401 seconds.
+def replace_edays (first_JDN, limit_JDN):
+  deleted_JDNs = delete_edays (first_JDN, limit_JDN)
+  if (do_trace == 1):
+    for clear_jdn in deleted_JDNs.tolist():
+      tracefile.write (" delete leap at " + greg(clear_jdn, " ", 0) +
+                       ".\n")
+  fill_jdns = first_JDN + np.flatnonzero (
+    priorities_of (first_JDN, limit_JDN) < 3)
+  if (do_trace == 1):
+    for fill_jdn in fill_jdns.tolist():
+      tracefile.write (" add leap at " + greg(fill_jdn, " ", 0) +
+                       ".\n")
+  insert_edays (fill_jdns, np.full (len(fill_jdns), 86401, dtype=np.int64))
+  return
+
 #
 # If requested, replace the extraordinary days from January 1, 1958
 # to December 28, 2017 with those from Tony Finch and the IERS.
@@ -1672,20 +1929,7 @@ while (scan_jdn < end_date):
 if (do_Tony_Finch_leaps):
   if (do_trace == 1):
     tracefile.write ("Tony Finch leaps:\n")
-  for clear_jdn in range (jdn(1958,1,1), jdn(1971,12,31)):
-    if clear_jdn in jdn_edays:
-      if (do_trace == 1):
-        tracefile.write (" delete leap at " + greg(clear_jdn, " ", 0) +
-                         ".\n")
-      del jdn_edays [clear_jdn]
-
-  for fill_jdn in range (jdn(1958,1,1), jdn(1971,12,31)):
-    if fill_jdn in jdn_priority:
-      if (jdn_priority [fill_jdn] < 3):
-        if (do_trace == 1):
-          tracefile.write (" add leap at " + greg(fill_jdn, " ", 0) +
-                         ".\n")
-        jdn_edays [fill_jdn] = 86401
+  replace_edays (jdn(1958,1,1), jdn(1971,12,31))
 
 #
 # If requested, replace the extraordinary days from January 1, 1973
@@ -1694,68 +1938,42 @@ if (do_Tony_Finch_leaps):
 if (do_IERS_leaps):
   if (do_trace == 1):
     tracefile.write ("IERS leaps:\n")
-  for clear_jdn in range (jdn(1972,1,1), jdn(2019,12,31)):
-    if clear_jdn in jdn_edays:
-      if (do_trace == 1):
-        tracefile.write (" delete leap at " + greg(clear_jdn, " ", 0) +
-                         ".\n")
-      del jdn_edays [clear_jdn]
-
-  for fill_jdn in range (jdn(1972,1,1), jdn(2019,12,31)):
-    if fill_jdn in jdn_priority:
-      if (jdn_priority [fill_jdn] < 3):
-        if (do_trace == 1):
-          tracefile.write (" add leap at " + greg(fill_jdn, " ", 0) +
-                         ".\n")
-        jdn_edays [fill_jdn] = 86401
+  replace_edays (jdn(1972,1,1), jdn(2019,12,31))
   
 #
 # Show the resulting list of extraordinary days to the trace file.
 #
 if (do_trace == 1):
   tracefile.write ("Extraordinary days:\n")
-  pprint.pprint (jdn_edays, tracefile)
+  pprint.pprint (dict(zip (eday_JDNs.tolist(), eday_lods.tolist())),
+                 tracefile)
   
 # Compute DTAI, based on DTAI = 0 on January 1, 1958, at UTC 00:00.
-dtai_dict = {}
-
 dtai0_jdn_tuple = gcal2jd (1957,12,31)
 dtai0_jdn = int(dtai0_jdn_tuple [0] + dtai0_jdn_tuple [1] + 0.5)
-oldest_jdn = dtai0_jdn
 if (do_trace == 1):
   tracefile.write ("Computing extraordinary days, dtai0_jdn = " +
                    str(dtai0_jdn) + " = " + greg(dtai0_jdn, "-", 0) + ".\n")
-dtai_dict [dtai0_jdn] = 0
-
-# Walk forward from January 1, 1958
-current_dtai = 0
-jdn_list = sorted(jdn_edays.keys())
-for jdn in jdn_list:
-  if (jdn < oldest_jdn):
-    oldest_jdn = jdn
-  if (jdn > dtai0_jdn):
-    lod = jdn_edays [jdn]
-    current_dtai = current_dtai + lod - 86400
-    dtai_dict [jdn] = current_dtai
-
-# Walk backward from January 1, 1958
-jdn_list = sorted(jdn_edays.keys(), reverse=1)
-prev_jdn = 0
-for jdn in jdn_list:
-  if (jdn < dtai0_jdn):
-    lod = jdn_edays [prev_jdn]
-    current_dtai = dtai_dict [prev_jdn] - lod + 86400
-    dtai_dict [jdn] = current_dtai
-  prev_jdn = jdn
-
-#dtai_dict [oldest_jdn] = current_dtai - 1
+
+# DTAI at the end of an extraordinary day after dtai0_jdn is the sum
+# of the leap seconds after dtai0_jdn through that day.  Before it,
+# DTAI is less the leap seconds after that day through dtai0_jdn.
+# Both are the running sum of the leap seconds, less its value at
+# dtai0_jdn.
+cumulative_leaps = np.cumsum (eday_lods - 86400)
+base_index = int(np.searchsorted (eday_JDNs, dtai0_jdn, side='right'))
+if (base_index > 0):
+  eday_DTAI = cumulative_leaps - cumulative_leaps [base_index - 1]
+else:
+  eday_DTAI = cumulative_leaps
 
 # Output the resulting table
-for jdn in sorted(jdn_edays.keys()):
-  lod = jdn_edays [jdn]
-  dtai = dtai_dict [jdn]
-  outfile.write (str(jdn) + "\t" + str(lod) + "\t" + str(dtai) + "\t" +
-                 "# " + greg (jdn, " ", 0) + "\n")
+outfile.write ("".join ([str(this_JDN) + "\t" + str(lod) + "\t" +
+                         str(dtai) + "\t" + "# " +
+                         greg (this_JDN, " ", 0) + "\n"
+                         for (this_JDN, lod, dtai) in
+                         zip (eday_JDNs.tolist(), eday_lods.tolist(),
+                              eday_DTAI.tolist())]))
 
 outfile.close()
 
@@ -1766,74 +1984,118 @@ if (do_UT1UTC_output):
     tracefile.write ("Producing UT1-UTC, base_deltaT = " +
                      str(base_deltaT) + ".\n")
     pprint.pprint (delta_t_source, tracefile)
-    
-  leap = base_deltaT
-  UT1UTC_dict = dict()
-  prevous_source = "unknown"
+
+  # The length of each day from start_date to end_date.
+  UT1UTC_days = np.arange (start_date + 1, end_date, dtype=np.int64)
+  UT1UTC_lod = np.full (len(UT1UTC_days), 86400, dtype=np.int64)
+  in_range = (eday_JDNs > start_date) & (eday_JDNs < end_date)
+  UT1UTC_lod [eday_JDNs [in_range] - (start_date + 1)] = eday_lods [in_range]
+  
+  # Subroutine to compute leap for each day, walking from January 1, 1958,
+  # when UT1-UTC was 0, in the direction specified.  The value of leap
+  # changes only at extraordinary days, so runs of ordinary days are
+  # filled in all at once.  The arithmetic at each day is done exactly as
+  # in a day-by-day walk, so the rounding of the result is the same.
+  def walk_leap (the_lods, direction):
+    leap_values = np.empty (len(the_lods))
+    extraordinary = np.flatnonzero (the_lods != 86400)
+    leap = base_deltaT
+    day_index = 0
+    while (day_index < len(the_lods)):
+      leap_values [day_index] = leap
+      lod = the_lods [day_index]
+      if (direction > 0):
+        next_leap = leap + lod - 86400
+      else:
+        next_leap = leap - lod + 86400
+      if ((lod == 86400) and (next_leap == leap)):
+        # Skip to the next extraordinary day.
+        next_index = np.searchsorted (extraordinary, day_index)
+        if (next_index < len(extraordinary)):
+          next_index = extraordinary [next_index]
+        else:
+          next_index = len(the_lods)
+        leap_values [day_index + 1:next_index] = leap
+        day_index = next_index
+        continue
+      leap = next_leap
+      day_index = day_index + 1
+    return (leap_values)
+
+  # Find the source of each value of delta T.  Days which are not
+  # in delta_t_source take the source of the day before in the
+  # direction of the walk.
+  source_jdns = np.array (sorted(delta_t_source.keys()), dtype=np.int64)
+  source_names = np.array ([delta_t_source[this_JDN]
+                            for this_JDN in source_jdns] + ["unknown"],
+                           dtype=object)
+  
+  # Walk futureward from January 1, 1958.
+  forward_days = np.arange (dtai0_jdn, end_date, dtype=np.int64)
+  forward_index = forward_days - (start_date + 1)
+  forward_leap = walk_leap (UT1UTC_lod [forward_index], 1)
+  source_index = np.searchsorted (source_jdns, forward_days,
+                                  side='right') - 1
+  source_index = np.where ((source_index >= 0) &
+                           (source_jdns [np.maximum (source_index, 0)] >=
+                            dtai0_jdn), source_index, len(source_jdns))
+  forward_source = source_names [source_index]
   
-  # Walk futureward from January 1, 1958, when UT1-UTC was 0.
-  for this_JDN in range (dtai0_jdn, end_date):
-    this_deltaT = deltaT (this_JDN)
-    UT1UTC = leap - this_deltaT
-    lod = 86400
-    if (this_JDN in jdn_edays):
-      lod = jdn_edays[this_JDN]
-    next_leap = leap + lod - 86400
-    ymdf = jd2gcal (float(this_JDN), 0.5)
-    year_no = ymdf [0]
-    month_no = ymdf [1]
-    mday_no = ymdf [2]
-    if (this_JDN in delta_t_source):
-      source = delta_t_source [this_JDN]
-    else:
-      source = previous_source
-    UT1UTC_dict [this_JDN] = (year_no, month_no, mday_no, source, leap, UT1UTC)
-    if (do_trace == 1):
-      tracefile.write (" JDN " + str(this_JDN) + " " +
-                       " Year " + str(year_no) + " " +
-                       "Month " + str(month_no) + " " +
-                       "Day of month " + str(mday_no) + " " +
-                       "deltaT " + str(this_deltaT) + " " +
-                       "leap " + str(leap) + " " +
-                       "next_leap " + str(next_leap) + " " +
-                       "UT1-UTC " + str(UT1UTC) +
-                       " source " + source + ".\n")
-    previous_source = source
-    leap = next_leap
-      
   # Walk pastward from January 1, 1958.
-  leap = base_deltaT
-  previous_source = "unknown"
-  for this_JDN in range(dtai0_jdn, start_date, -1):
-    this_deltaT = deltaT (this_JDN)
-    UT1UTC = leap - this_deltaT
-    lod = 86400
-    if (this_JDN in jdn_edays):
-      lod = jdn_edays[this_JDN]
-    next_leap = leap - lod + 86400
-    ymdf = jd2gcal (float(this_JDN), 0.5)
-    year_no = ymdf [0]
-    month_no = ymdf [1]
-    mday_no = ymdf [2]
-    if (this_JDN in delta_t_source):
-      source = delta_t_source [this_JDN]
-    else:
-      source = previous_source
-    UT1UTC_dict [this_JDN] = (year_no, month_no, mday_no, source, leap, UT1UTC)
-    if (do_trace == 1):
-      tracefile.write (" JDN " + str(this_JDN) + " " +
-                       " Year " + str(year_no) + " " +
-                       "Month " + str(month_no) + " " +
-                       "Day of month " + str(mday_no) + " " +
-                       "deltaT " + str(this_deltaT) + " " +
-                       "leap " + str(leap) + " " +
-                       "next_leap " + str(next_leap) + " " +
-                       "UT1-UTC " + str(UT1UTC) +
-                       " source " + source + ".\n")
-    previous_source = source
-    leap = next_leap
-
-  # Now that the dataa is collected, output it.
+  backward_days = np.arange (dtai0_jdn, start_date, -1, dtype=np.int64)
+  backward_index = backward_days - (start_date + 1)
+  backward_leap = walk_leap (UT1UTC_lod [backward_index], -1)
+  source_index = np.searchsorted (source_jdns, backward_days, side='left')
+  source_index = np.where (
+    (source_index < len(source_jdns)) &
+    (source_jdns [np.minimum (source_index, len(source_jdns) - 1)] <=
+     dtai0_jdn), source_index, len(source_jdns))
+  backward_source = source_names [source_index]
+
+  # Combine the two walks into arrays indexed by day.  January 1, 1958
+  # is in both; it takes its values from the pastward walk.
+  UT1UTC_leap = np.empty (len(UT1UTC_days))
+  UT1UTC_leap [forward_index] = forward_leap
+  UT1UTC_leap [backward_index] = backward_leap
+  UT1UTC_source = np.empty (len(UT1UTC_days), dtype=object)
+  UT1UTC_source [forward_index] = forward_source
+  UT1UTC_source [backward_index] = backward_source
+  UT1UTC_deltaT = deltaT (UT1UTC_days)
+  UT1UTC_values = UT1UTC_leap - UT1UTC_deltaT
+
+  # The calendar date of each day.
+  unix_epoch_tuple = gcal2jd (1970, 1, 1)
+  unix_epoch_jdn = int(unix_epoch_tuple [0] + unix_epoch_tuple [1] - 0.5)
+  UT1UTC_dates = (UT1UTC_days - unix_epoch_jdn).astype ('datetime64[D]')
+  UT1UTC_months = UT1UTC_dates.astype ('datetime64[M]')
+  UT1UTC_year = UT1UTC_dates.astype ('datetime64[Y]').astype (np.int64) + 1970
+  UT1UTC_month = (UT1UTC_months.astype (np.int64) % 12) + 1
+  UT1UTC_mday = (UT1UTC_dates - UT1UTC_months).astype (np.int64) + 1
+
+  if (do_trace == 1):
+    for (walk_days, walk_leap_values, walk_source, direction) in (
+        (forward_days, forward_leap, forward_source, 1),
+        (backward_days, backward_leap, backward_source, -1)):
+      for walk_position in range (len(walk_days)):
+        day_index = walk_days [walk_position] - (start_date + 1)
+        leap = walk_leap_values [walk_position]
+        lod = UT1UTC_lod [day_index]
+        if (direction > 0):
+          next_leap = leap + lod - 86400
+        else:
+          next_leap = leap - lod + 86400
+        tracefile.write (" JDN " + str(walk_days [walk_position]) + " " +
+                         " Year " + str(UT1UTC_year [day_index]) + " " +
+                         "Month " + str(UT1UTC_month [day_index]) + " " +
+                         "Day of month " + str(UT1UTC_mday [day_index]) +
+                         " " +
+                         "deltaT " + str(UT1UTC_deltaT [day_index]) + " " +
+                         "leap " + str(leap) + " " +
+                         "next_leap " + str(next_leap) + " " +
+                         "UT1-UTC " + str(leap - UT1UTC_deltaT [day_index]) +
+                         " source " + walk_source [walk_position] + ".\n")
+
+  # Now that the data is collected, output it.
   UT1UTCfile = open (UT1UTC_output_file_name, "wt")
   UT1UTCfile.write ("JDN;Year;Month;Day;source;leap;UT1-UTC\n")
 
@@ -1858,21 +2120,46 @@ if (do_UT1UTC_output):
     tracefile.write ("Pandas max date: ")
     pprint.pprint (pd.Timestamp.max, tracefile)
     pprint.pprint (max_datetime, tracefile)
-    
-  for this_JDN in range (UT1UTC_start_jdn, UT1UTC_end_jdn):
-    (year_no, month_no, mday_no, source, leap, UT1UTC) = UT1UTC_dict[this_JDN]
-    this_date = datetime.datetime(year_no, month_no, mday_no)
-    if ((this_date >= min_datetime) and (this_date <= max_datetime)):
-      UT1UTCfile.write (str(this_JDN) + ";" +
-                        str(year_no) + ";" +
-                        str(month_no) + ";" +
-                        str(mday_no) + ";" +
-                        str(source) + ";" +
-                        str(int(round(leap - base_deltaT))) + ";" +
-                        format(UT1UTC, '.7f') + "\n")
+
+  output_index = np.arange (UT1UTC_start_jdn, UT1UTC_end_jdn) - \
+    (start_date + 1)
+  output_dates = UT1UTC_dates [output_index]
+  output_index = output_index [
+    (output_dates >= np.datetime64 (min_datetime, 'D')) &
+    (output_dates <= np.datetime64 (max_datetime, 'D'))]
+  output_leap = np.round (UT1UTC_leap [output_index] -
+                          base_deltaT).astype (np.int64)
+
+  # Write the table in chunks, to limit the memory used for text.
+  chunk_size = 65536
+  for chunk_start in range (0, len(output_index), chunk_size):
+    chunk_index = output_index [chunk_start:chunk_start + chunk_size]
+    UT1UTCfile.write ("".join (
+      ["%d;%d;%d;%d;%s;%d;%.7f\n" % the_row
+       for the_row in zip (UT1UTC_days [chunk_index].tolist(),
+                           UT1UTC_year [chunk_index].tolist(),
+                           UT1UTC_month [chunk_index].tolist(),
+                           UT1UTC_mday [chunk_index].tolist(),
+                           UT1UTC_source [chunk_index].tolist(),
+                           output_leap [chunk_start:
+                                        chunk_start + chunk_size].tolist(),
+                           UT1UTC_values [chunk_index].tolist())]))
   
   UT1UTCfile.close()
 
+  # Optionally, write the same table in binary form.  UT1-UTC is
+  # rounded the same way as in the CSV file, so the two agree.
+  if (do_UT1UTC_npz_output == 1):
+    npz_columns.write_npz_columns (UT1UTC_npz_output_file_name, {
+      "JDN": UT1UTC_days [output_index],
+      "Year": UT1UTC_year [output_index],
+      "Month": UT1UTC_month [output_index].astype (np.int8),
+      "Day": UT1UTC_mday [output_index].astype (np.int8),
+      "source": UT1UTC_source [output_index],
+      "leap": output_leap,
+      "UT1-UTC": np.char.mod ("%.7f", UT1UTC_values [output_index]).astype (
+        np.float64)})
+
 if (do_trace > 0):
   tracefile.close()
 
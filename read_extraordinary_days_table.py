@@ -31,6 +31,9 @@ import sys
 import re
 import hashlib
 import datetime
+import io
+import multiprocessing
+import gnuplot_pyramid
 from jdcal import gcal2jd, jd2gcal
 import pprint
 import argparse
@@ -49,7 +52,7 @@ parser = argparse.ArgumentParser (
 parser.add_argument ('input_file',
                      help='the table of extraordinary days')
 parser.add_argument ('--version', action='version', 
-                     version='read_extraordinary_days_table 3.0 2025-06-14',
+                     version='read_extraordinary_days_table 3.4 2026-10-19',
                      help='print the version number and exit')
 parser.add_argument ('--trace', metavar='trace_file',
                      help='write trace output to the specified file')
@@ -61,6 +64,13 @@ parser.add_argument ('--latex-end-jdn', metavar='latex_end_jdn',
                      help='latest date to put in table')
 parser.add_argument ('--gnuplot-output', metavar='gnuplot_output_file',
                      help='write data for plotting by gnuplot')
+parser.add_argument ('--gnuplot-pyramid', metavar='gnuplot_pyramid_prefix',
+                     help='write data for plotting by gnuplot at several ' +
+                     'resolutions, with an index for choosing among them')
+parser.add_argument ('--gnuplot-pyramid-pixels', type=int,
+                     metavar='pixels',
+                     help='width of the plots in pixels, used to decide ' +
+                     'how many resolutions to write')
 parser.add_argument ('--gnuplot-start-jdn', metavar='gnuplot_start_jdn',
                      help='earliest date to put in the plot')
 parser.add_argument ('--gnuplot-end-jdn', metavar='gnuplot_end_jdn',
@@ -71,8 +81,16 @@ parser.add_argument ('--c-start-jdn', metavar='c_start_jdn',
                      help='earliest date to put in the C file')
 parser.add_argument ('--c-end-jdn', metavar='c_end_jdn',
                      help='latest date to put in the C file')
+parser.add_argument ('--c-index-days', type=int, metavar='c_index_days',
+                     help='days covered by each entry of the C index, ' +
+                     'default is 365')
+parser.add_argument ('--c-delta-encode', action='store_true',
+                     help='delta encode the C table')
 parser.add_argument ('--checksum-file', metavar='checksum_file',
                      help='write a checksum line here if needed')
+parser.add_argument ('--jobs', type=int, metavar='number_of_jobs',
+                     help='check the table in this many parallel parts, ' +
+                     'default is 1')
 parser.add_argument ('--verbose', type=int, metavar='verbosity level',
                      help='control the amount of output from the program: ' +
                      '1 is normal, 0 suppresses summary messages')
@@ -86,6 +104,8 @@ latex_end_jdn = 0
 have_latex_start_jdn = 0
 have_latex_end_jdn = 0
 do_gnuplot_output = 0
+do_gnuplot_pyramid = 0
+gnuplot_pyramid_pixels = gnuplot_pyramid.default_pixels
 gnuplot_start_jdn = 0
 gnuplot_end_jdn = 0
 have_gnuplot_start_jdn = 0
@@ -95,6 +115,9 @@ c_start_jdn = 0
 c_end_jdn = 0
 have_c_start_jdn = 0
 have_c_end_jdn = 0
+c_index_days = 365
+do_c_delta_encode = 0
+number_of_jobs = 1
 verbosity_level = 1
 error_counter = 0
 
@@ -142,13 +165,20 @@ if (arguments ['gnuplot_output'] != None):
   do_gnuplot_output = 1
   gnuplot_output_file_name = arguments ['gnuplot_output']
 
+if (arguments ['gnuplot_pyramid'] != None):
+  do_gnuplot_pyramid = 1
+  gnuplot_pyramid_prefix = arguments ['gnuplot_pyramid']
+
+if (arguments ['gnuplot_pyramid_pixels'] != None):
+  gnuplot_pyramid_pixels = int(arguments ['gnuplot_pyramid_pixels'])
+
 if (arguments ['gnuplot_start_jdn'] != None):
   have_gnuplot_start_jdn = 1
   gnuplot_start_jdn = int(arguments ['gnuplot_start_jdn'])
 
 if (arguments ['gnuplot_end_jdn'] != None):
   have_gnuplot_end_jdn = 1
-  gnuplot_end_date = int(arguments ['gnuplot_end_jdn'])
+  gnuplot_end_jdn = int(arguments ['gnuplot_end_jdn'])
     
 if (arguments ['c_output'] != None):
   do_c_output = 1
@@ -160,77 +190,220 @@ if (arguments ['c_start_jdn'] != None):
 
 if (arguments ['c_end_jdn'] != None):
   have_c_end_jdn = 1
-  c_end_date = int(arguments ['c_end_jdn'])
+  c_end_jdn = int(arguments ['c_end_jdn'])
     
+if (arguments ['c_index_days'] != None):
+  c_index_days = max (1, int(arguments ['c_index_days']))
+
+if (arguments ['c_delta_encode']):
+  do_c_delta_encode = 1
+
+if (arguments ['jobs'] != None):
+  number_of_jobs = max (1, int(arguments ['jobs']))
+
 if (arguments ['verbose'] != None):
   verbosity_level = int(arguments ['verbose'])
 
 # Read the data file into memory.
 file_name = arguments ['input_file']
 infile = open (file_name, 'rb')
-# Read the file into memory as a list of byte strings.
-file_data = infile.readlines()
+file_bytes = infile.read()
 infile.close()
 
-# Classify each line as either an empty line, a symbol=value line, or a
-# data line.  Remember the value associated with each symbols and the data.
-line_number = 0
+# Subroutine to parse and check part of the data file.  The part starts
+# at byte offset start_offset, which is the start of line number
+# first_line_number, and ends just before byte offset end_offset.  Both
+# offsets are at line boundaries.  The checks which need the previous
+# data line are done only within the part; the caller is responsible
+# for checking the first data line of the part against the last data
+# line of the preceeding part.
+#
+# The messages are returned rather than printed, so that the parts can be
+# processed in parallel and the messages merged into the order in which
+# a sequential scan would have produced them.  Each message is a tuple
+# (line_number, order, kind, text), where order distinguishes messages
+# about the same line, and kind is "error" for an error message, which is
+# printed and counted, or "trace" for a line for the trace file.
+error_order_duplicate = 0
+error_order_sequence = 1
+error_order_DTAI = 2
+error_order_unrecognized = 3
+error_order_trace = 4
+
+def scan_chunk (start_offset, end_offset, first_line_number, trace_wanted):
+  messages = list()
+  symbols = list()
+  jdn_list = list()
+  lod_list = list()
+  DTAI_list = list()
+  line_number_list = list()
+  checksum_spans = list()
+  chunk_symbols = dict()
+  chunk_days = dict()
+  line_number = first_line_number - 1
+  line_offset = start_offset
+  previous_jdn = 0
+  previous_DTAI = 0
+  first_data_line = 1
+  chunk_bytes = file_bytes [start_offset:end_offset]
+  for byte_string in io.BytesIO (chunk_bytes).readlines():
+    # The file data is assumed to be coded as utf-8.  Decode it into Unicode.
+    line = byte_string.decode ('utf-8')
+    line_number = line_number + 1
+    line_start = line_offset
+    line_offset = line_offset + len(byte_string)
+    if (re.match ("^\\s*(#.*)?\n$", line)):
+      continue;                   #  ignore empty lines.
+    matchc = re.match ("^\\s*(?P<keyword>(\\w)+)\\s*=\\s*(?P<value>(\\w)+)\\s*(#.*)?\n$", line)
+    if (matchc):
+      # This line has the form keyword = value
+      keyword = matchc.groupdict () ['keyword']
+      value = matchc.groupdict() ['value']
+      if keyword in chunk_symbols:
+        messages.append ((line_number, error_order_duplicate, "error",
+                          "Keyword " + keyword + " seen more than once."))
+      chunk_symbols[keyword] = value
+      symbols.append ((line_number, keyword, value))
+      # The checksum does not include the checksum line.
+      if (keyword == "CHECKSUM"):
+        checksum_spans.append ((line_start, line_offset))
+      if (trace_wanted == 1):
+        messages.append ((line_number, error_order_trace, "trace",
+                          "Keyword " + keyword + "=" + value + "\n"))
+      continue
+
+    matchd = re.match ("^\\s*(?P<jdn>(\\d)+)\\s+(?P<lod>(\\d)+)\\s+(?P<DTAI>-?(\\d)+)\\s*(#.*)?\n$", line)
+    if (matchd):
+      # This line has the form julian_day_number DTAI
+      jdn = int(matchd.groupdict () ['jdn'])
+      lod = int(matchd.groupdict () ['lod'])
+      DTAI = int(matchd.groupdict () ['DTAI'])
+      if jdn in chunk_days:
+        messages.append ((line_number, error_order_duplicate, "error",
+                          "Julian Day Number " + str(jdn) +
+                          " seen more than once."))
+      if (first_data_line == 0):
+        if jdn < previous_jdn:
+          messages.append ((line_number, error_order_sequence, "error",
+                            "Julian Day Number " + str(jdn) +
+                            " out of order."))
+        if (abs(int(DTAI) - int(previous_DTAI)) != 1):
+          messages.append ((line_number, error_order_DTAI, "error",
+                            "At Julian Day Number " + str(jdn) +
+                            ", DTAI of " + str(DTAI) +
+                            " does not differ from the previous DTAI of " +
+                            str(previous_DTAI) + " by plus or minus 1." +
+                            "\n"))
+      chunk_days[jdn] = DTAI
+      jdn_list.append (jdn)
+      lod_list.append (lod)
+      DTAI_list.append (DTAI)
+      line_number_list.append (line_number)
+      previous_jdn = jdn
+      previous_DTAI = DTAI
+      first_data_line = 0
+      if (trace_wanted == 1):
+        messages.append ((line_number, error_order_trace, "trace",
+                          "At Julian Day Number " + str(jdn) +
+                          " DTAI was " + str(DTAI) + "." + "\n"))
+      continue
+
+    # This line is not recognized
+    messages.append ((line_number, error_order_unrecognized, "error",
+                      "Line " + str(line_number) + " is not recognized." +
+                      "\n" + line))
+
+  return (messages, symbols, jdn_list, lod_list, DTAI_list,
+          line_number_list, checksum_spans)
+
+# Divide the file into parts at line boundaries, one part per job.
+# Each part starts at the beginning of a line.
+chunk_starts = [0]
+for job_no in range (1, number_of_jobs):
+  probe_offset = (len(file_bytes) * job_no) // number_of_jobs
+  if (probe_offset <= chunk_starts [-1]):
+    continue
+  split_offset = file_bytes.find (b'\n', probe_offset - 1)
+  if (split_offset < 0):
+    break
+  split_offset = split_offset + 1
+  if ((split_offset > chunk_starts [-1]) and
+      (split_offset < len(file_bytes))):
+    chunk_starts.append (split_offset)
+chunk_ends = chunk_starts [1:] + [len(file_bytes)]
+chunk_arguments = list()
+for chunk_no in range (len(chunk_starts)):
+  first_line_number = file_bytes.count (b'\n', 0, chunk_starts [chunk_no]) + 1
+  chunk_arguments.append ((chunk_starts [chunk_no], chunk_ends [chunk_no],
+                           first_line_number, do_trace))
+
+if (len(chunk_arguments) > 1):
+  # The worker processes inherit the file data by forking, so the
+  # script is not re-executed in them.
+  with multiprocessing.get_context ("fork").Pool (
+      len(chunk_arguments)) as pool:
+    chunk_results = pool.starmap (scan_chunk, chunk_arguments)
+else:
+  chunk_results = [scan_chunk (*chunk_arguments [0])]
+
+# Stitch the parts together.  Check each part's first data line against
+# the last data line of the previous parts, check for keywords and Julian
+# Day Numbers which appear in more than one part, then report the
+# messages in line order.
+messages = list()
+checksum_spans = list()
 previous_jdn = 0
 previous_DTAI = 0
 first_data_line = 1
-
-for byte_string in file_data:
-# The file data is assumed to be coded as utf-8.  Decode it into Unicode.
-  line = byte_string.decode ('utf-8')
-  line_number = line_number + 1
-  if (re.match ("^\\s*(#.*)?\n$", line)):
-    continue;                   #  ignore empty lines.
-  matchc = re.match ("^\\s*(?P<keyword>(\\w)+)\\s*=\\s*(?P<value>(\\w)+)\\s*(#.*)?\n$", line)
-  if (matchc):
-    # This line has the form keyword = value
-    keyword = matchc.groupdict () ['keyword']
-    value = matchc.groupdict() ['value']
-    if keyword in symbol_values:
-      print ("Keyword " + keyword + " seen more than once.")
-      error_counter = error_counter + 1
-    symbol_values[keyword] = value;
-    if (do_trace == 1):
-      tracefile.write ("Keyword " + keyword + "=" + value + "\n")
+for (chunk_messages, chunk_symbols, jdn_list, lod_list, DTAI_list,
+     line_number_list, chunk_checksum_spans) in chunk_results:
+  messages.extend (chunk_messages)
+  checksum_spans.extend (chunk_checksum_spans)
+  previous_keywords = set(symbol_values.keys())
+  keywords_in_chunk = set()
+  for (line_number, keyword, value) in chunk_symbols:
+    # A repeat within the part has already been reported.
+    if ((keyword in previous_keywords) and
+        (keyword not in keywords_in_chunk)):
+      messages.append ((line_number, error_order_duplicate, "error",
+                        "Keyword " + keyword + " seen more than once."))
+    keywords_in_chunk.add (keyword)
+    symbol_values[keyword] = value
+  if (len(jdn_list) == 0):
     continue
-
-  matchd = re.match ("^\\s*(?P<jdn>(\\d)+)\\s+(?P<lod>(\\d)+)\\s+(?P<DTAI>-?(\\d)+)\\s*(#.*)?\n$", line)
-  if (matchd):
-    # This line has the form julian_day_number DTAI
-    jdn = int(matchd.groupdict () ['jdn'])
-    lod = int(matchd.groupdict () ['lod'])
-    DTAI = int(matchd.groupdict () ['DTAI'])
-    if jdn in extraordinary_days:
-      print ("Julian Day Number " + str(jdn) + " seen more than once.")
-      error_counter = error_counter + 1
-    if jdn < previous_jdn:
-      print ("Julian Day Number " + str(jdn) + " out of order.")
-      error_counter = error_counter + 1
-
-    if (first_data_line == 0):
-      if (abs(int(DTAI) - int(previous_DTAI)) != 1):
-        print ("At Julian Day Number " + str(jdn) + ", DTAI of " + str(DTAI) +
-               " does not differ from the previous DTAI of " +
-               str(previous_DTAI) + " by plus or minus 1." + "\n")
-        error_counter = error_counter + 1
-    day_length[int(jdn)] = lod
-    extraordinary_days[int(jdn)] = int(DTAI)
-    previous_jdn = jdn
-    previous_DTAI = DTAI
-    first_data_line = 0
-    if (do_trace == 1):
-      tracefile.write ("At Julian Day Number " + str(jdn) +
-                       " DTAI was " + str(DTAI) + "." + "\n")
-    continue
-
-  # This line is not recognized
-  print ("Line " + str(line_number) + " is not recognized.")
-  print (line)
-  error_counter = error_counter + 1
+  # Only the first appearance within the part needs reporting here;
+  # later appearances have already been reported.
+  for jdn in sorted(extraordinary_days.keys() & set(jdn_list)):
+    line_number = line_number_list [jdn_list.index (jdn)]
+    messages.append ((line_number, error_order_duplicate, "error",
+                      "Julian Day Number " + str(jdn) +
+                      " seen more than once."))
+  jdn = jdn_list [0]
+  DTAI = DTAI_list [0]
+  line_number = line_number_list [0]
+  if jdn < previous_jdn:
+    messages.append ((line_number, error_order_sequence, "error",
+                      "Julian Day Number " + str(jdn) + " out of order."))
+  if (first_data_line == 0):
+    if (abs(int(DTAI) - int(previous_DTAI)) != 1):
+      messages.append ((line_number, error_order_DTAI, "error",
+                        "At Julian Day Number " + str(jdn) +
+                        ", DTAI of " + str(DTAI) +
+                        " does not differ from the previous DTAI of " +
+                        str(previous_DTAI) + " by plus or minus 1." + "\n"))
+  day_length.update (zip (jdn_list, lod_list))
+  extraordinary_days.update (zip (jdn_list, DTAI_list))
+  previous_jdn = jdn_list [-1]
+  previous_DTAI = DTAI_list [-1]
+  first_data_line = 0
+
+messages.sort (key=lambda message: (message[0], message[1]))
+for (line_number, order, kind, text) in messages:
+  if (kind == "error"):
+    print (text)
+    error_counter = error_counter + 1
+  else:
+    tracefile.write (text)
 
 # Verify that the start, end and expiration dates are specified.
 # If the checksum is missing we will print the correct value and
@@ -301,19 +474,12 @@ if (error_counter == 0):
 # If there are still no errors, compute the checksum.
 if (error_counter == 0):
   hash_function = hashlib.new('sha256')
-  for byte_string in file_data:
-    # Don't include the checksum line.
-    omit_checksum = 0
-    line = byte_string.decode ('utf-8')
-    matchc = re.match ("^\\s*(?P<keyword>(\\w)+)\\s*=\\s*(?P<value>(\\w)+)\\s*(#.*)?\n$", line)
-    if (matchc):
-      # This line has the form keyword = value
-      keyword = matchc.groupdict () ['keyword']
-      value = matchc.groupdict() ['value']
-      if (keyword == "CHECKSUM"):
-        omit_checksum = 1
-    if (omit_checksum == 0):
-      hash_function.update (byte_string)
+  # Don't include the checksum line.
+  hash_offset = 0
+  for (span_start, span_end) in sorted(checksum_spans):
+    hash_function.update (file_bytes [hash_offset:span_start])
+    hash_offset = span_end
+  hash_function.update (file_bytes [hash_offset:])
   computed_checksum = hash_function.hexdigest()
   if ("CHECKSUM" in symbol_values):
     if (symbol_values ["CHECKSUM"] != computed_checksum):
@@ -370,8 +536,10 @@ if ((do_latex_output == 1) & (error_counter == 0)):
 # Here is another example: write a file that can be parsed and plotted
 # using gnuplot.  The plot will show the change in DTAI over time.
 #
-if ((do_gnuplot_output == 1) & (error_counter == 0)):
-  gnuplot_output_file = open (gnuplot_output_file_name, 'wt')
+if (((do_gnuplot_output == 1) or (do_gnuplot_pyramid == 1)) &
+    (error_counter == 0)):
+  gnuplot_x = list()
+  gnuplot_y = list()
   first_point_plotted = 0
   for extraordinary_day in sorted(extraordinary_days.keys()):
     if ((extraordinary_day >= gnuplot_start_jdn) and
@@ -379,15 +547,28 @@ if ((do_gnuplot_output == 1) & (error_counter == 0)):
       DTAI = extraordinary_days [extraordinary_day]
       if (first_point_plotted == 0):
         if (extraordinary_day > gnuplot_start_jdn):
-          gnuplot_output_file.write (str (gnuplot_start_jdn) + " " +
-                                     str (DTAI) + "\n")
+          gnuplot_x.append (gnuplot_start_jdn)
+          gnuplot_y.append (DTAI)
         first_point_plotted = 1
-      gnuplot_output_file.write (str (extraordinary_day) + " " +
-                                 str (DTAI) + "\n")
-
-  gnuplot_output_file.write (str (gnuplot_end_jdn) + " " +
-                             str (DTAI) + "\n")
-  gnuplot_output_file.close()
+      gnuplot_x.append (extraordinary_day)
+      gnuplot_y.append (DTAI)
+  gnuplot_x.append (gnuplot_end_jdn)
+  gnuplot_y.append (DTAI)
+
+  if (do_gnuplot_output == 1):
+    gnuplot_output_file = open (gnuplot_output_file_name, 'wt')
+    for (x_value, y_value) in zip (gnuplot_x, gnuplot_y):
+      gnuplot_output_file.write (str (x_value) + " " + str (y_value) + "\n")
+    gnuplot_output_file.close()
+
+  # The same data, at several resolutions, so a plot of a long span
+  # of time can use fewer points.
+  if (do_gnuplot_pyramid == 1):
+    level_count = gnuplot_pyramid.write_pyramid (gnuplot_pyramid_prefix,
+                                                 gnuplot_x, gnuplot_y,
+                                                 gnuplot_pyramid_pixels)
+    if (verbosity_level > 1):
+      print ("Wrote " + str(level_count) + " levels of gnuplot data.")
 
 #
 # In this example we write a file which can be used in a C program
@@ -396,38 +577,167 @@ if ((do_gnuplot_output == 1) & (error_counter == 0)):
 # Number of the day which starts (not ends, as in the above examples)
 # with a new value of DTAI, and that new DTAI value.
 #
+# So that a C program need not search the whole table, we also write
+# an index with one entry for every c_index_days days, starting at the
+# first date in the table.  Each index entry is the position in the table
+# of the last entry which starts on or before the first day covered by
+# that index entry.  A lookup therefore reads one index entry and then
+# scans forward over the few table entries which start within that
+# index entry's days.  The header file contains a lookup function which
+# does that.
+#
+# If requested, the table is delta encoded: each entry holds the number
+# of days since the previous entry and the change in DTAI, which fits in
+# a short.  The index entries then also hold the Julian Day Number and
+# DTAI of the table entry they refer to, so the scan can start there.
+#
 if ((do_c_output == 1) and (error_counter == 0)):
-  c_output_file = open (c_output_file_name + ".tab", 'wt')
+  c_entries = list()
   first_date_written = 0
-  number_of_entries = 0
   for extraordinary_day in sorted(extraordinary_days.keys()):
     if ((extraordinary_day >= c_start_jdn) and
         (extraordinary_day <= c_end_jdn)):
       DTAI = extraordinary_days [extraordinary_day]
       if (first_date_written == 0):
         if (extraordinary_day > c_start_jdn):
-          c_output_file.write (
-            "{" + str (c_start_jdn + 1) + ", " + str (DTAI) + "}, " +
-            "/* " + greg(c_start_jdn+1, " ") + " */\n")
+          c_entries.append ((c_start_jdn + 1, DTAI))
         first_date_written = 1
-        number_of_entries = number_of_entries + 1
+      c_entries.append ((extraordinary_day + 1, DTAI))
+  c_entries.append ((c_end_jdn, DTAI))
+  number_of_entries = len(c_entries)
+
+  # The delta encoding holds each difference in a short.  If any
+  # difference is too large for that, write the table unencoded.
+  if (do_c_delta_encode == 1):
+    largest_delta = max ([max (abs (c_entries [position][0] -
+                                    c_entries [position - 1][0]),
+                               abs (c_entries [position][1] -
+                                    c_entries [position - 1][1]))
+                          for position in range (1, number_of_entries)],
+                         default=0)
+    if (largest_delta > 32767):
+      print ("A difference of " + str(largest_delta) +
+             " does not fit in a short; the C table is not delta encoded.")
+      do_c_delta_encode = 0
+
+  c_output_file = open (c_output_file_name + ".tab", 'wt')
+  previous_entry_jdn = c_entries [0][0]
+  previous_entry_DTAI = c_entries [0][1]
+  for (entry_jdn, entry_DTAI) in c_entries:
+    if (do_c_delta_encode == 1):
+      c_output_file.write (
+        "{" + str (entry_jdn - previous_entry_jdn) + ", " +
+        str (entry_DTAI - previous_entry_DTAI) + "}, " +
+        "/* " + greg(entry_jdn, " ") + " */\n")
+    else:
       c_output_file.write (
-        "{" + str (extraordinary_day+1) + ", " + str (DTAI) + "}, " +
-        "/* " + greg(extraordinary_day+1, " ") + " */\n")
-      number_of_entries = number_of_entries + 1
+        "{" + str (entry_jdn) + ", " + str (entry_DTAI) + "}, " +
+        "/* " + greg(entry_jdn, " ") + " */\n")
+    previous_entry_jdn = entry_jdn
+    previous_entry_DTAI = entry_DTAI
+  c_output_file.close()
 
-  c_output_file.write (
-    "{" + str (c_end_jdn) + ", " + str (DTAI) + "}, " +
-    "/* " + greg(c_end_jdn, " ") + " */\n")
-  number_of_entries = number_of_entries + 1
+  #
+  # Write the index.
+  #
+  c_index_base_jdn = c_entries [0][0]
+  c_index_count = ((c_entries [-1][0] - c_index_base_jdn) //
+                   c_index_days) + 1
+  c_output_file = open (c_output_file_name + ".idx", 'wt')
+  entry_position = 0
+  for index_position in range (c_index_count):
+    index_jdn = c_index_base_jdn + (index_position * c_index_days)
+    while ((entry_position + 1 < number_of_entries) and
+           (c_entries [entry_position + 1][0] <= index_jdn)):
+      entry_position = entry_position + 1
+    if (do_c_delta_encode == 1):
+      c_output_file.write (
+        "{" + str (entry_position) + ", " +
+        str (c_entries [entry_position][0]) + ", " +
+        str (c_entries [entry_position][1]) + "}, " +
+        "/* " + greg(index_jdn, " ") + " */\n")
+    else:
+      c_output_file.write (
+        str (entry_position) + ", " +
+        "/* " + greg(index_jdn, " ") + " */\n")
   c_output_file.close()
 
   #
-  # Also write a header file giving the size of the table.
+  # Also write a header file giving the size of the table and the index,
+  # and a function to look up DTAI.
   #
   c_output_file = open (c_output_file_name + ".h", 'wt')
   c_output_file.write (
     "#define DTAI_ENTRY_COUNT " + str(number_of_entries) + "\n")
+  c_output_file.write (
+    "#define DTAI_INDEX_COUNT " + str(c_index_count) + "\n" +
+    "#define DTAI_INDEX_BASE_JDN " + str(c_index_base_jdn) + "\n" +
+    "#define DTAI_INDEX_DAYS " + str(c_index_days) + "\n" +
+    "#define DTAI_DELTA_ENCODED " + str(do_c_delta_encode) + "\n")
+  if (do_c_delta_encode == 1):
+    c_output_file.write ("""
+/* Return the value of DTAI at the start of the day with the specified
+ * Julian Day Number, using a table initialized from the .tab file and
+ * an index initialized from the .idx file:
+ *   static const short dtai_table[DTAI_ENTRY_COUNT][2] = {
+ *   #include "<name>.tab"
+ *   };
+ *   static const long dtai_index[DTAI_INDEX_COUNT][3] = {
+ *   #include "<name>.idx"
+ *   };
+ * Dates outside the table get the DTAI of the nearest end.  */
+static inline long
+dtai_lookup (const short table[][2], const long index[][3], long jdn)
+{
+  long bucket, position, entry_jdn, entry_DTAI;
+
+  bucket = (jdn - DTAI_INDEX_BASE_JDN) / DTAI_INDEX_DAYS;
+  if (jdn < DTAI_INDEX_BASE_JDN)
+    bucket = 0;
+  if (bucket >= DTAI_INDEX_COUNT)
+    bucket = DTAI_INDEX_COUNT - 1;
+  position = index[bucket][0];
+  entry_jdn = index[bucket][1];
+  entry_DTAI = index[bucket][2];
+  while ((position + 1 < DTAI_ENTRY_COUNT)
+         && (entry_jdn + table[position + 1][0] <= jdn))
+    {
+      position = position + 1;
+      entry_jdn = entry_jdn + table[position][0];
+      entry_DTAI = entry_DTAI + table[position][1];
+    }
+  return entry_DTAI;
+}
+""")
+  else:
+    c_output_file.write ("""
+/* Return the value of DTAI at the start of the day with the specified
+ * Julian Day Number, using a table initialized from the .tab file and
+ * an index initialized from the .idx file:
+ *   static const long dtai_table[DTAI_ENTRY_COUNT][2] = {
+ *   #include "<name>.tab"
+ *   };
+ *   static const long dtai_index[DTAI_INDEX_COUNT] = {
+ *   #include "<name>.idx"
+ *   };
+ * Dates outside the table get the DTAI of the nearest end.  */
+static inline long
+dtai_lookup (const long table[][2], const long index[], long jdn)
+{
+  long bucket, position;
+
+  bucket = (jdn - DTAI_INDEX_BASE_JDN) / DTAI_INDEX_DAYS;
+  if (jdn < DTAI_INDEX_BASE_JDN)
+    bucket = 0;
+  if (bucket >= DTAI_INDEX_COUNT)
+    bucket = DTAI_INDEX_COUNT - 1;
+  position = index[bucket];
+  while ((position + 1 < DTAI_ENTRY_COUNT)
+         && (table[position + 1][0] <= jdn))
+    position = position + 1;
+  return table[position][1];
+}
+""")
   c_output_file.close()
 
 if (do_trace == 1):
@@ -0,0 +1,554 @@
+#!/usr/bin/python3
+# -*- coding: utf-8
+#
+# run_pipeline builds extraordinary_days.dat and the files it needs,
+# running each step of the build as a child of one Python process.
+
+#   Copyright © 2026 by John Sauter <John_Sauter@systemeyescomputerstore.com>
+
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+#   The author's contact information is as follows:
+#     John Sauter
+#     System Eyes Computer Store
+#     20A Northwest Blvd.  Ste 345
+#     Nashua, NH  03063-4066
+#     telephone: (603) 424-1188
+#     e-mail: John_Sauter@systemeyescomputerstore.com
+
+#
+# Each step of the build names the program it runs, its arguments, and
+# the files it reads and writes.  In the arguments, "src:name" is a
+# file in the source directory, "in:name" is a file written by another
+# step, "out:name" is a file written by this step, and "prefix:name"
+# begins the names of several files written by this step.  A step may
+# run once every step that writes one of its "in:" files has finished,
+# so steps which do not depend on each other run at the same time.
+#
+# numpy, scipy, pandas and jdcal are imported once, before any step
+# starts.  Each step runs its program in a process forked from this
+# one, so it does not import them again.  The programs which read the
+# finished table are combined into one step, so the table is parsed
+# only once.
+#
+# A step writes its files into a temporary directory.  Only when it
+# succeeds are they moved into the build directory, so an interrupted
+# or failed step leaves the previous files in place.
+#
+# The state file records, for each step, a hash of its program, its
+# arguments and the files it reads.  A step whose hash has not changed
+# since it last succeeded, and whose files are all present, is skipped,
+# unless the step is marked to be run always.
+#
+
+import sys
+import os
+import hashlib
+import json
+import tempfile
+import shutil
+import subprocess
+import runpy
+import traceback
+import io
+import gc
+import multiprocessing
+import multiprocessing.connection
+import argparse
+
+parser = argparse.ArgumentParser (
+  formatter_class=argparse.RawDescriptionHelpFormatter,
+  description='Build extraordinary_days.dat and the files it needs.',
+  epilog='Copyright © 2026 by John Sauter' + '\n' +
+  'License GPL3+: GNU GPL version 3 or later; ' + '\n' +
+  'see <http://gnu.org/licenses/gpl.html> for the full text ' +
+  'of the license.' + '\n' +
+  'This is free software: you are free to change and redistribute it. ' +
+  '\n' +
+  'There is NO WARRANTY, to the extent permitted by law. ' + '\n' + '\n'
+  'The targets are the files to build; the default is all of them. ' +
+  '\n')
+parser.add_argument ('targets', nargs='*', metavar='target',
+                     help='a file to build, with the files it needs')
+parser.add_argument ('--version', action='version',
+                     version='run_pipeline 1.3 2026-10-19',
+                     help='print the version number and exit')
+parser.add_argument ('--srcdir', metavar='source_directory',
+                     help='directory holding the programs and source ' +
+                     'files, default is the directory of this program')
+parser.add_argument ('--builddir', metavar='build_directory',
+                     help='directory to write the files into, ' +
+                     'default is the current directory')
+parser.add_argument ('--jobs', type=int, metavar='jobs',
+                     help='number of steps to run at the same time, ' +
+                     'default is the number of processors')
+parser.add_argument ('--state-file', metavar='state_file',
+                     help='file holding the hashes of the steps, ' +
+                     'default is pipeline_state.json in the build directory')
+parser.add_argument ('--force', action='store_true',
+                     help='run every step, even if its inputs have not ' +
+                     'changed')
+parser.add_argument ('--list', action='store_true',
+                     help='list the steps and exit')
+parser.add_argument ('--verbose', type=int, metavar='verbosity level',
+                     help='control the amount of output from the program: ' +
+                     '1 is normal, 0 suppresses summary messages')
+
+verbosity_level = 1
+error_counter = 0
+
+#
+# The steps of the build, in the order of the Makefile.
+#
+# "script" is the program to run and "arguments" its arguments.
+# "concatenate" instead lists files to be joined into the first output.
+# "modules" lists other source files the program imports.
+# "outputs" lists files written other than by an "out:" argument.
+# "stdout" names a file to hold what the program prints.
+# "previous" lists outputs whose old versions are kept as name_previous.
+# "compare" is a shell script to run after the old versions are kept.
+# "always" marks a step which is run every time, because what it
+# reports depends on more than its inputs, such as today's date.
+#
+steps = [
+  {"name": "exdays_05",
+   "script": "read_delta_t.py",
+   "modules": ["gnuplot_pyramid.py", "npz_columns.py"],
+   "arguments": ["src:values_of_delta_T.csv", "out:exdays_05.dat",
+                 "--latex-output", "out:IERS_delta_t.tex",
+                 "--csv-output", "out:delta_T.csv",
+                 "--csv-npz-output", "out:delta_T.npz",
+                 "--IERS-final=", "src:finals.all.csv",
+                 "--Tony-Finch-leaps", "--IERS-leaps",
+                 "--UT1UTC-output=", "out:UT1UTC.csv",
+                 "--UT1UTC-start-jdn=2305814",
+                 "--UT1UTC-npz-output=", "out:UT1UTC.npz",
+                 "--USNO-delta-t=", "src:USNO_delta_T.csv",
+                 "--IERS-Bulletin-A=", "src:ser7.dat",
+                 "--IERS-projection-days=0"],
+   "previous": ["exdays_05.dat", "UT1UTC.csv"],
+   "compare": "do_compare.sh"},
+  {"name": "delta_t",
+   "script": "reformat_delta_t.py",
+   "arguments": ["src:values_of_delta_T.csv", "out:delta_t.tex"]},
+  {"name": "exdays_02",
+   "script": "parse_bulletin_C.py",
+   "modules": ["bulletin_parsers.py"],
+   "arguments": ["src:bulletinc.dat",
+                 "--expiration-date-file=", "out:exdays_02.dat"]},
+  {"name": "exdays",
+   "concatenate": ["src:exdays_01.dat", "in:exdays_02.dat",
+                   "src:exdays_04.dat", "in:exdays_05.dat"],
+   "outputs": ["exdays.dat"]},
+  {"name": "exdays_03",
+   "script": "read_extraordinary_days_table.py",
+   "modules": ["gnuplot_pyramid.py"],
+   "arguments": ["in:exdays.dat", "--checksum-file=", "out:exdays_03.dat"]},
+  {"name": "extraordinary_days",
+   "concatenate": ["src:exdays_01.dat", "in:exdays_02.dat",
+                   "in:exdays_03.dat", "src:exdays_04.dat",
+                   "in:exdays_05.dat"],
+   "outputs": ["extraordinary_days.dat"]},
+  {"name": "next_leap_second",
+   "script": "find_next_leap_second.py",
+   "modules": ["npz_columns.py"],
+   "arguments": ["in:UT1UTC.csv"],
+   "inputs": ["in:UT1UTC.npz", "in:extraordinary_days.dat"],
+   "always": True},
+  {"name": "table_outputs",
+   "script": "read_extraordinary_days_table.py",
+   "modules": ["gnuplot_pyramid.py"],
+   "arguments": ["in:extraordinary_days.dat",
+                 "--latex-output", "out:extraordinary_days.tex",
+                 "--latex-start", "2341972", "--latex-end", "2488070",
+                 "--gnuplot-output", "out:gnuplot.dat",
+                 "--gnuplot-pyramid", "prefix:gnuplot_pyramid"],
+   "outputs": ["gnuplot_pyramid.gnuplot"],
+   "stdout": "check_output.txt"},
+  {"name": "set_xtics_monthly",
+   "script": "build_xtic_monthly_labels.py",
+   "arguments": ["--output", "1", "out:set_xtics_001mo.gnuplot",
+                 "--output", "2", "out:set_xtics_002mo.gnuplot",
+                 "--output", "3", "out:set_xtics_003mo.gnuplot",
+                 "--output", "4", "out:set_xtics_004mo.gnuplot",
+                 "--output", "6", "out:set_xtics_006mo.gnuplot",
+                 "--output", "12", "out:set_xtics_012mo.gnuplot"]},
+  {"name": "set_xtics_yearly",
+   "script": "build_xtic_labels.py",
+   "arguments": ["--output", "1", "out:set_xtics_001yr.gnuplot",
+                 "--output", "2", "out:set_xtics_002yr.gnuplot",
+                 "--output", "3", "out:set_xtics_003yr.gnuplot",
+                 "--output", "4", "out:set_xtics_004yr.gnuplot",
+                 "--output", "5", "out:set_xtics_005yr.gnuplot",
+                 "--output", "6", "out:set_xtics_006yr.gnuplot",
+                 "--output", "7", "out:set_xtics_007yr.gnuplot",
+                 "--output", "8", "out:set_xtics_008yr.gnuplot",
+                 "--output", "9", "out:set_xtics_009yr.gnuplot",
+                 "--output", "10", "out:set_xtics_010yr.gnuplot",
+                 "--output", "15", "out:set_xtics_015yr.gnuplot",
+                 "--output", "20", "out:set_xtics_020yr.gnuplot",
+                 "--output", "25", "out:set_xtics_025yr.gnuplot",
+                 "--output", "30", "out:set_xtics_030yr.gnuplot",
+                 "--output", "50", "out:set_xtics_050yr.gnuplot",
+                 "--output", "100", "out:set_xtics_100yr.gnuplot",
+                 "--output", "200", "out:set_xtics_200yr.gnuplot",
+                 "--output", "500", "out:set_xtics_500yr.gnuplot"]}]
+
+# Subroutine to split a file reference into its kind and name.
+def split_reference (reference):
+  for kind in ("src:", "in:", "out:", "prefix:"):
+    if (reference.startswith (kind)):
+      return (kind, reference [len(kind):])
+  return (None, reference)
+
+# Subroutine to list the files a step reads, as references.
+def step_inputs (step):
+  references = list()
+  for reference in (step.get ("arguments", list()) +
+                    step.get ("concatenate", list()) +
+                    step.get ("inputs", list())):
+    (kind, name) = split_reference (reference)
+    if (kind in ("src:", "in:")):
+      references.append (reference)
+  return (references)
+
+# Subroutine to list the files a step writes.
+def step_outputs (step):
+  names = list()
+  for reference in step.get ("arguments", list()):
+    (kind, name) = split_reference (reference)
+    if (kind == "out:"):
+      names.append (name)
+  names = names + step.get ("outputs", list())
+  if ("stdout" in step):
+    names.append (step ["stdout"])
+  return (names)
+
+# Subroutine to find the path of a file reference.  Outputs are
+# written to the step's temporary directory.
+def reference_path (reference, work_directory):
+  (kind, name) = split_reference (reference)
+  if (kind == "src:"):
+    return (os.path.join (source_directory, name))
+  if (kind == "in:"):
+    return (os.path.join (build_directory, name))
+  if (kind in ("out:", "prefix:")):
+    return (os.path.join (work_directory, name))
+  return (name)
+
+# Subroutine to build the command line of a step.  An option ending
+# in "=" is joined to the file name which follows it.
+def step_command_line (step, work_directory):
+  command_line = list()
+  join_next = 0
+  for argument in step ["arguments"]:
+    value = reference_path (argument, work_directory)
+    if (join_next == 1):
+      command_line [-1] = command_line [-1] + value
+    else:
+      command_line.append (value)
+    join_next = int(argument.endswith ("="))
+  return (command_line)
+
+# Subroutine to compute the hash of a step: its program, the modules it
+# imports, its arguments and the contents of the files it reads.
+def step_hash (step):
+  the_hash = hashlib.sha256 ()
+  the_hash.update (json.dumps (step, sort_keys=True).encode ('utf-8'))
+  files = list()
+  if ("script" in step):
+    files.append (os.path.join (source_directory, step ["script"]))
+  for module in step.get ("modules", list()):
+    files.append (os.path.join (source_directory, module))
+  for reference in step_inputs (step):
+    files.append (reference_path (reference, None))
+  for file_name in files:
+    the_hash.update (os.path.basename (file_name).encode ('utf-8'))
+    if (not os.path.exists (file_name)):
+      the_hash.update (b"missing")
+      continue
+    with open (file_name, 'rb') as the_file:
+      for block in iter (lambda: the_file.read (1 << 20), b""):
+        the_hash.update (block)
+  return (the_hash.hexdigest ())
+
+# Subroutine run in the child process to perform a step.  What the
+# program prints goes to a log file in the temporary directory, except
+# that for a step with a "stdout" file its standard output goes there
+# and only its standard error goes to the log.
+def run_step (step, work_directory, output_name, log_name):
+  log_file = open (log_name, 'wt')
+  stdout_file = log_file
+  if (output_name != log_name):
+    stdout_file = open (output_name, 'wt')
+  sys.stdout = stdout_file
+  sys.stderr = log_file
+  exit_code = 0
+  try:
+    if ("concatenate" in step):
+      output_name = os.path.join (work_directory, step ["outputs"][0])
+      with open (output_name, 'wb') as output_file:
+        for reference in step ["concatenate"]:
+          with open (reference_path (reference, None), 'rb') as input_file:
+            shutil.copyfileobj (input_file, output_file)
+    else:
+      script_name = os.path.join (source_directory, step ["script"])
+      sys.argv = [script_name] + step_command_line (step, work_directory)
+      sys.path [0] = source_directory
+      runpy.run_path (script_name, run_name='__main__')
+  except SystemExit as exit_status:
+    if (isinstance (exit_status.code, int)):
+      exit_code = exit_status.code
+    elif (exit_status.code != None):
+      print (exit_status.code, file=sys.stderr)
+      exit_code = 1
+  except BaseException:
+    traceback.print_exc ()
+    exit_code = 1
+  # The child ends without the usual cleanup, so flush any files the
+  # program left open.
+  for the_object in gc.get_objects ():
+    if (isinstance (the_object, io.IOBase) and (not the_object.closed)):
+      try:
+        the_object.flush ()
+      except Exception:
+        pass
+  stdout_file.flush ()
+  log_file.flush ()
+  os._exit (exit_code)
+
+# Subroutine to move the files written by a step into the build
+# directory.  os.replace makes each file appear all at once.
+def install_outputs (step, work_directory):
+  for name in step.get ("previous", list()):
+    final_name = os.path.join (build_directory, name)
+    if (os.path.exists (final_name)):
+      (root, extension) = os.path.splitext (final_name)
+      os.replace (final_name, root + "_previous" + extension)
+  for name in sorted (os.listdir (work_directory)):
+    if (name.startswith (".")):
+      continue
+    os.replace (os.path.join (work_directory, name),
+                os.path.join (build_directory, name))
+  return
+
+# Subroutine to write the state file, replacing it all at once.
+def write_state (state):
+  temporary_name = state_file_name + ".tmp"
+  with open (temporary_name, 'wt') as state_file:
+    json.dump (state, state_file, indent=1, sort_keys=True)
+    state_file.write ("\n")
+  os.replace (temporary_name, state_file_name)
+  return
+
+#
+# Parse the command line.
+#
+
+arguments = parser.parse_args ()
+arguments = vars(arguments)
+
+source_directory = os.path.dirname (os.path.abspath (__file__))
+if (arguments ['srcdir'] != None):
+  source_directory = os.path.abspath (arguments ['srcdir'])
+
+build_directory = os.getcwd ()
+if (arguments ['builddir'] != None):
+  build_directory = os.path.abspath (arguments ['builddir'])
+
+jobs = os.cpu_count ()
+if (arguments ['jobs'] != None):
+  jobs = max (1, int(arguments ['jobs']))
+
+state_file_name = os.path.join (build_directory, "pipeline_state.json")
+if (arguments ['state_file'] != None):
+  state_file_name = arguments ['state_file']
+
+if (arguments ['verbose'] != None):
+  verbosity_level = int(arguments ['verbose'])
+
+#
+# Find which step writes each file.
+#
+producer = dict()
+for step in steps:
+  for name in step_outputs (step):
+    producer [name] = step ["name"]
+step_named = dict()
+for step in steps:
+  step_named [step ["name"]] = step
+
+# Subroutine to list the steps which write the files a step reads.
+def step_producers (step):
+  names = list()
+  for reference in step_inputs (step):
+    (kind, name) = split_reference (reference)
+    if ((kind == "in:") and (name in producer) and
+        (producer [name] not in names)):
+      names.append (producer [name])
+  return (names)
+
+if (arguments ['list']):
+  for step in steps:
+    print (step ["name"] + ": " + " ".join (step_outputs (step)))
+    producers = step_producers (step)
+    if (len(producers) > 0):
+      print ("  after " + ", ".join (producers))
+  sys.exit (0)
+
+#
+# Select the steps needed for the targets, with the steps they need.
+#
+wanted = set()
+to_visit = list()
+if (len(arguments ['targets']) == 0):
+  to_visit = [step ["name"] for step in steps]
+for target in arguments ['targets']:
+  target_name = os.path.basename (target)
+  if (target_name in step_named):
+    to_visit.append (target_name)
+  elif (target_name in producer):
+    to_visit.append (producer [target_name])
+  else:
+    print ("No step builds " + target + ".")
+    error_counter = error_counter + 1
+while (len(to_visit) > 0):
+  step_name = to_visit.pop ()
+  if (step_name not in wanted):
+    wanted.add (step_name)
+    to_visit.extend (step_producers (step_named [step_name]))
+if (error_counter > 0):
+  sys.exit (1)
+
+state = dict()
+if (os.path.exists (state_file_name)):
+  with open (state_file_name, 'rt') as state_file:
+    state = json.load (state_file)
+
+# The modules the programs share are imported here, once, so that each
+# forked child starts with them already loaded.
+import numpy
+import pandas
+import scipy.interpolate
+import jdcal
+
+#
+# Run the steps.  A step is started once the steps which write its
+# inputs have finished; a step whose inputs are unchanged is skipped.
+#
+fork_context = multiprocessing.get_context ('fork')
+pending = [step for step in steps if (step ["name"] in wanted)]
+running = dict()
+finished = set()
+failed = set()
+
+while ((len(pending) > 0) or (len(running) > 0)):
+  started = 1
+  while (started == 1):
+    started = 0
+    for step in list(pending):
+      producers = step_producers (step)
+      if (any ([(name in failed) for name in producers])):
+        print ("Not running " + step ["name"] +
+               " because a step before it failed.")
+        pending.remove (step)
+        failed.add (step ["name"])
+        started = 1
+        continue
+      if (not all ([(name in finished) for name in producers])):
+        continue
+      the_hash = step_hash (step)
+      outputs_present = all ([os.path.exists (os.path.join (build_directory,
+                                                            name))
+                              for name in step_outputs (step)])
+      if ((not arguments ['force']) and (not step.get ("always", False)) and
+          outputs_present and (state.get (step ["name"]) == the_hash)):
+        if (verbosity_level > 1):
+          print ("Skipping " + step ["name"] + ", its inputs are unchanged.")
+        pending.remove (step)
+        finished.add (step ["name"])
+        started = 1
+        continue
+      if (len(running) >= jobs):
+        break
+      work_directory = tempfile.mkdtemp (prefix="." + step ["name"] + "_",
+                                         dir=build_directory)
+      log_name = os.path.join (work_directory, ".log")
+      output_name = log_name
+      if ("stdout" in step):
+        output_name = os.path.join (work_directory, step ["stdout"])
+      if (verbosity_level > 0):
+        print ("Running " + step ["name"] + ".")
+      sys.stdout.flush ()
+      process = fork_context.Process (target=run_step,
+                                      args=(step, work_directory,
+                                            output_name, log_name))
+      process.start ()
+      running [process.sentinel] = (step, process, work_directory,
+                                    output_name, log_name, the_hash)
+      pending.remove (step)
+      started = 1
+
+  if (len(running) == 0):
+    if (len(pending) > 0):
+      print ("Steps " + ", ".join ([step ["name"] for step in pending]) +
+             " cannot be run.")
+      error_counter = error_counter + 1
+    break
+
+  for sentinel in multiprocessing.connection.wait (list(running.keys())):
+    (step, process, work_directory, output_name, log_name,
+     the_hash) = running.pop (sentinel)
+    process.join ()
+    # Show what the step printed: its standard output, if that went to
+    # a file of its own, followed by the log.
+    log_text = ""
+    for file_name in dict.fromkeys ((output_name, log_name)):
+      if (os.path.exists (file_name)):
+        with open (file_name, 'rt') as log_file:
+          log_text = log_text + log_file.read ()
+    if (len(log_text) > 0):
+      print (step ["name"] + ":")
+      print (log_text, end="")
+    missing = [name for name in step_outputs (step)
+               if (not os.path.exists (os.path.join (work_directory, name)))]
+    if ((process.exitcode == 0) and (len(missing) == 0)):
+      install_outputs (step, work_directory)
+      state [step ["name"]] = the_hash
+      write_state (state)
+      finished.add (step ["name"])
+      if ("compare" in step):
+        previous_names = [os.path.join (build_directory,
+                                        os.path.splitext (name) [0] +
+                                        "_previous" +
+                                        os.path.splitext (name) [1])
+                          for name in step.get ("previous", list())]
+        if (all ([os.path.exists (name) for name in previous_names])):
+          subprocess.run (["bash", os.path.join (source_directory,
+                                                 step ["compare"]),
+                           source_directory],
+                          cwd=build_directory)
+    else:
+      if (len(missing) > 0):
+        print (step ["name"] + " did not write " + ", ".join (missing) + ".")
+      print (step ["name"] + " failed.")
+      failed.add (step ["name"])
+      error_counter = error_counter + 1
+    shutil.rmtree (work_directory, ignore_errors=True)
+
+if (error_counter > 0):
+  print ("Encountered " + str(error_counter) + " errors.")
+  sys.exit (1)
+
+# End of file run_pipeline.py
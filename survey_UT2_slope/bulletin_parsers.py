@@ -0,0 +1 @@
+../bulletin_parsers.py
\ No newline at end of file
@@ -0,0 +1,302 @@
+#!/usr/bin/python3
+# -*- coding: utf-8
+#
+# fetch_bulletins downloads IERS Bulletins A and D, several at a time,
+# over connections which are kept open from one bulletin to the next.
+#
+#   Copyright © 2026 by John Sauter <John_Sauter@systemeyescomputerstore.com>
+
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+#   The author's contact information is as follows:
+#     John Sauter
+#     System Eyes Computer Store
+#     20A Northwest Blvd.  Ste 345
+#     Nashua, NH  03063-4066
+#     telephone: (603) 424-1188
+#     e-mail: John_Sauter@systemeyescomputerstore.com
+
+import os
+import json
+import datetime
+import threading
+import http.client
+import urllib.parse
+import email.utils
+import concurrent.futures
+import argparse
+
+parser = argparse.ArgumentParser (
+  formatter_class=argparse.RawDescriptionHelpFormatter,
+  description='Download IERS Bulletins A and D',
+  epilog='Copyright © 2026 by John Sauter' + '\n' +
+  'License GPL3+: GNU GPL version 3 or later; ' + '\n' +
+  'see <http://gnu.org/licenses/gpl.html> for the full text ' +
+  'of the license.' + '\n' +
+  'This is free software: you are free to change and redistribute it. ' +
+  '\n' +
+  'There is NO WARRANTY, to the extent permitted by law. ' + '\n' + '\n'
+  'A bulletin already downloaded is requested again only if it has ' +
+  'changed on the server.  The manifest file remembers the bulletins ' +
+  'which the server does not have, so they are not requested on ' +
+  'every run.' + '\n')
+parser.add_argument ('--bulletin-A-directory', metavar='directory',
+                     default='Bulletin_A',
+                     help='directory to hold the Bulletin A files; ' +
+                     'default Bulletin_A')
+parser.add_argument ('--bulletin-D-directory', metavar='directory',
+                     default='Bulletin_D',
+                     help='directory to hold the Bulletin D files; ' +
+                     'default Bulletin_D')
+parser.add_argument ('--base-url', metavar='URL',
+                     default='https://datacenter.iers.org/data',
+                     help='where the IERS keeps its bulletins; ' +
+                     'default https://datacenter.iers.org/data')
+parser.add_argument ('--manifest-file', metavar='manifest_file',
+                     help='remember, in the specified file, what is ' +
+                     'known about each bulletin from one run to the next')
+parser.add_argument ('--missing-days', type=int, metavar='days', default=7,
+                     help='ask again for a bulletin the server did not ' +
+                     'have after this many days; default 7')
+parser.add_argument ('--jobs', type=int, metavar='N', default=8,
+                     help='download up to N bulletins at a time; default 8')
+parser.add_argument ('--timeout', type=float, metavar='seconds', default=60,
+                     help='give up on a request after this many seconds; ' +
+                     'default 60')
+parser.add_argument ('--version', action='version',
+                     version='fetch_bulletins 1.0 2026-10-19',
+                     help='print the version number and exit')
+parser.add_argument ('--trace', metavar='trace_file',
+                     help='write trace output to the specified file')
+parser.add_argument ('--verbose', type=int, metavar='verbosity level',
+                     help='control the amount of output from the program: ' +
+                     '1 is normal, 0 suppresses summary messages, ' +
+                     '2 reports each bulletin')
+
+do_trace = 0
+tracefile = ""
+verbosity_level = 1
+error_counter = 0
+
+# Parse the command line.
+arguments = parser.parse_args ()
+arguments = vars(arguments)
+
+if (arguments ['trace'] != None):
+  do_trace = 1
+  trace_file_name = arguments ['trace']
+  tracefile = open (trace_file_name, 'wt')
+
+if (arguments ['verbose'] != None):
+  verbosity_level = arguments ['verbose']
+
+base_url = arguments ['base_url'].rstrip ('/')
+timeout = arguments ['timeout']
+today = datetime.date.today()
+
+# The IERS stores historical issues of Bulletin A on their web site,
+# with URLs containing the volume number in roman numerals.
+# Some years have 53 weeks.  Bulletin D is simply numbered.
+bulletins = list()
+for yearcode in ('xviii', 'xix', 'xx', 'xxi', 'xxii', 'xxiii', 'xxiv',
+                 'xxv', 'xxvi', 'xxvii', 'xxviii', 'xxix', 'xxx',
+                 'xxxi', 'xxxii', 'xxxiii', 'xxxiv', 'xxxv', 'xxxvi',
+                 'xxxvii', 'xxxviii', 'xxxix', 'xl'):
+  for weekcode in range (1, 54):
+    bulletin_name = 'bulletina-' + yearcode + '-' + str(weekcode).zfill(3)
+    bulletins.append ((base_url + '/6/' + bulletin_name + '.txt',
+                       os.path.join (arguments ['bulletin_A_directory'],
+                                     bulletin_name + '.txt')))
+for bulletin_number in range (1, 200):
+  bulletin_name = 'bulletind-' + str(bulletin_number).zfill(3)
+  bulletins.append ((base_url + '/17/' + bulletin_name + '.txt',
+                     os.path.join (arguments ['bulletin_D_directory'],
+                                   bulletin_name + '.txt')))
+
+# The manifest holds the ETag and Last-Modified date of each bulletin
+# downloaded, and the date on which each missing bulletin was last
+# asked for.
+manifest = {'format_version': 1, 'files': dict(), 'missing': dict()}
+if (arguments ['manifest_file'] != None):
+  manifest_file_name = arguments ['manifest_file']
+  if (os.path.exists (manifest_file_name)):
+    with open (manifest_file_name, 'rt') as manifest_file:
+      saved_manifest = json.load (manifest_file)
+    if (saved_manifest.get ('format_version') == 1):
+      manifest = saved_manifest
+
+# Each thread keeps one connection open to each server it talks to.
+# A bulletin may be redirected to another server.
+connections = threading.local()
+
+# Subroutine to get the connection for a URL, opening it if need be.
+def get_connection (url_parts):
+  if (not hasattr (connections, 'pool')):
+    connections.pool = dict()
+  pool_key = (url_parts.scheme, url_parts.netloc)
+  if (pool_key not in connections.pool):
+    if (url_parts.scheme == 'https'):
+      connection = http.client.HTTPSConnection (url_parts.netloc,
+                                                timeout=timeout)
+    else:
+      connection = http.client.HTTPConnection (url_parts.netloc,
+                                               timeout=timeout)
+    connections.pool [pool_key] = connection
+  return (connections.pool [pool_key])
+
+# Subroutine to forget a connection which has failed, so the next
+# request opens a new one.
+def drop_connection (url_parts):
+  pool_key = (url_parts.scheme, url_parts.netloc)
+  connection = connections.pool.pop (pool_key, None)
+  if (connection != None):
+    connection.close()
+  return
+
+# Subroutine to send one request and read all of the response, so the
+# connection can be used for the next.  A server may close a connection
+# which has been idle, so a request which fails is tried once more on a
+# new connection.
+def send_request (url, headers):
+  url_parts = urllib.parse.urlsplit (url)
+  path = url_parts.path
+  if (url_parts.query != ''):
+    path = path + '?' + url_parts.query
+  for attempt in (1, 2):
+    connection = get_connection (url_parts)
+    try:
+      connection.request ('GET', path, headers=headers)
+      response = connection.getresponse()
+      body = response.read()
+      if (response.will_close):
+        drop_connection (url_parts)
+      return (response, body)
+    except (http.client.HTTPException, OSError):
+      drop_connection (url_parts)
+      if (attempt == 2):
+        raise
+
+# Subroutine to fetch one bulletin.  The request is conditional, so a
+# bulletin which has not changed is not sent again.  Returns the
+# outcome, the new manifest entry, and a message.
+def fetch_bulletin (url, file_name, file_entry):
+  headers = {'User-Agent': 'fetch_bulletins/1.0'}
+  if (os.path.exists (file_name)):
+    if ('etag' in file_entry):
+      headers ['If-None-Match'] = file_entry ['etag']
+    if ('last_modified' in file_entry):
+      headers ['If-Modified-Since'] = file_entry ['last_modified']
+    else:
+      headers ['If-Modified-Since'] = email.utils.formatdate (
+        os.stat (file_name).st_mtime, usegmt=True)
+  request_url = url
+  try:
+    for redirect_count in range (6):
+      (response, body) = send_request (request_url, headers)
+      if ((response.status not in (301, 302, 303, 307, 308)) or
+          (response.getheader ('Location') == None)):
+        break
+      request_url = urllib.parse.urljoin (request_url,
+                                          response.getheader ('Location'))
+  except (http.client.HTTPException, OSError) as the_error:
+    return ('error', file_entry, url + ': ' + str(the_error))
+
+  if (response.status == 304):
+    return ('unchanged', file_entry, url + ' has not changed')
+  if (response.status in (404, 410)):
+    return ('missing', None, url + ' is not on the server')
+  if (response.status != 200):
+    return ('error', file_entry, url + ': ' + str(response.status) + ' ' +
+            response.reason)
+
+  # Write the bulletin under a temporary name, so an interrupted run
+  # does not leave part of a bulletin.  Like wget --timestamping, give
+  # it the server's modification time.
+  os.makedirs (os.path.dirname (file_name) or '.', exist_ok=True)
+  temporary_name = file_name + '.tmp'
+  with open (temporary_name, 'wb') as bulletin_file:
+    bulletin_file.write (body)
+  new_entry = dict()
+  if (response.getheader ('ETag') != None):
+    new_entry ['etag'] = response.getheader ('ETag')
+  last_modified = response.getheader ('Last-Modified')
+  if (last_modified != None):
+    new_entry ['last_modified'] = last_modified
+    try:
+      modified_time = email.utils.parsedate_to_datetime (last_modified)
+      os.utime (temporary_name, (modified_time.timestamp(),
+                                 modified_time.timestamp()))
+    except (TypeError, ValueError):
+      pass
+  os.replace (temporary_name, file_name)
+  return ('fetched', new_entry, url + ' fetched, ' + str(len(body)) +
+          ' bytes')
+
+# Ask only for the bulletins not known to be missing, or not known to
+# be missing since recently.
+to_fetch = list()
+skipped_count = 0
+for (url, file_name) in bulletins:
+  if (url in manifest ['missing']):
+    missing_date = datetime.date.fromisoformat (manifest ['missing'][url])
+    if ((today - missing_date).days < arguments ['missing_days']):
+      skipped_count = skipped_count + 1
+      continue
+  to_fetch.append ((url, file_name))
+
+counts = {'fetched': 0, 'unchanged': 0, 'missing': 0, 'error': 0}
+with concurrent.futures.ThreadPoolExecutor (
+    max_workers=max(1, arguments ['jobs'])) as executor:
+  futures = {executor.submit (fetch_bulletin, url, file_name,
+                              manifest ['files'].get (url, dict())): url
+             for (url, file_name) in to_fetch}
+  for future in concurrent.futures.as_completed (futures):
+    url = futures [future]
+    (outcome, file_entry, message) = future.result()
+    counts [outcome] = counts [outcome] + 1
+    if (outcome == 'missing'):
+      manifest ['missing'][url] = today.isoformat()
+      manifest ['files'].pop (url, None)
+    else:
+      manifest ['missing'].pop (url, None)
+      if (outcome != 'error'):
+        manifest ['files'][url] = file_entry
+    if (outcome == 'error'):
+      error_counter = error_counter + 1
+      print (message)
+    elif (verbosity_level > 1):
+      print (message)
+    if (do_trace == 1):
+      tracefile.write (outcome + ': ' + message + '\n')
+
+# Save the manifest for the next run.
+if (arguments ['manifest_file'] != None):
+  temporary_name = manifest_file_name + '.tmp'
+  with open (temporary_name, 'wt') as manifest_file:
+    json.dump (manifest, manifest_file, indent=1, sort_keys=True)
+  os.replace (temporary_name, manifest_file_name)
+
+if (verbosity_level > 0):
+  print ("Fetched " + str(counts ['fetched']) + ", unchanged " +
+         str(counts ['unchanged']) + ", missing " +
+         str(counts ['missing'] + skipped_count) + " (" +
+         str(skipped_count) + " not asked for again).")
+
+if (do_trace == 1):
+  tracefile.close()
+
+if (error_counter > 0):
+  print ("Encountered " + str(error_counter) + " errors.")
+
+# End of file fetch_bulletins.py
@@ -27,13 +27,16 @@
 #     e-mail: John_Sauter@systemeyescomputerstore.com
 
 import sys
+import os
 import re
 import hashlib
 import datetime
 from jdcal import gcal2jd, jd2gcal, is_leap
 import pprint
 from pathlib import Path
+import bisect
 import argparse
+import bulletin_parsers
 
 parser = argparse.ArgumentParser (
   formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -48,15 +51,26 @@ parser = argparse.ArgumentParser (
   'The input file is the IERS Bulletin D text file; ' +
   'the output is an extraction of the information. ' + '\n')
 parser.add_argument ('input_file',
-                     help='IERS Bulletin D as a text file')
+                     help='IERS Bulletin D as a text file, a directory ' +
+                     'of them, or a .tar, .tar.gz, .zip, .gz, .bz2 or .xz ' +
+                     'archive')
 parser.add_argument ('--csv-output_file', metavar='csv_output_file',
-                     help='write CSV output to the specified file')
+                     help='write CSV output to the specified file, ' +
+                     'one line for each value of DUT1 and the days ' +
+                     'it was in effect')
+parser.add_argument ('--daily-csv-output_file',
+                     metavar='daily_csv_output_file',
+                     help='write CSV output to the specified file, ' +
+                     'one line for each day')
+parser.add_argument ('--lookup-date', action='append', metavar='date',
+                     help='print the value of DUT1 in effect on the ' +
+                     'specified date, YYYY-MM-DD; may be repeated')
 parser.add_argument ('--latest-date-output_file',
                      metavar='latest_date_output_file',
                      help='write the latest Bulletin D date ' +
                      'to the specified file')
 parser.add_argument ('--version', action='version', 
-                     version='parse_bulletin_D 1.4 2026-04-02',
+                     version='parse_bulletin_D 1.8 2026-10-19',
                      help='print the version number and exit')
 parser.add_argument ('--trace', metavar='trace_file',
                      help='write trace output to the specified file')
@@ -67,6 +81,7 @@ parser.add_argument ('--verbose', type=int, metavar='verbosity level',
 do_trace = 0
 tracefile = ""
 do_csv_output = 0
+do_daily_csv_output = 0
 do_latest_date_output = 0
 verbosity_level = 1
 error_counter = 0
@@ -132,123 +147,41 @@ missing_date('2009-1-1', 0.4)
 # is later.
 latest_date = datetime.date.today()
 
-def process_file (file_name):
+# Subroutine to parse one file, and record the value of DUT1 it gives.
+def process_file (file_name, data=None):
   global bull_info
   global latest_date
-  line_number = 0
-  date_found = 0
-  DUT1 = 0.0
-  effective_date_line = 0
-  with open (file_name, 'rt') as infile:
-    text_line = infile.readline()
-    while (text_line != ''):
-      line_number = line_number + 1
-      stripped_text_line = text_line.strip()
-      if ((date_found == 0) and (verbosity_level > 0)):
-        print ("'" + stripped_text_line + "'")
-        
-      stripped_text_line = stripped_text_line.replace('Paris,', 'Paris, ')
-      stripped_text_line = stripped_text_line.replace('  ', ' ')
-      # Sometimes the month name is written in French.
-      stripped_text_line = stripped_text_line.replace ('mars', 'March')
-      stripped_text_line = stripped_text_line.replace ('Mai', 'May')
-      stripped_text_line = stripped_text_line.replace ('Juin', 'June')
-      stripped_text_line = stripped_text_line.replace ('juin', 'June')
-      stripped_text_line = stripped_text_line.replace ('Octobre', 'October')
-      stripped_text_line = stripped_text_line.replace ('Decembre', 'December')
-      
-      if (do_trace == 1):
-        if (date_found == 0):
-          tracefile.write ('Looking for date: ' + stripped_text_line + '\n')
-      right_side = stripped_text_line.rsplit(" ", 5)
-      if (verbosity_level > 0):
-        print (str(len(right_side)))
-        pprint.pprint (right_side)
-      if ((date_found == 0) and
-          (len(right_side) >= 4) and
-          ((right_side[1][0:5] == 'Paris') or
-           (right_side[-4] == 'Paris,') or
-           (right_side[-4] == '\tParis,') or
-           (right_side[-4] == '\t\t\t\tParis,'))):
-        date_found = 1
-        date_text = (right_side[-3] + " " + right_side[-2] + " " +
-           right_side[-1])
-        datetime_object = datetime.datetime.strptime (date_text, '%d %B %Y')
-        date_object = datetime_object.date()
-        if (date_object > latest_date):
-          latest_date = date_object
-        date_string = date_object.strftime ('%B %d, %Y')
-        if (verbosity_level > 0):
-          print ('Date of IERS Bulletin D is ' + date_string)
-        if (do_trace == 1):
-          tracefile.write ('date = ' + date_string + '.\n')
-      if ((len(right_side) == 6) and (right_side[1] == '0h')):
-        right_side = right_side[0].rsplit(" ", 3)
-        datetime_text = (right_side[1] + ' ' + right_side[2] + ' ' +
-                         right_side[3][0:4])
-        datetime_object = datetime.datetime.strptime (datetime_text,
-                                                      '%d %B %Y')
-        effective_date_object = datetime_object.date()
-        effective_date_string = effective_date_object.strftime ('%B %d, %Y')
-        if (effective_date_object > latest_date):
-          latest_date = effective_date_object
-        if (verbosity_level > 0):
-          print ('Effective date is ' + effective_date_string)        
-      if ((len(right_side) == 6) and ((right_side[0] == "From the"))):
-        datetime_text = (right_side[1] + ' ' + right_side[2] + ' ' +
-                         right_side[3][0:4])
-        datetime_object = datetime.datetime.strptime (datetime_text,
-                                                      '%d %B %Y')
-        effective_date_object = datetime_object.date()
-        effective_date_string = effective_date_object.strftime ('%B %d, %Y')
-        if (effective_date_object > latest_date):
-          latest_date = effective_date_object
-        if (verbosity_level > 0):
-          print ('Effective date is ' + effective_date_string)
-      if ((stripped_text_line == 'From the') or
-          (stripped_text_line == "From")):      
-        effective_date_line = line_number + 1
-      if ((verbosity_level > 0) and (effective_date_line > 0)):
-          print ("'" + stripped_text_line + "'")
-      if (line_number == effective_date_line):
-        if (stripped_text_line == ""):
-          effective_date_line = effective_date_line + 1
-        else:
-          effective_date_line = 0
-          datetime_text = stripped_text_line.split(",")[0]
-          datetime_object = datetime.datetime.strptime (datetime_text,
-                                                        '%d %B %Y')
-          effective_date_object = datetime_object.date()
-          effective_date_string = effective_date_object.strftime ('%B %d, %Y')
-          if (effective_date_object > latest_date):
-            latest_date = effective_date_object
-          if (verbosity_level > 0):
-            print ('Effective date is ' + effective_date_string)
-      if ((stripped_text_line[0:6] == 'DUT1 =') or
-          (stripped_text_line[0:5] == 'DUT1=')):
-        right_side = stripped_text_line.split("=")[1].lstrip()
-        DUT1_text = right_side[1:].lstrip()
-        DUT1_text = DUT1_text.replace("s.", " ")
-        DUT1_text = DUT1_text.replace("s", " ")
-        DUT1_text = DUT1_text.rstrip()
-        DUT1_text = right_side[0] + DUT1_text
-        DUT1 = float(DUT1_text)
-        if (verbosity_level > 0):
-          print ('DUT1 = ' + format(DUT1, ".1f") + '\n')
-        # Correct a typo.
-        if ((effective_date_object.year == 1995) and
-            (effective_date_object.month == 2) and
-            (effective_date_object.day == 23)):
-          effective_date_object.replace(year=1993)
-        if (date_found == 1):
-          bull_info [effective_date_object] = (date_object, DUT1)
-        else:
-          bull_info [effective_date_object] = (effective_date_object, DUT1)
-        return
-      text_line = infile.readline()
+  messages = list() if (verbosity_level > 0) else None
+  trace_lines = list() if (do_trace == 1) else None
+  try:
+    with bulletin_parsers.open_bulletin (file_name, data) as infile:
+      found = bulletin_parsers.parse_bulletin_D (infile, messages,
+                                                 trace_lines)
+  finally:
+    if (messages != None):
+      print ("".join (messages), end='')
+    if (trace_lines != None):
+      tracefile.write ("".join (trace_lines))
+  for the_date in ([found ["bulletin_date"]] + found ["effective_dates"]):
+    if ((the_date != None) and (the_date > latest_date)):
+      latest_date = the_date
+  if (found ["DUT1"] != None):
+    effective_date_object = found ["effective_date"]
+    # Correct a typo.
+    if ((effective_date_object.year == 1995) and
+        (effective_date_object.month == 2) and
+        (effective_date_object.day == 23)):
+      effective_date_object.replace(year=1993)
+    if (found ["bulletin_date"] != None):
+      bull_info [effective_date_object] = (found ["bulletin_date"],
+                                           found ["DUT1"])
+    else:
+      bull_info [effective_date_object] = (effective_date_object,
+                                           found ["DUT1"])
+  return
 
 # Process the input file.  If it is a directory, process all .txt files
-# within it.
+# within it.  If it is an archive, process the .txt files within it.
 input_file_name = arguments ['input_file']
 if (do_trace == 1):
   tracefile.write ('input file name = ' + input_file_name + '.\n')
@@ -256,47 +189,100 @@ input_file_path = Path(input_file_name)
 if (input_file_path.is_dir()):
   for file_name in list(input_file_path.glob('*.txt')):
     process_file (file_name)
+elif (input_file_name.endswith (bulletin_parsers.archive_suffixes)):
+  try:
+    for (file_name, data, key) in (
+        bulletin_parsers.read_archive (input_file_name)):
+      process_file (file_name, data)
+  except bulletin_parsers.archive_errors as the_error:
+    print ('Error reading ' + input_file_name + ': ' + str(the_error))
+    error_counter = error_counter + 1
 else:
   process_file (input_file_name)
 
 # The value of DUT1 extends from the effective date to the next
-# effective date
-prev_date = None
-DUT1_values = dict()
+# effective date, and the last value to the latest date seen.
+# Keep the effective dates, as ordinals, in a sorted list, with the
+# announcement date and DUT1 for each in a parallel list.
+interval_starts = list()
+interval_info = list()
 for the_date in sorted(bull_info):
-  if (prev_date != None):
-    for target_date in range (prev_date.toordinal(), the_date.toordinal()):
-      DUT1_values[datetime.date.fromordinal(target_date)] = (
-                                                          bull_info[prev_date])
-  prev_date = the_date
-# And then to the latest date seen
-for target_date in range (prev_date.toordinal(), latest_date.toordinal()+1):
-  DUT1_values[datetime.date.fromordinal(target_date)] = bull_info[prev_date]
-  
+  interval_starts.append (the_date.toordinal())
+  interval_info.append (bull_info [the_date])
+latest_ordinal = latest_date.toordinal()
+
+# Subroutine to find the last day of an interval.
+def interval_end (interval_number):
+  if (interval_number + 1 < len(interval_starts)):
+    return (interval_starts [interval_number + 1] - 1)
+  return (latest_ordinal)
+
+# Subroutine to find the announcement date and value of DUT1 in effect
+# on a date.  Returns None if the date is before the first effective
+# date or after the latest date.
+def DUT1_at (the_date):
+  interval_number = bisect.bisect_right (interval_starts,
+                                         the_date.toordinal()) - 1
+  if ((interval_number < 0) or
+      (the_date.toordinal() > interval_end (interval_number))):
+    return (None)
+  return (interval_info [interval_number])
+
+# Subroutine to format a date for a CSV file, both as a spreadsheet
+# formula and as text.
+def csv_date (the_date):
+  return ('"=date(' + str(the_date.year) + ',' + str(the_date.month) + ',' +
+          str(the_date.day) + ')",' + str(the_date.year) + '-' +
+          str(the_date.month) + '-' + str(the_date.day))
+
+if (arguments ['lookup_date'] != None):
+  for date_text in arguments ['lookup_date']:
+    the_date = datetime.datetime.strptime (date_text, '%Y-%m-%d').date()
+    the_info = DUT1_at (the_date)
+    if (the_info == None):
+      print ('No value of DUT1 is known for ' + date_text + '.')
+      error_counter = error_counter + 1
+    else:
+      print ('DUT1 on ' + date_text + ' is ' + format(the_info [1], ".1f") +
+             ', announced ' + the_info [0].strftime ('%B %d, %Y') + '.')
+
 if (arguments ['csv_output_file'] != None):
   do_csv_output = 1
   csv_output_file_name = arguments ['csv_output_file']
   csvoutputfile = open (csv_output_file_name, 'wt')
 
 if (do_csv_output == 1):
-  csvoutputfile.write ('edate1,edate2,adate1,adate2,DUT1\n')
-  for effective_date in sorted(DUT1_values):
-    announcement_date = DUT1_values[effective_date][0]
-    DUT1 = DUT1_values[effective_date][1]
-    csvoutputfile.write ('"=date(' + str(announcement_date.year) + ',' +
-                         str(announcement_date.month) + ',' +
-                         str(announcement_date.day) + ')",' +
-                         str(announcement_date.year) + '-' +
-                         str(announcement_date.month) + '-' +
-                         str(announcement_date.day) + ',' +
-                         '"=date(' + str(effective_date.year) + ',' +
-                         str(effective_date.month) + ',' +
-                         str(effective_date.day) + ')",' +
-                         str(effective_date.year) + '-' +
-                         str(effective_date.month) + '-' +
-                         str(effective_date.day) + ',' +
-                         format(DUT1, ".1f") + '\n')
-    
+  csvoutputfile.write ('adate1,adate2,edate1,edate2,DUT1,ldate1,ldate2\n')
+  for interval_number in range (len(interval_starts)):
+    (announcement_date, DUT1) = interval_info [interval_number]
+    effective_date = datetime.date.fromordinal (
+      interval_starts [interval_number])
+    last_date = datetime.date.fromordinal (interval_end (interval_number))
+    csvoutputfile.write (csv_date (announcement_date) + ',' +
+                         csv_date (effective_date) + ',' +
+                         format(DUT1, ".1f") + ',' +
+                         csv_date (last_date) + '\n')
+
+# The daily file has a line for each day, so write it a line at a
+# time rather than building it in memory.
+if (arguments ['daily_csv_output_file'] != None):
+  do_daily_csv_output = 1
+  daily_csv_output_file_name = arguments ['daily_csv_output_file']
+  dailycsvoutputfile = open (daily_csv_output_file_name, 'wt')
+
+if (do_daily_csv_output == 1):
+  dailycsvoutputfile.write ('edate1,edate2,adate1,adate2,DUT1\n')
+  for interval_number in range (len(interval_starts)):
+    (announcement_date, DUT1) = interval_info [interval_number]
+    announcement_text = csv_date (announcement_date) + ','
+    DUT1_text = ',' + format(DUT1, ".1f") + '\n'
+    for target_date in range (interval_starts [interval_number],
+                              interval_end (interval_number) + 1):
+      dailycsvoutputfile.write (announcement_text +
+                                csv_date (datetime.date.fromordinal (
+                                  target_date)) + DUT1_text)
+  dailycsvoutputfile.close()
+
 if (arguments ['latest_date_output_file'] != None):
   do_latest_date_output = 1
   latest_date_output_file_name = arguments ['latest_date_output_file']
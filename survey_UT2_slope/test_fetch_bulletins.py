@@ -0,0 +1,282 @@
+#!/usr/bin/python3
+# -*- coding: utf-8
+#
+# test_fetch_bulletins runs fetch_bulletins.py against a small web
+# server in this process, which serves a few bulletins and counts the
+# requests and connections it sees.  Run it with "make check" or
+# "python3 test_fetch_bulletins.py".
+#
+#   Copyright © 2026 by John Sauter <John_Sauter@systemeyescomputerstore.com>
+
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+#   The author's contact information is as follows:
+#     John Sauter
+#     System Eyes Computer Store
+#     20A Northwest Blvd.  Ste 345
+#     Nashua, NH  03063-4066
+#     telephone: (603) 424-1188
+#     e-mail: John_Sauter@systemeyescomputerstore.com
+
+import os
+import sys
+import json
+import datetime
+import tempfile
+import threading
+import subprocess
+import email.utils
+import http.server
+import unittest
+
+program = os.path.join (os.path.dirname (os.path.abspath (__file__)),
+                        "fetch_bulletins.py")
+
+# fetch_bulletins asks for 23 volumes of 53 issues of Bulletin A and
+# 199 issues of Bulletin D.
+bulletin_count = (23 * 53) + 199
+
+# The server's state: the bulletins it has, and what it has seen.
+class BulletinServer (http.server.ThreadingHTTPServer):
+  daemon_threads = True
+
+  def __init__ (self):
+    super().__init__ (('127.0.0.1', 0), BulletinHandler)
+    self.lock = threading.Lock()
+    self.bulletins = dict()
+    self.redirects = dict()
+    self.requests = list()
+    self.connection_count = 0
+    # Close the connection after this many requests on it, as a server
+    # does to connections which have been open a long time.
+    self.requests_per_connection = None
+
+  def add_bulletin (self, path, text, etag, modified):
+    self.bulletins [path] = (text.encode ('utf-8'), etag,
+                             email.utils.format_datetime (modified,
+                                                          usegmt=True))
+
+# Each connection gets its own handler, so counting handlers counts
+# connections.
+class BulletinHandler (http.server.BaseHTTPRequestHandler):
+  protocol_version = 'HTTP/1.1'
+
+  def setup (self):
+    super().setup()
+    self.request_count = 0
+    with self.server.lock:
+      self.server.connection_count = self.server.connection_count + 1
+
+  def log_message (self, format, *args):
+    return
+
+  def do_GET (self):
+    server = self.server
+    with server.lock:
+      server.requests.append ((self.path, dict(self.headers)))
+    self.request_count = self.request_count + 1
+    body = b''
+    if (self.path in server.redirects):
+      self.send_response (301)
+      self.send_header ('Location', server.redirects [self.path])
+    elif (self.path not in server.bulletins):
+      self.send_response (404)
+    else:
+      (text, etag, last_modified) = server.bulletins [self.path]
+      if (self.headers.get ('If-None-Match') == etag):
+        self.send_response (304)
+      elif ((self.headers.get ('If-None-Match') == None) and
+            (self.headers.get ('If-Modified-Since') == last_modified)):
+        self.send_response (304)
+      else:
+        self.send_response (200)
+        self.send_header ('Content-Type', 'text/plain')
+        self.send_header ('ETag', etag)
+        self.send_header ('Last-Modified', last_modified)
+        body = text
+    self.send_header ('Content-Length', str(len(body)))
+    if ((server.requests_per_connection != None) and
+        (self.request_count >= server.requests_per_connection)):
+      self.send_header ('Connection', 'close')
+      self.close_connection = True
+    self.end_headers()
+    self.wfile.write (body)
+
+class TestFetchBulletins (unittest.TestCase):
+
+  def setUp (self):
+    self.server = BulletinServer()
+    self.server.add_bulletin (
+      '/data/6/bulletina-xxxix-001.txt', 'Bulletin A volume XXXIX 001\n',
+      '"a-001"', datetime.datetime (2026, 1, 8, tzinfo=datetime.timezone.utc))
+    self.server.add_bulletin (
+      '/data/6/bulletina-xxxix-002.txt', 'Bulletin A volume XXXIX 002\n',
+      '"a-002"', datetime.datetime (2026, 1, 15, tzinfo=datetime.timezone.utc))
+    self.server.add_bulletin (
+      '/data/17/bulletind-150.txt', 'Bulletin D 150\n',
+      '"d-150"', datetime.datetime (2025, 6, 2, tzinfo=datetime.timezone.utc))
+    self.server_thread = threading.Thread (target=self.server.serve_forever)
+    self.server_thread.daemon = True
+    self.server_thread.start()
+    self.directory = tempfile.TemporaryDirectory()
+    self.base_url = 'http://127.0.0.1:' + str(self.server.server_port) + \
+      '/data'
+
+  def tearDown (self):
+    self.server.shutdown()
+    self.server.server_close()
+    self.directory.cleanup()
+
+  # Subroutine to run fetch_bulletins and return its output.  The
+  # server's counts start again from zero for each run.
+  def fetch (self, *options):
+    with self.server.lock:
+      self.server.requests = list()
+      self.server.connection_count = 0
+    result = subprocess.run (
+      [sys.executable, program, '--base-url', self.base_url,
+       '--manifest-file', 'manifest.json'] + list(options),
+      cwd=self.directory.name, capture_output=True, text=True, timeout=300)
+    self.assertEqual (result.returncode, 0, result.stderr)
+    return (result.stdout)
+
+  def read_manifest (self):
+    with open (os.path.join (self.directory.name, 'manifest.json'),
+               'rt') as manifest_file:
+      return (json.load (manifest_file))
+
+  def bulletin_file (self, name):
+    return (os.path.join (self.directory.name, name))
+
+  def test_first_run_fetches_bulletins (self):
+    output = self.fetch ('--jobs', '4')
+    self.assertIn ("Fetched 3, unchanged 0, missing " +
+                   str(bulletin_count - 3) + " (0 not asked for again).",
+                   output)
+    self.assertNotIn ("errors", output)
+    with open (self.bulletin_file ('Bulletin_A/bulletina-xxxix-001.txt'),
+               'rt') as bulletin:
+      self.assertEqual (bulletin.read(), 'Bulletin A volume XXXIX 001\n')
+    # The file has the server's modification time, as wget
+    # --timestamping would give it.
+    modified = os.stat (
+      self.bulletin_file ('Bulletin_D/bulletind-150.txt')).st_mtime
+    self.assertEqual (modified, datetime.datetime (
+      2025, 6, 2, tzinfo=datetime.timezone.utc).timestamp())
+    self.assertFalse (os.path.exists (
+      self.bulletin_file ('Bulletin_A/bulletina-xxxix-003.txt')))
+    manifest = self.read_manifest()
+    self.assertEqual (
+      manifest ['files'][self.base_url + '/6/bulletina-xxxix-002.txt'],
+      {'etag': '"a-002"', 'last_modified': 'Thu, 15 Jan 2026 00:00:00 GMT'})
+
+  def test_missing_bulletin_is_remembered (self):
+    self.fetch ('--jobs', '4')
+    missing_url = self.base_url + '/6/bulletina-xxxix-003.txt'
+    manifest = self.read_manifest()
+    self.assertEqual (len(manifest ['missing']), bulletin_count - 3)
+    self.assertEqual (manifest ['missing'][missing_url],
+                      datetime.date.today().isoformat())
+    self.assertNotIn (missing_url, manifest ['files'])
+
+    # The next run does not ask for the missing bulletins again.
+    output = self.fetch ('--jobs', '4')
+    self.assertIn ("missing " + str(bulletin_count - 3) + " (" +
+                   str(bulletin_count - 3) + " not asked for again).",
+                   output)
+    self.assertEqual (len(self.server.requests), 3)
+
+    # Once it has been long enough it asks again, and a bulletin which
+    # has appeared is fetched and no longer counted as missing.
+    self.server.add_bulletin (
+      '/data/6/bulletina-xxxix-003.txt', 'Bulletin A volume XXXIX 003\n',
+      '"a-003"', datetime.datetime (2026, 1, 22, tzinfo=datetime.timezone.utc))
+    output = self.fetch ('--jobs', '4', '--missing-days', '0')
+    self.assertIn ("Fetched 1, unchanged 3, missing " +
+                   str(bulletin_count - 4) + " (0 not asked for again).",
+                   output)
+    self.assertEqual (len(self.server.requests), bulletin_count)
+    manifest = self.read_manifest()
+    self.assertNotIn (missing_url, manifest ['missing'])
+    self.assertEqual (manifest ['files'][missing_url]['etag'], '"a-003"')
+
+  def test_unchanged_bulletins_are_not_sent_again (self):
+    self.fetch ('--jobs', '4')
+    output = self.fetch ('--jobs', '4')
+    self.assertIn ("Fetched 0, unchanged 3,", output)
+    headers = {path: request_headers
+               for (path, request_headers) in self.server.requests}
+    self.assertEqual (headers ['/data/6/bulletina-xxxix-001.txt'].get (
+      'If-None-Match'), '"a-001"')
+    self.assertEqual (headers ['/data/17/bulletind-150.txt'].get (
+      'If-Modified-Since'), 'Mon, 02 Jun 2025 00:00:00 GMT')
+
+    # A bulletin changed on the server is fetched again.
+    self.server.add_bulletin (
+      '/data/6/bulletina-xxxix-002.txt', 'Bulletin A volume XXXIX 002, ' +
+      'corrected\n', '"a-002-corrected"',
+      datetime.datetime (2026, 1, 16, tzinfo=datetime.timezone.utc))
+    output = self.fetch ('--jobs', '4')
+    self.assertIn ("Fetched 1, unchanged 2,", output)
+    with open (self.bulletin_file ('Bulletin_A/bulletina-xxxix-002.txt'),
+               'rt') as bulletin:
+      self.assertEqual (bulletin.read(),
+                        'Bulletin A volume XXXIX 002, corrected\n')
+
+  def test_without_etag_the_file_date_is_used (self):
+    # A manifest which has lost track of a bulletin still lets the
+    # request be conditional, using the date of the file.
+    self.fetch ('--jobs', '2')
+    with open (os.path.join (self.directory.name, 'manifest.json'),
+               'wt') as manifest_file:
+      json.dump ({'format_version': 1, 'files': dict(), 'missing': dict()},
+                 manifest_file)
+    output = self.fetch ('--jobs', '2')
+    self.assertIn ("Fetched 0, unchanged 3,", output)
+
+  def test_connections_are_kept_open (self):
+    self.fetch ('--jobs', '4')
+    self.assertEqual (len(self.server.requests), bulletin_count)
+    # Each of the four threads opens one connection and uses it for
+    # all of its requests.
+    self.assertGreaterEqual (self.server.connection_count, 1)
+    self.assertLessEqual (self.server.connection_count, 4)
+
+  def test_closed_connections_are_opened_again (self):
+    self.server.requests_per_connection = 50
+    output = self.fetch ('--jobs', '3')
+    self.assertIn ("Fetched 3, unchanged 0,", output)
+    self.assertNotIn ("errors", output)
+    self.assertEqual (len(self.server.requests), bulletin_count)
+    self.assertGreaterEqual (self.server.connection_count,
+                             bulletin_count // 50)
+    self.assertLessEqual (self.server.connection_count,
+                          (bulletin_count // 50) + 3)
+
+  def test_redirect_is_followed (self):
+    self.server.redirects ['/data/17/bulletind-151.txt'] = \
+      '/mirror/bulletind-151.txt'
+    self.server.add_bulletin (
+      '/mirror/bulletind-151.txt', 'Bulletin D 151\n',
+      '"d-151"', datetime.datetime (2025, 7, 1, tzinfo=datetime.timezone.utc))
+    output = self.fetch ('--jobs', '4')
+    self.assertIn ("Fetched 4,", output)
+    with open (self.bulletin_file ('Bulletin_D/bulletind-151.txt'),
+               'rt') as bulletin:
+      self.assertEqual (bulletin.read(), 'Bulletin D 151\n')
+
+if (__name__ == "__main__"):
+  unittest.main()
+
+# End of file test_fetch_bulletins.py
@@ -0,0 +1,312 @@
+#!/usr/bin/python3
+# -*- coding: utf-8
+#
+# utc_tai converts arrays of UTC timestamps to TAI and back, using the
+# proleptic leap seconds in the table of extraordinary days.  It can be
+# imported by other Python programs or run from the command line to
+# measure its speed.
+
+#   Copyright © 2026 by John Sauter <John_Sauter@systemeyescomputerstore.com>
+
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+#   The author's contact information is as follows:
+#     John Sauter
+#     System Eyes Computer Store
+#     20A Northwest Blvd.  Ste 345
+#     Nashua, NH  03063-4066
+#     telephone: (603) 424-1188
+#     e-mail: John_Sauter@systemeyescomputerstore.com
+
+#
+# UTC timestamps are numpy datetime64[ns] values, which count 86,400
+# seconds in every day.  TAI timestamps are int64 counts of nanoseconds
+# since 1970-01-01 00:00:00 TAI, as extended to the past by the table
+# of extraordinary days: TAI = UTC + DTAI, where DTAI is the value in
+# effect during the UTC day.
+#
+# On a day with 86,401 seconds the leap second, 23:59:60, cannot be
+# written as a datetime64, so converting a TAI time within the leap
+# second to UTC gives 23:59:59 again; leap_second_mask identifies
+# those times.  On a day with 86,399 seconds the UTC times from
+# 23:59:59 to midnight do not exist; they are converted as though the
+# day were longer, so they overlap the first second of the next day.
+#
+# UTC to TAI looks up DTAI in a table with one entry per UTC day, so
+# each conversion is a division, a gather and an addition.  TAI to UTC
+# uses a table with one entry per 2**46 nanoseconds, about 19.5 hours,
+# so the division becomes a shift.  The arrays are processed in chunks
+# small enough to stay in the processor cache.
+#
+# Times which cannot be converted, because they or their conversions
+# do not fit in an int64 or are past the end of the table, raise
+# ValueError; utc_in_range and tai_in_range identify them beforehand.
+#
+
+import numpy as np
+import dtai_lookup
+
+nanoseconds_per_second = 1000000000
+nanoseconds_per_day = 86400 * nanoseconds_per_second
+default_chunk_size = 1 << 16
+TAI_bucket_shift = 46
+
+# Subroutine to check an array given for the results of a conversion.
+# The results are written through a flat view of it, so it must be
+# C-contiguous, or they would go to a copy.
+def check_output_array (out, shape, dtype):
+  if ((out.shape != shape) or (out.dtype != dtype)):
+    raise ValueError ("The output array must have shape " + str(shape) +
+                      " and type " + str(np.dtype (dtype)) + ".")
+  if (not out.flags.c_contiguous):
+    raise ValueError ("The output array must be C-contiguous.")
+  if (not out.flags.writeable):
+    raise ValueError ("The output array is read-only.")
+  return
+
+# Convert between UTC datetime64[ns] and TAI nanoseconds.
+class TimestampConverter:
+
+  # Subroutine to build the conversion tables.  The table is the name
+  # of an extraordinary days file or an ExtraordinaryDays object from
+  # dtai_lookup.
+  def __init__ (self, table, chunk_size=default_chunk_size):
+    if (not isinstance (table, dtai_lookup.ExtraordinaryDays)):
+      table = dtai_lookup.ExtraordinaryDays (table)
+    self.table = table
+    self.chunk_size = chunk_size
+    # Nanoseconds in an int64 cover only the years 1677 to 2262, so use
+    # only the part of the table within those years, less a margin for
+    # DTAI.
+    first_day = max ((np.iinfo(np.int64).min // nanoseconds_per_day) + 2,
+                     int(table.change_JDN [0] - dtai_lookup.unix_epoch_JDN))
+    last_day = min ((np.iinfo(np.int64).max // nanoseconds_per_day) - 2,
+                    int(table.end_date - dtai_lookup.unix_epoch_JDN))
+    change_day = table.change_JDN - dtai_lookup.unix_epoch_JDN
+    in_range = (change_day > first_day) & (change_day <= last_day)
+    change_day = np.concatenate (([first_day], change_day [in_range]))
+    change_DTAI = np.concatenate ((
+      [table.dtai_at (first_day + dtai_lookup.unix_epoch_JDN)],
+      table.change_DTAI [in_range]))
+    change_UTC = change_day * nanoseconds_per_day
+    change_offset = change_DTAI * nanoseconds_per_second
+
+    # UTC to TAI: the offset, in nanoseconds, for each UTC day.
+    self.first_UTC_day = int(first_day)
+    days = np.arange (first_day, last_day + 1, dtype=np.int64)
+    self.UTC_day_offset = change_offset [
+      np.searchsorted (change_UTC, days * nanoseconds_per_day,
+                       side='right') - 1]
+
+    # The times which can be converted: UTC from the start of the first
+    # day to the end of the last, and the TAI times they convert to.
+    self.first_UTC = int(first_day) * nanoseconds_per_day
+    self.end_UTC = (int(last_day) + 1) * nanoseconds_per_day
+    self.first_TAI = self.first_UTC + int(self.UTC_day_offset [0])
+    self.end_TAI = self.end_UTC + int(self.UTC_day_offset [-1])
+
+    # TAI to UTC: each change of DTAI happens at an instant of TAI.
+    # For a positive leap second the new offset is used from the start
+    # of the leap second, so the leap second is converted to 23:59:59.
+    change_TAI = change_UTC + change_offset
+    step = np.diff (change_offset)
+    threshold = change_TAI [1:] - np.maximum (step, 0)
+    self.leap_second_start = (change_TAI [1:][step > 0] -
+                              nanoseconds_per_second)
+
+    # There is a table entry for each TAI bucket of 2**46 nanoseconds,
+    # giving the offset at the start of the bucket, the instant during
+    # the bucket when the offset changes, if it does, and the amount of
+    # the change.
+    self.first_TAI_bucket = self.first_TAI >> TAI_bucket_shift
+    last_TAI_bucket = (self.end_TAI - 1) >> TAI_bucket_shift
+    buckets = np.arange (self.first_TAI_bucket, last_TAI_bucket + 1,
+                         dtype=np.int64)
+    self.TAI_bucket_offset = change_offset [
+      np.searchsorted (threshold, buckets << TAI_bucket_shift,
+                       side='left')]
+    self.TAI_bucket_threshold = np.full (len(buckets),
+                                         np.iinfo(np.int64).max,
+                                         dtype=np.int64)
+    self.TAI_bucket_step = np.zeros (len(buckets), dtype=np.int64)
+    threshold_bucket = ((threshold >> TAI_bucket_shift) -
+                        self.first_TAI_bucket)
+    if (np.any (np.diff (threshold_bucket) == 0)):
+      raise ValueError ("DTAI changes more than once in " +
+                        str(1 << TAI_bucket_shift) + " nanoseconds.")
+    self.TAI_bucket_threshold [threshold_bucket] = threshold
+    self.TAI_bucket_step [threshold_bucket] = step
+
+  # Subroutine to return True for each UTC datetime64 value which can be
+  # converted.
+  def utc_in_range (self, utc):
+    utc = np.asarray (utc, dtype='datetime64[ns]').view (np.int64)
+    return ((utc >= self.first_UTC) & (utc < self.end_UTC))
+
+  # Subroutine to return True for each TAI time which can be converted.
+  def tai_in_range (self, tai):
+    tai = np.asarray (tai, dtype=np.int64)
+    return ((tai >= self.first_TAI) & (tai < self.end_TAI))
+
+  # Subroutine to convert an array of UTC datetime64 values to TAI
+  # nanoseconds.  Raises ValueError if any value is outside the table,
+  # or if out is not a C-contiguous int64 array of the same shape as
+  # utc.
+  def utc_to_tai (self, utc, out=None):
+    utc = np.ascontiguousarray (utc, dtype='datetime64[ns]').view (np.int64)
+    if (out is None):
+      out = np.empty (utc.shape, dtype=np.int64)
+    else:
+      check_output_array (out, utc.shape, np.int64)
+    utc_flat = utc.reshape (-1)
+    out_flat = out.reshape (-1)
+    chunk_size = min (self.chunk_size, max (len(utc_flat), 1))
+    day = np.empty (chunk_size, dtype=np.int64)
+    for first in range (0, len(utc_flat), chunk_size):
+      utc_chunk = utc_flat [first:first + chunk_size]
+      if ((utc_chunk.min () < self.first_UTC) or
+          (utc_chunk.max () >= self.end_UTC)):
+        raise ValueError ("UTC time outside the table of " +
+                          "extraordinary days.")
+      day_chunk = day [:len(utc_chunk)]
+      np.floor_divide (utc_chunk, nanoseconds_per_day, out=day_chunk)
+      np.subtract (day_chunk, self.first_UTC_day, out=day_chunk)
+      # The range check above keeps the index valid, so mode='clip'
+      # only serves to let take write directly into the output.
+      out_chunk = out_flat [first:first + chunk_size]
+      np.take (self.UTC_day_offset, day_chunk, out=out_chunk, mode='clip')
+      np.add (out_chunk, utc_chunk, out=out_chunk)
+    return (out)
+
+  # Subroutine to convert an array of TAI nanoseconds to UTC
+  # datetime64[ns] values.  Raises ValueError if any value is outside
+  # the table, or if out is not a C-contiguous datetime64[ns] array of
+  # the same shape as tai.
+  def tai_to_utc (self, tai, out=None):
+    tai = np.ascontiguousarray (tai, dtype=np.int64)
+    if (out is None):
+      out = np.empty (tai.shape, dtype='datetime64[ns]')
+    else:
+      check_output_array (out, tai.shape, 'datetime64[ns]')
+    tai_flat = tai.reshape (-1)
+    out_flat = out.view (np.int64).reshape (-1)
+    chunk_size = min (self.chunk_size, max (len(tai_flat), 1))
+    bucket = np.empty (chunk_size, dtype=np.int64)
+    threshold = np.empty (chunk_size, dtype=np.int64)
+    past_threshold = np.empty (chunk_size, dtype=bool)
+    for first in range (0, len(tai_flat), chunk_size):
+      tai_chunk = tai_flat [first:first + chunk_size]
+      if ((tai_chunk.min () < self.first_TAI) or
+          (tai_chunk.max () >= self.end_TAI)):
+        raise ValueError ("TAI time outside the table of " +
+                          "extraordinary days.")
+      length = len(tai_chunk)
+      bucket_chunk = bucket [:length]
+      threshold_chunk = threshold [:length]
+      past_chunk = past_threshold [:length]
+      np.right_shift (tai_chunk, TAI_bucket_shift, out=bucket_chunk)
+      np.subtract (bucket_chunk, self.first_TAI_bucket, out=bucket_chunk)
+      np.take (self.TAI_bucket_threshold, bucket_chunk, out=threshold_chunk,
+               mode='clip')
+      np.greater_equal (tai_chunk, threshold_chunk, out=past_chunk)
+      out_chunk = out_flat [first:first + chunk_size]
+      np.take (self.TAI_bucket_offset, bucket_chunk, out=out_chunk,
+               mode='clip')
+      np.subtract (tai_chunk, out_chunk, out=out_chunk)
+      # Few times are past a change of DTAI within their bucket, so
+      # apply the step to just those.
+      past_index = np.flatnonzero (past_chunk)
+      if (len(past_index) > 0):
+        out_chunk [past_index] -= self.TAI_bucket_step [
+          bucket_chunk [past_index]]
+    return (out)
+
+  # Subroutine to return True for each TAI time which is within a leap
+  # second.
+  def leap_second_mask (self, tai):
+    tai = np.asarray (tai, dtype=np.int64)
+    position = np.searchsorted (self.leap_second_start, tai,
+                                side='right') - 1
+    in_range = position >= 0
+    position = np.maximum (position, 0)
+    return (in_range & (tai - self.leap_second_start [position] <
+                        nanoseconds_per_second))
+
+#
+# When run as a program, measure the speed of the conversions.
+#
+if (__name__ == "__main__"):
+  import sys
+  import time
+  import argparse
+
+  parser = argparse.ArgumentParser (
+    formatter_class=argparse.RawDescriptionHelpFormatter,
+    description='Measure the speed of UTC to TAI conversion.',
+    epilog='Copyright © 2026 by John Sauter' + '\n' +
+    'License GPL3+: GNU GPL version 3 or later; ' + '\n' +
+    'see <http://gnu.org/licenses/gpl.html> for the full text ' +
+    'of the license.' + '\n' +
+    'This is free software: you are free to change and redistribute it. ' +
+    '\n' +
+    'There is NO WARRANTY, to the extent permitted by law. ' + '\n' + '\n'
+    'The input file lists the extraordinary days. ' + '\n')
+  parser.add_argument ('input_file',
+                       help='the table of extraordinary days')
+  parser.add_argument ('--version', action='version',
+                       version='utc_tai 1.3 2026-10-19',
+                       help='print the version number and exit')
+  parser.add_argument ('--count', type=int, metavar='count',
+                       help='number of timestamps to convert, ' +
+                       'default is 50,000,000')
+  parser.add_argument ('--chunk-size', type=int, metavar='chunk_size',
+                       help='number of timestamps converted at a time')
+
+  arguments = parser.parse_args ()
+  arguments = vars(arguments)
+
+  count = 50000000
+  if (arguments ['count'] != None):
+    count = int(arguments ['count'])
+  chunk_size = default_chunk_size
+  if (arguments ['chunk_size'] != None):
+    chunk_size = int(arguments ['chunk_size'])
+
+  converter = TimestampConverter (arguments ['input_file'], chunk_size)
+
+  # Sorted timestamps over fifty years, as in a collection of logs.
+  rng = np.random.default_rng (1958)
+  utc = np.sort (rng.integers (0, 50 * 365 * nanoseconds_per_day, count))
+  utc = (utc + np.datetime64 ('1990-01-01', 'ns').astype (np.int64))
+  utc = utc.view ('datetime64[ns]')
+  tai = np.empty (count, dtype=np.int64)
+  back = np.empty (count, dtype='datetime64[ns]')
+
+  start_time = time.perf_counter ()
+  converter.utc_to_tai (utc, out=tai)
+  middle_time = time.perf_counter ()
+  converter.tai_to_utc (tai, out=back)
+  end_time = time.perf_counter ()
+
+  print ("UTC to TAI: " +
+         format (count / (middle_time - start_time) / 1e6, ".1f") +
+         " million conversions per second.")
+  print ("TAI to UTC: " +
+         format (count / (end_time - middle_time) / 1e6, ".1f") +
+         " million conversions per second.")
+  if (np.any (back != utc)):
+    print ("Round trip does not reproduce the UTC timestamps.")
+    sys.exit (1)
+
+# End of file utc_tai.py